@@ -18,7 +18,7 @@ import VolumeUp from '@mui/icons-material/VolumeUp';
 import { useTheme } from '@mui/material/styles';
 
 interface ManimalVideoProps {
-  topic: 'linear_regression' | 'classification' | 'neural_network';
+  topic: 'linear_regression' | 'classification' | 'clustering' | 'neural_network';
   sceneName: string;
   title: string;
   description?: string;
@@ -0,0 +1,11 @@
+from .fast_table import FastTable
+from .heatmap import COLORMAPS, Heatmap, colormap_lut
+from .point_cloud import PointCloud, axes_to_scene, palette_to_rgba
+from .sections import SECTION_ENV, SectionedScene
+
+__all__ = [
+    "FastTable",
+    "COLORMAPS", "Heatmap", "colormap_lut",
+    "PointCloud", "axes_to_scene", "palette_to_rgba",
+    "SECTION_ENV", "SectionedScene",
+]
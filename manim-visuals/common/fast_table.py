@@ -0,0 +1,104 @@
+"""
+Table mobject that lays out every cell in a single text layout pass.
+
+manim's Table builds one Text per cell and one Line per grid segment, which
+dominates construction time once tables grow past a handful of rows. FastTable
+renders the whole table as one monospace Text, so Pango lays it out once and
+the SVG cache gets a single entry, and draws every grid line as subpaths of
+one VMobject.
+
+Column separators are typed into the layout as box-drawing bars; their glyph
+positions give the exact column and row geometry of the real layout, then the
+bars are dropped and replaced by the batched grid path.
+"""
+
+from manim import Text, VGroup, VMobject, WHITE
+import numpy as np
+
+BAR = "│"
+
+
+def _segments_to_points(starts, ends):
+    """Cubic Bezier control points for straight segments, one subpath each"""
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    delta = ends - starts
+    return np.stack([starts, starts + delta / 3, starts + 2 * delta / 3, ends], axis=1).reshape(-1, 3)
+
+
+class FastTable(VGroup):
+    """
+    Drop-in for the simple Table(rows, include_outer_lines=True) use.
+
+    rows is a list of rows of strings; row 0 is treated as the header when
+    header_color is set. get_cell(row, col) returns the glyphs of one cell for
+    highlighting.
+    """
+
+    def __init__(self, rows, font="Monospace", font_size=48, color=WHITE, header_color=None,
+                 line_color=WHITE, line_width=2, padding=1, include_outer_lines=True,
+                 line_spacing=None, **kwargs):
+        rows = [[str(cell) for cell in row] for row in rows]
+        n_cols = max(len(row) for row in rows)
+        rows = [row + [""] * (n_cols - len(row)) for row in rows]
+        widths = [max(len(row[col]) for row in rows) + 2 * padding for col in range(n_cols)]
+
+        text_kwargs = {"disable_ligatures": True}
+        if line_spacing is not None:
+            text_kwargs["line_spacing"] = line_spacing
+
+        lines = [BAR + BAR.join(cell.center(width) for cell, width in zip(row, widths)) + BAR
+                 for row in rows]
+        self.text = Text("\n".join(lines), font=font, font_size=font_size, color=color, **text_kwargs)
+
+        # Map glyphs (Text skips whitespace) back to rows, columns and separator bars
+        bar_glyphs = [[] for _ in rows]
+        self._cell_glyphs = [[[] for _ in range(n_cols)] for _ in rows]
+        glyph_index = 0
+        for row_index, line in enumerate(lines):
+            col = -1
+            for char in line:
+                if char.isspace():
+                    continue
+                glyph = self.text.submobjects[glyph_index]
+                if char == BAR:
+                    bar_glyphs[row_index].append(glyph)
+                    col += 1
+                else:
+                    self._cell_glyphs[row_index][col].append(glyph)
+                glyph_index += 1
+
+        # Column lines sit on the bars of the first row; rows are evenly pitched
+        column_x = np.array([bar.get_center()[0] for bar in bar_glyphs[0]])
+        row_centers = np.array([bars[0].get_center()[1] for bars in bar_glyphs])
+        if len(rows) > 1:
+            pitch = (row_centers[0] - row_centers[-1]) / (len(rows) - 1)
+        else:
+            pitch = bar_glyphs[0][0].height
+        row_y = np.concatenate([row_centers + pitch / 2, row_centers[-1:] - pitch / 2])
+
+        self.text.remove(*[bar for bars in bar_glyphs for bar in bars])
+        if header_color is not None:
+            for glyphs in self._cell_glyphs[0]:
+                for glyph in glyphs:
+                    glyph.set_color(header_color)
+
+        self.grid = self._build_grid(column_x, row_y, include_outer_lines, line_color, line_width)
+        super().__init__(self.grid, self.text, **kwargs)
+
+    @staticmethod
+    def _build_grid(column_x, row_y, include_outer_lines, line_color, line_width):
+        left, right = column_x[0], column_x[-1]
+        top, bottom = row_y[0], row_y[-1]
+        if not include_outer_lines:
+            column_x, row_y = column_x[1:-1], row_y[1:-1]
+
+        starts = [(x, top, 0) for x in column_x] + [(left, y, 0) for y in row_y]
+        ends = [(x, bottom, 0) for x in column_x] + [(right, y, 0) for y in row_y]
+        grid = VMobject(stroke_color=line_color, stroke_width=line_width)
+        if starts:
+            grid.set_points(_segments_to_points(starts, ends))
+        return grid
+
+    def get_cell(self, row, col):
+        return VGroup(*self._cell_glyphs[row][col])
@@ -0,0 +1,92 @@
+"""
+Array-backed heatmap for weight, attention and embedding matrices.
+
+The whole (R, C) array is drawn as a single RGBA raster through a colour
+lookup table, so a 512x512 attention map costs one image per frame instead of
+R * C square mobjects. Values are updated in place on the same pixel buffer.
+"""
+
+from manim import ImageMobject, Text, VGroup, RESAMPLING_ALGORITHMS, WHITE, color_to_int_rgb
+import numpy as np
+
+COLORMAPS = {
+    "viridis": ["#440154", "#3B528B", "#21918C", "#5EC962", "#FDE725"],
+    "magma": ["#000004", "#51127C", "#B63679", "#FB8861", "#FCFDBF"],
+    "coolwarm": ["#3B4CC0", "#DDDDDD", "#B40426"],
+    "gray": ["#000000", "#FFFFFF"],
+}
+
+
+def colormap_lut(cmap="viridis", size=256):
+    """(size, 4) uint8 lookup table from a colormap name or a list of colours"""
+    anchors = COLORMAPS.get(cmap, cmap) if isinstance(cmap, str) else cmap
+    anchor_rgb = np.array([color_to_int_rgb(color) for color in anchors], dtype=float)
+
+    positions = np.linspace(0, 1, len(anchor_rgb))
+    samples = np.linspace(0, 1, size)
+    lut = np.empty((size, 4), dtype=np.uint8)
+    for channel in range(3):
+        lut[:, channel] = np.round(np.interp(samples, positions, anchor_rgb[:, channel]))
+    lut[:, 3] = 255
+    return lut
+
+
+class Heatmap(ImageMobject):
+    """
+    An (R, C) array drawn as one image, one pixel per cell.
+
+    vmin/vmax fix the colour scale (default: the data range). labels is an
+    optional {(row, col): text} dict for the few cells worth annotating; they
+    are added as submobjects so they move and scale with the heatmap.
+    """
+
+    def __init__(self, values, cmap="viridis", vmin=None, vmax=None, width=4, height=None,
+                 labels=None, label_font_size=16, label_color=WHITE, **kwargs):
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError(f"Heatmap needs a 2-D array, got shape {values.shape}")
+
+        self.lut = colormap_lut(cmap)
+        self.vmin = float(values.min()) if vmin is None else vmin
+        self.vmax = float(values.max()) if vmax is None else vmax
+        super().__init__(np.full(values.shape + (4,), 255, dtype=np.uint8), **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.set_values(values)
+
+        rows, cols = values.shape
+        self.stretch_to_fit_width(width)
+        self.stretch_to_fit_height(height if height is not None else width * rows / cols)
+
+        self.labels = VGroup()
+        for (row, col), text in (labels or {}).items():
+            label = Text(str(text), font_size=label_font_size, color=label_color)
+            label.move_to(self.cell_center(row, col))
+            self.labels.add(label)
+        if labels:
+            self.add(self.labels)
+
+    @property
+    def shape(self):
+        return self.pixel_array.shape[:2]
+
+    def set_values(self, values):
+        """Recolour every cell in place from a new array of the same shape, keeping the current opacity"""
+        values = np.asarray(values, dtype=float)
+        if values.shape != self.shape:
+            raise ValueError(f"Expected shape {self.shape}, got {values.shape}")
+
+        span = self.vmax - self.vmin
+        scaled = (values - self.vmin) / span if span > 0 else np.zeros_like(values)
+        indices = np.clip(scaled * (len(self.lut) - 1), 0, len(self.lut) - 1).astype(np.intp)
+        # RGB only: the alpha channel belongs to set_opacity and fades
+        self.pixel_array[..., :3] = self.lut[indices, :3]
+        return self
+
+    def cell_center(self, row, col):
+        """Scene point at the centre of a cell; row 0 is the top"""
+        rows, cols = self.shape
+        left, right = self.get_left()[0], self.get_right()[0]
+        top, bottom = self.get_top()[1], self.get_bottom()[1]
+        x = left + (col + 0.5) * (right - left) / cols
+        y = top - (row + 0.5) * (top - bottom) / rows
+        return np.array([x, y, 0.0])
@@ -0,0 +1,71 @@
+"""
+Array-backed point cloud for scenes with thousands of points.
+
+One PMobject holds every point and its RGBA colour in NumPy arrays, so the
+camera draws the whole cloud in a single vectorized pass instead of one Dot
+mobject per point. Colours are updated in place.
+"""
+
+from manim import PMobject, WHITE, color_to_rgba
+import numpy as np
+
+
+def axes_to_scene(axes, coords):
+    """Map an (N, 2) or (N, 3) array of data coordinates to (N, 3) scene points through linear axes"""
+    coords = np.asarray(coords, dtype=float)
+    lows = [axes.x_range[0], axes.y_range[0], getattr(axes, "z_range", [0])[0]][:coords.shape[1]]
+    origin = np.asarray(axes.coords_to_point(*lows), dtype=float)
+
+    points = np.tile(origin, (len(coords), 1))
+    for axis, low in enumerate(lows):
+        shifted = list(lows)
+        shifted[axis] += 1
+        step = np.asarray(axes.coords_to_point(*shifted), dtype=float) - origin
+        points += (coords[:, axis:axis + 1] - low) * step
+    return points
+
+
+def palette_to_rgba(colors, opacity=1.0):
+    """(K, 4) float RGBA array for a list of Manim colours"""
+    return np.array([color_to_rgba(color, opacity) for color in colors])
+
+
+class PointCloud(PMobject):
+    """
+    N points drawn as one mobject; stroke_width sets the pixel size.
+
+    points may be (N, 2) or (N, 3). colors is a single colour, an (N, 4) RGBA
+    array, or None for WHITE.
+    """
+
+    def __init__(self, points, colors=None, stroke_width=2, opacity=1.0, **kwargs):
+        super().__init__(stroke_width=stroke_width, **kwargs)
+        points = np.asarray(points, dtype=float)
+        if points.shape[1] == 2:
+            points = np.column_stack([points, np.zeros(len(points))])
+        self.points = points
+
+        if colors is None or not isinstance(colors, np.ndarray):
+            self.rgbas = np.tile(color_to_rgba(colors or WHITE, opacity), (len(points), 1))
+        else:
+            self.rgbas = np.array(colors, dtype=float)
+
+    @classmethod
+    def from_axes(cls, axes, coords, **kwargs):
+        return cls(axes_to_scene(axes, coords), **kwargs)
+
+    def set_rgbas(self, rgbas):
+        """Replace all colours in place from an (N, 4) array"""
+        self.rgbas[:] = rgbas
+        return self
+
+    def color_by_labels(self, labels, palette):
+        """Colour point i with palette[labels[i]]; palette is a (K, 4) RGBA array"""
+        self.rgbas[:] = palette[labels]
+        return self
+
+    def blend_rgbas(self, start, end, alpha):
+        """Set colours to the interpolation between two (N, 4) arrays"""
+        np.multiply(start, 1 - alpha, out=self.rgbas)
+        self.rgbas += alpha * end
+        return self
@@ -0,0 +1,63 @@
+"""
+Scenes made of independent sections that can be rendered separately.
+
+A section starts from an empty screen and ends by fading everything out, so
+rendering one section on its own produces exactly the frames it contributes to
+the full scene. The render pipeline uses this to render sections in parallel
+processes and join the results without re-encoding.
+"""
+
+import os
+
+from manim import Scene, FadeOut
+
+SECTION_ENV = "MANIM_SECTION"
+
+
+class SectionedScene(Scene):
+    """
+    Scene whose construct() runs the methods named in `sections` in order.
+
+    Each section adds its mobjects with add_element(); clear_section() runs
+    between sections. When the MANIM_SECTION environment variable names a
+    section, only that section (and its trailing clear) is rendered.
+    """
+
+    sections = []
+
+    def construct(self):
+        # Track current elements for proper fade-out management
+        self.current_elements = []
+
+        selected = os.environ.get(SECTION_ENV)
+        if selected:
+            if selected not in self.sections:
+                raise ValueError(f"{type(self).__name__} has no section {selected!r}")
+            self.run_section(self.sections.index(selected))
+            return
+
+        for index in range(len(self.sections)):
+            self.run_section(index)
+
+    def run_section(self, index):
+        """Run one section and the clear_section() after it (the last section keeps its final frame)"""
+        name = self.sections[index]
+        self.begin_section(name)
+        getattr(self, name)()
+        if index < len(self.sections) - 1:
+            self.clear_section()
+
+    def begin_section(self, name):
+        """Called before each section runs; the render pipeline hooks it to snapshot scene state"""
+
+    def add_element(self, element):
+        """Track element for proper cleanup"""
+        self.current_elements.append(element)
+        return element
+
+    def clear_section(self):
+        """Fade out all current elements with proper spacing"""
+        if self.current_elements:
+            self.play(FadeOut(*self.current_elements))
+            self.current_elements = []
+        self.wait(1)
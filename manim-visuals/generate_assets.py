@@ -5,16 +5,55 @@ Generates Manim animations and copies them to the React app's public folder
 """
 
 import argparse
+import itertools
+import os
 import shutil
+import signal
+import socket
 import subprocess
+import sys
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 
+from pipeline import (
+    QUALITIES, STATES, CacheStore, Coordinator, DurationHistory, FileWatcher, HttpCache, Journal, LocalCache,
+    RenderError, RenderTimeout, Stage, call_with_retries, collect_garbage, dependency_files, encode_profile,
+    encoder_args, enforce_budget, estimate_scenes, export_cache, find_sections, import_cache, inputs_fingerprint,
+    is_transient, kill_process_group, longest_first, predicted_makespan, probe,
+    pull_directory, push_directory, quality_frame_rate, render_scene, render_sections, render_shards, run_stages,
+    run_worker, serve_cache, size_report, static_estimate, write_size_report,
+)
+
 # Configuration
 SCENES_DIR = Path("scenes")
 OUTPUT_DIR = Path("generated")
+SNAPSHOT_DIR = OUTPUT_DIR / "snapshots"
+MASTER_DIR = OUTPUT_DIR / "masters"
+# --from-section renders: clips starting mid-scene, never published
+PREVIEW_DIR = OUTPUT_DIR / "previews"
+SIZE_REPORT = OUTPUT_DIR / "size_report.json"
+JOURNAL_PATH = OUTPUT_DIR / "journal.jsonl"
+REMOTE_DIR = OUTPUT_DIR / "remote"
+FAILED_REPORT = OUTPUT_DIR / "failed_scenes.json"
+CACHE_DIR = OUTPUT_DIR / "cache"
+# manim's Text and TeX caches (media_dir is generated/), shared through the render cache under these ref prefixes
+SHARED_CACHE_DIRS = {"texts/": OUTPUT_DIR / "texts", "tex/": OUTPUT_DIR / "Tex"}
+# Shared render cache server, unless --cache-url is given
+CACHE_URL_ENV = "MANIM_CACHE_URL"
+# Watch mode: files watched for edits, and the quality and profile affected scenes are re-rendered at
+WATCH_PATTERNS = ["scenes/**/*.py", "common/**/*.py", "text_encoder_step*.py", "data/**/*"]
+WATCH_QUALITY = "low"
+WATCH_PROFILE = "draft"
+# Size cap of generated/, enforced after every run and by the gc command (least recently used files go first)
+GC_MAX_BYTES = 5 * 1024 ** 3
 REACT_PUBLIC_DIR = Path("../apps/org/public/visuals")
+# Scenes transcoded at once; each encode already runs its alternates in parallel
+ENCODE_WORKERS = 2
+# Retries of a timed-out or resource-starved render/encode, and the first backoff in seconds (doubling)
+RENDER_RETRIES = 2
+RETRY_BACKOFF = 10
 
 # Scene configurations
 SCENES_CONFIG = {
@@ -25,14 +64,66 @@ SCENES_CONFIG = {
     "classification": {
         "svm_visualization.py": ["SVMIntroduction", "KernelTrick"],
     },
+    "clustering": {
+        "kmeans_convergence.py": ["KMeansConvergence"],
+    },
     "neural_network": {
         "backpropagation.py": ["BackpropagationViz", "NeuralNetworkTraining"],
         "text_encoder.py": ["TextEncoderExplained"],
+        "embedding_space.py": ["EmbeddingSpace"],
         "network_architecture.py": ["NetworkArchitectureIntro"],
         "training_process.py": ["TrainingProcessDetail"],
+        "text_encoder_step1_problem.py": ["TextEncoderStep1Problem"],
+        "text_encoder_step2_tokenization.py": ["TextEncoderStep2Tokenization"],
     },
 }
 
+# Encoder profiles (see pipeline/encoding.py for the keys)
+ENCODER_PROFILES = {
+    "draft": {"codec": "libx264", "crf": 30, "preset": "veryfast", "keyframe_interval": 2, "faststart": True},
+    "web": {"codec": "libx264", "crf": 23, "preset": "slow", "keyframe_interval": 2, "faststart": True},
+    "delivery": {"codec": "libx264", "crf": 21, "preset": "slow", "keyframe_interval": 2, "faststart": True,
+                 "alternates": ["webm", "av1"]},
+    "webm": {"codec": "libvpx-vp9", "crf": 33, "bitrate": "0", "keyframe_interval": 2, "container": "webm",
+             "extra_args": ["-deadline", "good", "-cpu-used", "2", "-row-mt", "1"]},
+    "av1": {"codec": "libaom-av1", "crf": 35, "bitrate": "0", "keyframe_interval": 2, "faststart": True,
+            "suffix": ".av1", "extra_args": ["-cpu-used", "6", "-row-mt", "1"]},
+}
+
+# Default profile per quality rung
+QUALITY_PROFILES = {
+    "low": "web",
+    "medium": "web",
+    "high": "delivery",
+    "4k": "delivery",
+}
+
+# Default wall-clock limit in seconds for each render or encode subprocess, per quality rung
+QUALITY_TIMEOUTS = {
+    "low": 900,
+    "medium": 1800,
+    "high": 3600,
+    "4k": 7200,
+}
+
+# Per-scene overrides, keyed by scene name:
+#   "profile": profile name, or {quality: profile name}
+#   "budget":  {"mb": size} or {"kbps": average bitrate}; over-budget outputs get a two-pass re-encode
+#   "timeout": seconds, or {quality: seconds}, overriding QUALITY_TIMEOUTS
+#   "inputs":  data files the scene reads, part of its inputs fingerprint: a path, or
+#              (environment variable, default path or None) for files the environment can swap
+SCENE_OPTIONS = {
+    # 100k-point clouds are slow to encode; skip the alternates
+    "KMeansConvergence": {"profile": {"high": "web", "4k": "web"}, "budget": {"kbps": 1500},
+                          "timeout": {"high": 5400, "4k": 10800}},
+    "LinearRegression30Second": {"budget": {"mb": 2}},
+    "TextEncoderExplained": {"budget": {"kbps": 400}},
+    "TextEncoderStep1Problem": {"budget": {"kbps": 400}},
+    "TextEncoderStep2Tokenization": {"budget": {"kbps": 400},
+                                     "inputs": [("TOKENIZER_CORPUS", "data/tokenizer_corpus.txt")]},
+    "EmbeddingSpace": {"inputs": [("EMBEDDINGS_PATH", None)]},
+}
+
 def setup_directories():
     """Create necessary directories"""
     OUTPUT_DIR.mkdir(exist_ok=True)
@@ -41,69 +132,492 @@ def setup_directories():
     for topic in SCENES_CONFIG.keys():
         (OUTPUT_DIR / topic).mkdir(exist_ok=True)
         (REACT_PUBLIC_DIR / topic).mkdir(exist_ok=True)
+    MASTER_DIR.mkdir(exist_ok=True)
+    PREVIEW_DIR.mkdir(exist_ok=True)
 
-def generate_scene(topic, filename, scene_name):
-    """Generate a single Manim scene"""
+def manim_env():
+    """Environment for manim subprocesses; the project root is importable so scenes can use common/"""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(Path.cwd()), env.get("PYTHONPATH")]))
+    return env
+
+def scene_file(topic, filename):
+    """Path of a scene file: scenes/<topic>/<filename>, or the project root for the text encoder steps"""
     scene_path = SCENES_DIR / topic / filename
-    output_path = OUTPUT_DIR / topic
+    if not scene_path.exists() and Path(filename).exists():
+        return Path(filename)
+    return scene_path
+
+def scene_profile(scene_name, quality, override=None):
+    """Encoder profile name for a scene at a quality: --profile, then SCENE_OPTIONS, then QUALITY_PROFILES"""
+    if override:
+        return override
+    profile = SCENE_OPTIONS.get(scene_name, {}).get("profile")
+    if isinstance(profile, dict):
+        profile = profile.get(quality)
+    return profile or QUALITY_PROFILES[quality]
+
+def scene_timeout(scene_name, quality):
+    """Subprocess timeout for a scene at a quality: SCENE_OPTIONS, then QUALITY_TIMEOUTS"""
+    timeout = SCENE_OPTIONS.get(scene_name, {}).get("timeout")
+    if isinstance(timeout, dict):
+        timeout = timeout.get(quality)
+    return timeout or QUALITY_TIMEOUTS[quality]
+
+def scene_jobs(scenes_to_generate):
+    """One pipeline job per scene to generate"""
+    return [
+        {"topic": topic, "filename": filename, "scene": scene_name}
+        for topic, files in scenes_to_generate.items()
+        for filename, scenes in files.items()
+        for scene_name in scenes
+    ]
+
+def master_path(scene_name, args):
+    """Where a scene's render lands: its master, or for --from-section runs a preview clip"""
+    if args.from_section:
+        return PREVIEW_DIR / f"{scene_name}.mp4"
+    return MASTER_DIR / f"{scene_name}.mp4"
+
+def render_job(job, args):
+    """Render stage: render a scene into its master video"""
+    topic, filename, scene_name = job["topic"], job["filename"], job["scene"]
+    scene_path = scene_file(topic, filename)
+    master_file = master_path(scene_name, args)
+    profile_name = scene_profile(scene_name, args.quality, args.profile)
+    profile = ENCODER_PROFILES[profile_name]
+    frame_rate = quality_frame_rate(args.quality)
+    timeout = scene_timeout(scene_name, args.quality)
+    job.update(master=master_file, profile=profile_name, frame_rate=frame_rate, timeout=timeout)
     
     if not scene_path.exists():
-        print(f"⚠️  Scene file not found: {scene_path}")
-        return False
+        raise RenderError(f"Scene file not found: {scene_path}")
     
-    try:
-        # Generate MP4 video
-        print(f"🎬 Generating {scene_name} from {topic}/{filename}")
-        result = subprocess.run([
-            "manim", 
-            "-ql",  # Low quality for faster generation
-            "--output_file", f"{scene_name}.mp4",
-            str(scene_path),
-            scene_name
-        ], capture_output=True, text=True, cwd=output_path.parent)
-        
-        if result.returncode != 0:
-            print(f"❌ Error generating {scene_name}:")
-            print(result.stderr)
+    sections = find_sections(scene_path, scene_name) if args.jobs > 1 and not args.from_section else []
+    # Piped frames can go straight into the primary encoder; other paths produce a master to transcode
+    job["direct"] = False
+    if len(sections) > 1:
+        # Independent sections render in parallel and are joined without re-encoding
+        print(f"🎬 Generating {scene_name} from {topic}/{filename} ({len(sections)} sections in parallel)")
+        render_sections(scene_path, scene_name, sections, master_file, OUTPUT_DIR / "sections" / scene_name,
+                        quality=args.quality, jobs=args.jobs, env=manim_env(), timeout=timeout)
+    elif args.shards > 1 and not args.from_section:
+        # One long timeline split into frame ranges rendered by separate processes
+        print(f"🎬 Generating {scene_name} from {topic}/{filename} ({args.shards} shards)")
+        ranges = render_shards(scene_path, scene_name, master_file, OUTPUT_DIR / "shards" / scene_name,
+                               args.shards, quality=args.quality, env=manim_env(), jobs=args.jobs,
+                               pipe=args.pipe_frames, timeout=timeout)
+        print(f"🧩 Stitched plays {', '.join(f'{first}-{last}' for first, last in ranges)}")
+    else:
+        # Generate MP4 video, snapshotting section state for later --from-section runs
+        resume_note = f" from section {args.from_section}" if args.from_section else ""
+        print(f"🎬 Generating {scene_name} from {topic}/{filename}{resume_note}")
+        job["direct"] = args.pipe_frames and profile.get("container", "mp4") == "mp4"
+        generated_file, result = render_scene(
+            scene_path, scene_name, OUTPUT_DIR, quality=args.quality, snapshot_dir=SNAPSHOT_DIR,
+            from_section=args.from_section, pipe=args.pipe_frames, holds=not args.no_hold_detection,
+            encoder_args=encoder_args(profile, frame_rate) if job["direct"] else None, env=manim_env(),
+            timeout=timeout, snapshot_inputs=scene_data_files(scene_name),
+        )
+        if result["held_frames"]:
+            print(f"⏸️  Reused {result['held_frames']} held frames, rasterized {result['rendered_frames']}")
+        if result["resumed"] == "replay":
+            print(f"⏩ No snapshot for {args.from_section}; replayed earlier sections without rendering")
+        shutil.move(str(generated_file), str(master_file))
+
+# Options a worker renders with; --jobs stays the worker's own
+REMOTE_ARGS = ("quality", "profile", "shards", "pipe_frames", "no_hold_detection", "from_section", "retries")
+remote_ids = itertools.count()
+
+def remote_render_job(job, args, coordinator):
+    """Render stage in coordinator mode: queue the scene for a worker and take over the master it uploads"""
+    job_id = f"{job['scene']}@{args.quality}-{next(remote_ids)}"
+    spec = {name: job[name] for name in ("topic", "filename", "scene")}
+    spec["args"] = {name: getattr(args, name) for name in REMOTE_ARGS}
+    coordinator.submit(job_id, spec)
+    print(f"📡 {job['scene']} queued for remote workers")
+    job["timeout"] = scene_timeout(job["scene"], args.quality)
+    result = coordinator.wait(job_id, timeout=job["timeout"])
+    
+    master_file = master_path(job["scene"], args)
+    shutil.move(result["artifacts"][result["master"]], master_file)
+    job.update(master=master_file, direct=result["direct"], profile=result["profile"],
+               frame_rate=result["frame_rate"], timeout=result["timeout"], worker=result["worker"])
+    print(f"📥 {job['scene']} rendered by {result['worker']}")
+
+def serve_worker(args, store=None):
+    """Worker mode: render scenes handed out by the coordinator at args.worker until it shuts down"""
+    setup_directories()
+    pull_shared_caches(store)
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    work_dir = OUTPUT_DIR / "worker" / worker_id
+    work_dir.mkdir(parents=True, exist_ok=True)
+    
+    def handle(spec):
+        job_args = argparse.Namespace(**dict(vars(args), **spec["args"]))
+        job = {name: spec[name] for name in ("topic", "filename", "scene")}
+        with_retries(render_job, job, job_args)
+        # Out of MASTER_DIR, which a coordinator on the same machine also uses
+        master = work_dir / job["master"].name
+        shutil.move(str(job["master"]), master)
+        push_shared_caches(store)
+        result = {name: job[name] for name in ("direct", "profile", "frame_rate", "timeout")}
+        return dict(result, master=master.name), [master]
+    
+    print(f"🛠️  Worker {worker_id} taking jobs from {args.worker}")
+    completed = run_worker(args.worker, handle, worker_id, is_transient=is_transient)
+    print(f"🛠️  Worker {worker_id} finished {completed} job(s)")
+
+def start_coordinator(args):
+    """Coordinator mode: serve render jobs at args.serve and start args.local_workers worker processes"""
+    host, _, port = (args.serve or "127.0.0.1:0").rpartition(":")
+    coordinator = Coordinator(REMOTE_DIR, host=host or "127.0.0.1", port=int(port or 0)).start()
+    print(f"📡 Coordinator listening on {coordinator.url}")
+    command = [sys.executable, str(Path(__file__).resolve()), "--worker", coordinator.url, "--jobs", str(args.jobs)]
+    if args.no_cache:
+        command.append("--no-cache")
+    elif args.cache_url:
+        command += ["--cache-url", args.cache_url]
+    workers = [subprocess.Popen(command) for _ in range(args.local_workers)]
+    return coordinator, workers
+
+def encode_job(job, args):
+    """Encode stage: transcode the master into the scene's profile outputs and hold them to its budget"""
+    scene_name, master_file, frame_rate = job["scene"], job["master"], job["frame_rate"]
+    profile = ENCODER_PROFILES[job["profile"]]
+    outputs = encode_profile(master_file, OUTPUT_DIR / job["topic"] / scene_name, job["profile"],
+                             ENCODER_PROFILES, frame_rate, primary_done=job["direct"], keep_master=True,
+                             timeout=job["timeout"])
+    job["outputs"] = outputs
+    
+    budget = SCENE_OPTIONS.get(scene_name, {}).get("budget")
+    if budget:
+        output_profiles = [profile] + [ENCODER_PROFILES[name] for name in profile.get("alternates", [])]
+        for output, output_profile in zip(outputs, output_profiles):
+            # Re-encode from the master when there is one, to avoid a second generation of loss
+            source = output if job["direct"] else master_file
+            entry = enforce_budget(output, source, output_profile, budget, frame_rate, timeout=job["timeout"])
+            if entry["status"] == "reencoded":
+                print(f"📉 {output.name}: two-pass encode to {entry['size'] / 1e6:.2f} MB (budget {entry['limit'] / 1e6:.2f} MB)")
+            elif entry["status"] == "over_budget":
+                needed = f", needs ~{entry['needed_kbps']} kbps" if "needed_kbps" in entry else ""
+                print(f"⚠️  {output.name}: {entry['size'] / 1e6:.2f} MB exceeds budget {entry['limit'] / 1e6:.2f} MB{needed}")
+    master_file.unlink(missing_ok=True)
+
+def probe_job(job, args):
+    """Probe stage: check every output is a playable video before it is published"""
+    job["probes"] = {}
+    for output in job["outputs"]:
+        info = probe(output, timeout=job["timeout"])
+        if not info["duration"] or not info["width"]:
+            raise RenderError(f"{output} has no playable video stream")
+        job["probes"][output.name] = info
+
+def publish_job(job, args):
+    """Publish stage: copy the scene's outputs to the React app and refresh the manifest"""
+    if not REACT_PUBLIC_DIR.parent.exists():
+        return
+    react_topic_dir = REACT_PUBLIC_DIR / job["topic"]
+    react_topic_dir.mkdir(parents=True, exist_ok=True)
+    for output in job["outputs"]:
+        shutil.copy2(output, react_topic_dir / output.name)
+        print(f"📄 Published: {job['topic']}/{output.name}")
+    generate_manifest()
+
+def report_job(job, error):
+    """Print the outcome of a job leaving the pipeline"""
+    scene_name = job["scene"]
+    if error is None and "outputs" not in job:
+        print(f"🎞️  Preview of {scene_name} from section {job['from_section']}: {job['master']}")
+    elif error is None:
+        seconds = sum(job["timings"].values())
+        for output in job["outputs"]:
+            info = job["probes"][output.name]
+            print(f"✅ Generated: {output} ({job['profile']}, {info['duration']:.1f}s, {info['size'] / 1e6:.2f} MB)")
+        print(f"⏱️  {scene_name}: {seconds:.1f}s ({', '.join(f'{name} {t:.1f}s' for name, t in job['timings'].items())}; "
+              f"render predicted {job['predicted']:.1f}s from {job['predicted_from']})")
+    elif isinstance(error, RenderTimeout):
+        print(f"⌛ {scene_name} timed out in {job['failed_stage']} after {job['timeout']}s; killed its processes")
+    elif isinstance(error, RenderError):
+        print(f"❌ Error generating {scene_name} ({job['failed_stage']}):")
+        print(error)
+    else:
+        print(f"❌ Exception generating {scene_name} ({job['failed_stage']}): {error}")
+
+def with_retries(stage_function, job, args):
+    """Run a stage function on a job, retrying transient failures (timeouts, resource exhaustion) with backoff"""
+    def on_retry(attempt, error, delay):
+        reason = "timed out" if isinstance(error, RenderTimeout) else str(error).strip().splitlines()[-1]
+        print(f"🔁 {job['scene']}: attempt {attempt} failed ({reason}); retrying in {delay}s")
+        job["retries"] = attempt
+    
+    call_with_retries(lambda: stage_function(job, args), retries=args.retries, backoff=RETRY_BACKOFF,
+                      on_retry=on_retry)
+
+def write_failed_report(finished, quality):
+    """Record this run's failed scenes in FAILED_REPORT, keeping failures of scenes not attempted this run"""
+    attempted = {job["scene"] for job in finished}
+    failures = [entry for entry in load_failed_report() if entry["scene"] not in attempted]
+    for job in finished:
+        if "failed_stage" in job:
+            failures.append({
+                "topic": job["topic"],
+                "filename": job["filename"],
+                "scene": job["scene"],
+                "quality": quality,
+                "stage": job["failed_stage"],
+                "timed_out": isinstance(job["error"], RenderTimeout),
+                "retries": job.get("retries", 0),
+                "error": "\n".join(str(job["error"]).strip().splitlines()[-20:]),
+                "failed_at": str(datetime.now()),
+            })
+    
+    if failures:
+        with open(FAILED_REPORT, "w") as f:
+            json.dump(failures, f, indent=2)
+        print(f"📋 {len(failures)} failed scene(s) recorded in {FAILED_REPORT}; rerun them with --retry-failed")
+    else:
+        FAILED_REPORT.unlink(missing_ok=True)
+
+def load_failed_report():
+    """Failed scenes recorded by earlier runs"""
+    if not FAILED_REPORT.exists():
+        return []
+    with open(FAILED_REPORT) as f:
+        return json.load(f)
+
+def failed_scenes():
+    """The scenes of the failed-scene report, shaped like SCENES_CONFIG"""
+    scenes = {}
+    for entry in load_failed_report():
+        names = scenes.setdefault(entry["topic"], {}).setdefault(entry["filename"], [])
+        if entry["scene"] not in names:
+            names.append(entry["scene"])
+    return scenes
+
+def scene_data_files(scene_name):
+    """Data files a scene reads, from its SCENE_OPTIONS "inputs" with environment overrides applied"""
+    files = []
+    for entry in SCENE_OPTIONS.get(scene_name, {}).get("inputs", []):
+        variable, default = entry if isinstance(entry, (list, tuple)) else (None, entry)
+        path = (variable and os.environ.get(variable)) or default
+        if path:
+            files.append(Path(path).resolve())
+    return files
+
+def job_fingerprint(job, quality):
+    """Inputs fingerprint of a scene job: every source file the scene imports, its data files, profiles and options"""
+    scene_path = scene_file(job["topic"], job["filename"])
+    profile_name = job["profile"]
+    profile = ENCODER_PROFILES[profile_name]
+    settings = {
+        "scene": job["scene"],
+        "quality": quality,
+        "profiles": {name: ENCODER_PROFILES[name] for name in [profile_name, *profile.get("alternates", [])]},
+        "options": {key: value for key, value in SCENE_OPTIONS.get(job["scene"], {}).items() if key != "timeout"},
+    }
+    files = dependency_files(scene_path) | set(scene_data_files(job["scene"]))
+    return inputs_fingerprint(files, settings, root=Path.cwd().resolve())
+
+def resume_point(previous):
+    """The last journal state a job can resume after, or None when the files it left are gone"""
+    if previous is None:
+        return None
+    completed = previous.get("completed")
+    if completed in ("encoded", "probed", "done"):
+        if previous.get("outputs") and all(Path(output).exists() for output in previous["outputs"]):
+            return completed
+    elif completed == "rendered" and Path(previous["master"]).exists():
+        return completed
+    return None
+
+def journal_fields(job, state, args):
+    """What the journal needs to resume a job after `state`"""
+    if state == "rendered":
+        return {"master": str(job["master"]), "direct": job["direct"], "profile": job["profile"],
+                "frame_rate": job["frame_rate"], "timeout": job["timeout"]}
+    if state == "encoded":
+        return {"outputs": [str(output) for output in job["outputs"]]}
+    if state == "probed":
+        return {"probes": job["probes"]}
+    # Only uninterrupted renders feed the render-time history
+    measured = "resume" not in job
+    return {"scene": job["scene"], "quality": args.quality, "timings": job["timings"], "measured": measured}
+
+def journaled(stage_function, state, job, args, journal):
+    """
+    Run a stage unless the job already got past it in an earlier run, then
+    journal the new state. --from-section runs render only part of a scene
+    and are never journaled.
+    """
+    if "resume" in job and STATES.index(job["resume"]) >= STATES.index(state):
+        return
+    with_retries(stage_function, job, args)
+    if not args.from_section:
+        journal.record(job["key"], state, fingerprint=job["fingerprint"], **journal_fields(job, state, args))
+
+def open_cache(args):
+    """Render cache under CACHE_DIR, reading and writing through to the shared server at --cache-url if any"""
+    if args.no_cache:
+        return None
+    remote = HttpCache(args.cache_url) if args.cache_url else None
+    return CacheStore(LocalCache(CACHE_DIR), remote)
+
+def restore_from_cache(job, store, args):
+    """Copy a scene's encoded outputs out of the render cache; False when it has no complete entry for the job"""
+    if store is None or job["fingerprint"] is None or args.from_section:
+        return False
+    entry = store.get_ref(f"scene/{job['fingerprint']}")
+    if entry is None:
+        return False
+    outputs = []
+    for name, digest in entry["outputs"].items():
+        output = OUTPUT_DIR / job["topic"] / name
+        if not store.get(digest, output):
             return False
+        outputs.append(output)
+    job.update(outputs=outputs, profile=entry["profile"], resume="encoded", from_cache=True)
+    return True
+
+def cache_outputs(job, store, args):
+    """Store a scene's probed outputs in the render cache under its inputs fingerprint"""
+    if store is None or job["fingerprint"] is None or args.from_section:
+        return
+    outputs = {output.name: store.put_file(output) for output in job["outputs"]}
+    store.put_ref(f"scene/{job['fingerprint']}",
+                  {"topic": job["topic"], "scene": job["scene"], "profile": job["profile"], "outputs": outputs})
+
+def pull_shared_caches(store):
+    """Fill manim's Text and TeX caches from the render cache"""
+    if store is None:
+        return
+    pulled = sum(pull_directory(store, prefix, directory) for prefix, directory in SHARED_CACHE_DIRS.items())
+    if pulled:
+        print(f"☁️  Pulled {pulled} Text/TeX cache file(s)")
+
+def push_shared_caches(store):
+    """Add new files of manim's Text and TeX caches to the render cache"""
+    if store is None:
+        return
+    for prefix, directory in SHARED_CACHE_DIRS.items():
+        push_directory(store, prefix, directory)
+
+def plan_jobs(scenes_to_generate, args, journal, store=None):
+    """
+    Scene jobs still to run; finished ones are dropped, interrupted ones resume
+    from the journal and ones the render cache has skip straight to probing.
+    """
+    jobs, up_to_date = [], []
+    for job in scene_jobs(scenes_to_generate):
+        job["key"] = f"{job['scene']}@{args.quality}"
+        job["profile"] = scene_profile(job["scene"], args.quality, args.profile)
+        try:
+            job["fingerprint"] = job_fingerprint(job, args.quality)
+        except OSError:
+            job["fingerprint"] = None  # missing scene file; the render stage reports it
         
-        # Move generated file to proper location
-        generated_file = output_path.parent / "media" / "videos" / topic / filename.replace(".py", "") / "480p15" / f"{scene_name}.mp4"
-        target_file = output_path / f"{scene_name}.mp4"
-        
-        if generated_file.exists():
-            shutil.move(str(generated_file), str(target_file))
-            print(f"✅ Generated: {target_file}")
-            return True
+        # A partial --from-section render neither counts as nor is skipped by a full one
+        # Without a fingerprint (missing scene or data file) there is nothing to compare the journal against
+        previous = None if args.force or args.from_section or job["fingerprint"] is None \
+            else journal.state(job["key"], job["fingerprint"])
+        resume = resume_point(previous)
+        if resume == "done":
+            print(f"⏭️  {job['scene']}: up to date")
+            job.update(up_to_date=True, outputs=[Path(output) for output in previous["outputs"]])
+            up_to_date.append(job)
+            continue
+        if resume:
+            print(f"♻️  {job['scene']}: resuming after {resume}")
+            job["resume"] = resume
+            for name in ("direct", "profile", "frame_rate", "timeout", "probes"):
+                if name in previous:
+                    job[name] = previous[name]
+            job["master"] = Path(previous["master"]) if "master" in previous else None
+            if "outputs" in previous:
+                job["outputs"] = [Path(output) for output in previous["outputs"]]
+        elif not args.from_section:
+            journal.record(job["key"], "queued", fingerprint=job["fingerprint"], scene=job["scene"],
+                           quality=args.quality)
+            if not args.force and restore_from_cache(job, store, args):
+                print(f"☁️  {job['scene']}: restored from the render cache")
+                journal.record(job["key"], "encoded", fingerprint=job["fingerprint"], profile=job["profile"],
+                               outputs=[str(output) for output in job["outputs"]])
+        jobs.append(job)
+    return jobs, up_to_date
+
+def schedule_jobs(jobs, quality, history):
+    """Predict each job's render time and order the jobs longest first"""
+    for job in jobs:
+        expected = history.expected(job["scene"], quality)
+        if STATES.index(job.get("resume", "queued")) >= STATES.index("rendered"):
+            job.update(predicted=0.0, predicted_from="journal")
+        elif expected is not None:
+            job.update(predicted=expected, predicted_from="history")
         else:
-            print(f"❌ Could not find generated file: {generated_file}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Exception generating {scene_name}: {e}")
-        return False
+            scene_path = scene_file(job["topic"], job["filename"])
+            job.update(predicted=static_estimate(scene_path, job["scene"], quality), predicted_from="estimate")
+    return longest_first(jobs, lambda job: job["predicted"])
 
-def copy_to_react():
-    """Copy generated assets to React public folder"""
-    if not REACT_PUBLIC_DIR.parent.exists():
-        print(f"⚠️  React public directory not found: {REACT_PUBLIC_DIR.parent}")
-        print("Skipping React copy (development mode)")
-        return
+def generate_scenes(scenes_to_generate, args, coordinator=None, store=None):
+    """
+    Run every scene through the render -> encode -> probe -> publish stages.
     
-    print(f"📁 Copying assets to React app...")
+    With a coordinator, renders are handed to remote workers. With a render
+    cache store, scenes it has are restored instead of rendered and new
+    outputs are added to it. Returns the finished jobs, including ones the
+    journal shows are already up to date.
+    """
+    journal = Journal(JOURNAL_PATH)
+    pull_shared_caches(store)
+    jobs, up_to_date = plan_jobs(scenes_to_generate, args, journal, store)
+    jobs = schedule_jobs(jobs, args.quality, DurationHistory.from_journal(journal))
+    if not jobs:
+        return up_to_date
+    slots = args.local_workers if coordinator is not None and args.local_workers else args.scene_jobs
+    predicted = predicted_makespan([job["predicted"] for job in jobs], slots)
+    print(f"🗓️  Render order (longest first): {', '.join(job['scene'] for job in jobs)}")
+    print(f"🗓️  Predicted render time: {predicted:.1f}s on {slots} worker(s)")
     
-    for topic_dir in OUTPUT_DIR.iterdir():
-        if topic_dir.is_dir():
-            react_topic_dir = REACT_PUBLIC_DIR / topic_dir.name
-            react_topic_dir.mkdir(parents=True, exist_ok=True)
-            
-            for asset_file in topic_dir.glob("*.mp4"):
-                target_file = react_topic_dir / asset_file.name
-                shutil.copy2(asset_file, target_file)
-                print(f"📄 Copied: {asset_file.name}")
+    def finish(job, error):
+        if error is not None and not args.from_section:
+            journal.record(job["key"], "failed", fingerprint=job["fingerprint"], stage=job["failed_stage"],
+                           error="\n".join(str(error).strip().splitlines()[-20:]))
+        report_job(job, error)
+    
+    if coordinator is not None:
+        # Render threads only wait on workers; one per job keeps every worker busy
+        render, render_workers = (lambda job, args: remote_render_job(job, args, coordinator)), len(jobs)
+    else:
+        render, render_workers = render_job, args.scene_jobs
+    
+    def probe_and_cache(job, args):
+        probe_job(job, args)
+        # Only outputs that probed as playable videos go into the cache
+        if not job.get("from_cache"):
+            cache_outputs(job, store, args)
+    
+    start = time.perf_counter()
+    stages = [
+        Stage("render", lambda job: journaled(render, "rendered", job, args, journal), workers=render_workers),
+        Stage("encode", lambda job: journaled(encode_job, "encoded", job, args, journal), workers=ENCODE_WORKERS),
+        Stage("probe", lambda job: journaled(probe_and_cache, "probed", job, args, journal), workers=2),
+        Stage("publish", lambda job: journaled(publish_job, "done", job, args, journal)),
+    ]
+    if args.from_section:
+        # A clip starting mid-scene is a preview: it is not encoded into the scene's outputs or published
+        for job in jobs:
+            job["from_section"] = args.from_section
+        stages = stages[:1]
+    finished = run_stages(jobs, stages, on_finished=finish)
+    elapsed = time.perf_counter() - start
+    push_shared_caches(store)
+    
+    print(f"\n⏱️  Wall time {elapsed:.1f}s (render predicted {predicted:.1f}s)")
+    write_failed_report(finished, args.quality)
+    return finished + up_to_date
 
 def generate_manifest():
-    """Generate a manifest file for the React app"""
+    """Generate a manifest file for the React app: per topic, each scene's files with the primary first"""
     manifest = {
         "generated_at": str(datetime.now()),
         "assets": {}
@@ -112,9 +626,14 @@ def generate_manifest():
     for topic in SCENES_CONFIG.keys():
         topic_dir = REACT_PUBLIC_DIR / topic
         if topic_dir.exists():
-            manifest["assets"][topic] = [
-                f.name for f in topic_dir.glob("*.mp4")
-            ]
+            scenes = {}
+            for f in sorted(topic_dir.iterdir()):
+                if f.suffix in (".mp4", ".webm"):
+                    # Scene.mp4 groups with its alternates Scene.webm and Scene.av1.mp4
+                    scenes.setdefault(f.name.split(".")[0], []).append(f.name)
+            manifest["assets"][topic] = {
+                scene: sorted(files, key=lambda name: (name.count("."), name)) for scene, files in scenes.items()
+            }
     
     manifest_path = REACT_PUBLIC_DIR / "manifest.json"
     with open(manifest_path, "w") as f:
@@ -180,6 +699,178 @@ def filter_scenes_to_generate(args):
     
     return scenes_to_generate
 
+def report_estimates(scenes_to_generate, quality):
+    """Print the static cost estimate of each scene, most expensive first"""
+    scenes = [
+        (scene_file(topic, filename), scene_name)
+        for topic, files in scenes_to_generate.items()
+        for filename, scene_names in files.items()
+        for scene_name in scene_names
+        if scene_file(topic, filename).exists()
+    ]
+    estimates = estimate_scenes(scenes, quality)
+    
+    print(f"📐 Estimated render cost at {quality} quality:")
+    print(f"  {'scene':<32} {'video':>7} {'frames':>7} {'plays':>6} {'text':>5} {'tex':>5} {'redraw':>7} {'render':>8} {'cost':>6}")
+    for scene_name, estimate in sorted(estimates.items(), key=lambda item: -item[1]["render_seconds"]):
+        print(f"  {scene_name:<32} {estimate['duration']:>6.1f}s {estimate['frames']:>7} "
+              f"{estimate['plays'] + estimate['waits']:>6} {estimate['texts']:>5} {estimate['tex'] + estimate['tables']:>5} "
+              f"{estimate['redraws']:>7} {estimate['render_seconds']:>7.1f}s {estimate['relative_cost']:>6.2f}")
+
+def report_sizes():
+    """Write the size report of the videos in the React bundle and print per-topic totals"""
+    budgets = {name: options["budget"] for name, options in SCENE_OPTIONS.items() if "budget" in options}
+    if REACT_PUBLIC_DIR.parent.exists():
+        shipped, heading = REACT_PUBLIC_DIR, "Published sizes"
+    else:
+        # Nothing is published without the React app; report what would be
+        shipped, heading = OUTPUT_DIR, f"Generated sizes (no React app at {REACT_PUBLIC_DIR.parent})"
+    report = size_report(shipped, list(SCENES_CONFIG), budgets, timeout=QUALITY_TIMEOUTS["low"])
+    write_size_report(report, SIZE_REPORT)
+    
+    print(f"\n📦 {heading}:")
+    for topic, entry in report["topics"].items():
+        over = [f["file"] for f in entry["files"] if f["within_budget"] is False]
+        note = f"  ⚠️  over budget: {', '.join(over)}" if over else ""
+        print(f"  {topic}: {entry['total'] / 1e6:.2f} MB ({len(entry['files'])} files){note}")
+    print(f"  total: {report['total'] / 1e6:.2f} MB -> {SIZE_REPORT}")
+
+def run_cache_server(address):
+    """Serve CACHE_DIR as a shared render cache at address until interrupted"""
+    host, _, port = address.rpartition(":")
+    server = serve_cache(CACHE_DIR, host=host or "127.0.0.1", port=int(port or 0))
+    host, port = server.server_address[:2]
+    print(f"☁️  Render cache {CACHE_DIR} served at http://{host}:{port} (set {CACHE_URL_ENV} or --cache-url on clients)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def parse_size(text):
+    """Byte count of a size such as 500M or 2G (a bare number is bytes)"""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    text = text.strip().upper()
+    if text.endswith("B"):
+        text = text[:-1]
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def manifest_outputs():
+    """Outputs under OUTPUT_DIR of the videos the published manifest lists"""
+    manifest_path = REACT_PUBLIC_DIR / "manifest.json"
+    if not manifest_path.exists():
+        return []
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    outputs = []
+    for topic, scenes in manifest.get("assets", {}).items():
+        # Manifests written before alternates were grouped hold a flat list of file names
+        names = [name for files in scenes.values() for name in files] if isinstance(scenes, dict) else scenes
+        outputs += [OUTPUT_DIR / topic / name for name in names]
+    return outputs
+
+def collect_generated(max_bytes, keep=(), dry_run=False):
+    """Evict least recently used files from OUTPUT_DIR down to max_bytes, never the published outputs"""
+    cache = LocalCache(CACHE_DIR) if CACHE_DIR.exists() else None
+    report = collect_garbage(OUTPUT_DIR, max_bytes, cache=cache, keep=[*manifest_outputs(), *keep],
+                             shared_dirs=SHARED_CACHE_DIRS, dry_run=dry_run)
+    
+    if report["evicted"]:
+        freed = sum(entry["size"] for entry in report["evicted"])
+        action = "Would evict" if dry_run else "Evicted"
+        print(f"🧹 {action} {len(report['evicted'])} file(s), {freed / 1e6:.1f} MB: {OUTPUT_DIR} "
+              f"{report['total'] / 1e6:.1f} MB -> {report['remaining'] / 1e6:.1f} MB (cap {max_bytes / 1e6:.1f} MB)")
+        if dry_run:
+            for entry in report["evicted"]:
+                print(f"  {entry['path']} ({entry['size'] / 1e6:.2f} MB, last used {datetime.fromtimestamp(entry['last_used']):%Y-%m-%d %H:%M})")
+    else:
+        print(f"🧹 {OUTPUT_DIR}: {report['total'] / 1e6:.1f} MB, within the {max_bytes / 1e6:.1f} MB cap")
+    if report["remaining"] > max_bytes:
+        print(f"⚠️  Published outputs and bookkeeping alone take {report['protected'] / 1e6:.1f} MB, over the cap")
+
+def export_render_cache(archive):
+    """Pack the render cache, Text/TeX caches included, into one archive"""
+    store = CacheStore(LocalCache(CACHE_DIR))
+    push_shared_caches(store)
+    refs, objects = export_cache(store.local, archive)
+    print(f"📦 Exported {refs} cache entries and {objects} objects to {archive} ({Path(archive).stat().st_size / 1e6:.1f} MB)")
+
+def import_render_cache(archive):
+    """Load an exported render cache and restore the Text/TeX caches from it"""
+    store = CacheStore(LocalCache(CACHE_DIR))
+    report = import_cache(store.local, archive)
+    print(f"📦 Imported {report['objects']} objects ({report['present']} already cached) and {report['refs']} cache entries from {archive}")
+    if report["corrupt"]:
+        print(f"⚠️  {len(report['corrupt'])} object(s) failed hash verification; "
+              f"left out with the {report['skipped_refs']} cache entries using them")
+    pull_shared_caches(store)
+
+def scene_dependencies(jobs, known):
+    """Update known with the project files each job's scene imports; a scene that does not parse mid-edit keeps its last graph"""
+    for job in jobs:
+        scene_path = scene_file(job["topic"], job["filename"])
+        try:
+            known[job["scene"]] = dependency_files(scene_path) | set(scene_data_files(job["scene"]))
+        except (OSError, SyntaxError, ValueError):
+            known[job["scene"]] = known.get(job["scene"], set()) | {scene_path.resolve()}
+    return known
+
+def watch_command(job, args):
+    """Command line of the child run re-rendering one scene in watch mode"""
+    command = [
+        sys.executable, str(Path(__file__).resolve()), "--topic", job["topic"], "--file", job["filename"],
+        "--scene", job["scene"], "--quality", WATCH_QUALITY, "--profile", WATCH_PROFILE, "--jobs", str(args.jobs),
+        "--no-gc",
+    ]
+    for flag in ("pipe_frames", "no_hold_detection", "no_cache"):
+        if getattr(args, flag):
+            command.append("--" + flag.replace("_", "-"))
+    if args.cache_url and not args.no_cache:
+        command += ["--cache-url", args.cache_url]
+    return command
+
+def watch_scenes(scenes_to_generate, args):
+    """Watch mode: re-render scenes at draft quality whenever a file they import changes"""
+    jobs = {job["scene"]: job for job in scene_jobs(scenes_to_generate)}
+    dependencies = scene_dependencies(jobs.values(), {})
+    watcher = FileWatcher(WATCH_PATTERNS)
+    # Each render is a child run in its own session, so cancelling it kills its manim and ffmpeg processes too
+    running, queued = {}, []
+    print(f"👀 Watching {len(watcher.files)} files for {len(jobs)} scene(s); "
+          f"changed scenes re-render at {WATCH_QUALITY} quality with the {WATCH_PROFILE} profile (Ctrl-C to stop)")
+    
+    try:
+        while True:
+            changed = watcher.changes(timeout=1)
+            if changed:
+                scene_dependencies(jobs.values(), dependencies)
+                affected = [name for name in jobs if dependencies[name] & changed]
+                if affected:
+                    print(f"\n✏️  {', '.join(sorted(path.name for path in changed))} changed: {', '.join(affected)}")
+                for name in affected:
+                    if name in running:
+                        kill_process_group(running.pop(name))
+                        print(f"⏹️  {name}: cancelled the render in progress")
+                    if name not in queued:
+                        queued.append(name)
+            
+            for name, process in list(running.items()):
+                if process.poll() is not None:
+                    del running[name]
+                    if process.returncode != 0:
+                        print(f"❌ {name}: render exited with status {process.returncode}")
+            while queued and len(running) < max(1, args.scene_jobs):
+                name = queued.pop(0)
+                running[name] = subprocess.Popen(watch_command(jobs[name], args), start_new_session=True)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        for process in running.values():
+            kill_process_group(process)
+
 def main():
     """Main generation process"""
     parser = argparse.ArgumentParser(description="Generate Manim video assets")
@@ -187,10 +878,101 @@ def main():
     parser.add_argument("--file", "-f", help="Generate only scenes from specific file (e.g., text_encoder.py)")
     parser.add_argument("--scene", "-s", help="Generate only specific scene (e.g., TextEncoderExplained)")
     parser.add_argument("--list", "-l", action="store_true", help="List all available scenes")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="Worker processes for rendering the sections of a scene in parallel (1 disables)")
+    parser.add_argument("--scene-jobs", type=int, default=1,
+                        help="Scenes rendered at the same time; encoding and publishing always overlap rendering")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Split scenes without sections into this many frame ranges rendered in parallel")
+    parser.add_argument("--quality", "-q", choices=list(QUALITIES), default="low",
+                        help="Render quality rung (default: low)")
+    parser.add_argument("--profile", "-p", choices=list(ENCODER_PROFILES),
+                        help="Encoder profile for every scene, overriding SCENE_OPTIONS and QUALITY_PROFILES")
+    parser.add_argument("--pipe-frames", action="store_true",
+                        help="Stream frames into one ffmpeg encoder per scene instead of per-animation partial movies")
+    parser.add_argument("--no-hold-detection", action="store_true",
+                        help="Rasterize every frame of wait() holds even when nothing changes")
+    parser.add_argument("--from-section",
+                        help="Render a sectioned scene from this section onward, restoring earlier state from its snapshot")
+    parser.add_argument("--retries", type=int, default=RENDER_RETRIES,
+                        help="Retries of a scene whose render or encode timed out or ran out of resources")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Re-run only the scenes recorded as failed by earlier runs")
+    parser.add_argument("--serve", nargs="?", const="127.0.0.1:0", metavar="HOST:PORT",
+                        help="Hand renders to remote workers through a coordinator listening here")
+    parser.add_argument("--local-workers", type=int, default=0,
+                        help="Worker processes to start on this machine (implies --serve)")
+    parser.add_argument("--worker", metavar="URL",
+                        help="Run as a render worker for the coordinator at URL")
+    parser.add_argument("--cache-url", default=os.environ.get(CACHE_URL_ENV), metavar="URL",
+                        help=f"Shared render cache server to read and write through (default: ${CACHE_URL_ENV})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither restore scenes from the render cache nor add new outputs to it")
+    parser.add_argument("--serve-cache", nargs="?", const="127.0.0.1:8765", metavar="HOST:PORT",
+                        help="Serve the local render cache to other machines instead of generating")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-render every selected scene even when the job journal shows it is up to date")
+    parser.add_argument("--estimate", action="store_true",
+                        help="Print the static render-cost estimate of the selected scenes without rendering")
+    parser.add_argument("--size-report", action="store_true",
+                        help="Only rebuild the size report of the published videos")
+    parser.add_argument("--watch", action="store_true",
+                        help=f"Re-render the selected scenes at {WATCH_QUALITY} quality ({WATCH_PROFILE} profile) "
+                             "whenever a file they import changes")
+    parser.add_argument("--no-gc", action="store_true",
+                        help=f"Skip the post-run garbage collection of {OUTPUT_DIR}")
+    
+    commands = parser.add_subparsers(dest="command", title="commands")
+    gc_parser = commands.add_parser("gc", help=f"Evict least recently used files from {OUTPUT_DIR} down to a size cap")
+    gc_parser.add_argument("--max-size", type=parse_size, default=GC_MAX_BYTES,
+                           help=f"Size cap such as 500M or 2G (default: {GC_MAX_BYTES / 1024 ** 3:g}G)")
+    gc_parser.add_argument("--dry-run", action="store_true", help="List what would be evicted without deleting it")
+    cache_parser = commands.add_parser("cache", help="Move the render cache between machines as one archive")
+    cache_commands = cache_parser.add_subparsers(dest="cache_command", required=True)
+    cache_commands.add_parser("export", help="Pack the render cache into an archive").add_argument(
+        "archive", help="Archive to write (e.g. render-cache.tar.gz)")
+    cache_commands.add_parser("import", help="Load a render cache archive, verifying every object").add_argument(
+        "archive", help="Archive written by cache export")
     
     args = parser.parse_args()
+    # Stopped by watch mode or a CI cancel: exit normally so atexit kills the renders still running
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    
+    if args.command == "gc":
+        collect_generated(args.max_size, dry_run=args.dry_run)
+        return
+    
+    if args.command == "cache":
+        if args.cache_command == "export":
+            export_render_cache(args.archive)
+        else:
+            import_render_cache(args.archive)
+        return
+    
+    if args.size_report:
+        report_sizes()
+        return
     
-    scenes_to_generate = filter_scenes_to_generate(args)
+    if args.serve_cache:
+        run_cache_server(args.serve_cache)
+        return
+    
+    if args.worker:
+        store = open_cache(args)
+        try:
+            serve_worker(args, store)
+        finally:
+            if store is not None:
+                store.close()
+        return
+    
+    if args.retry_failed:
+        scenes_to_generate = failed_scenes()
+        if not scenes_to_generate:
+            print("✅ No failed scenes to retry")
+            return
+    else:
+        scenes_to_generate = filter_scenes_to_generate(args)
     
     if scenes_to_generate is None:  # --list was used
         return
@@ -199,24 +981,46 @@ def main():
         print("❌ No scenes found matching the criteria")
         return
     
+    if args.estimate:
+        report_estimates(scenes_to_generate, args.quality)
+        return
+    
+    if args.watch:
+        setup_directories()
+        watch_scenes(scenes_to_generate, args)
+        return
+    
     print("🚀 Starting Manim asset generation...")
     
     setup_directories()
     
     total_scenes = sum(len(scenes) for files in scenes_to_generate.values() for scenes in files.values())
-    generated_scenes = 0
-    
-    for topic, files in scenes_to_generate.items():
-        print(f"\n📚 Processing {topic}...")
-        
-        for filename, scenes in files.items():
-            for scene_name in scenes:
-                if generate_scene(topic, filename, scene_name):
-                    generated_scenes += 1
+    store = open_cache(args)
+    try:
+        if args.serve or args.local_workers:
+            coordinator, workers = start_coordinator(args)
+            try:
+                jobs = generate_scenes(scenes_to_generate, args, coordinator, store)
+            finally:
+                coordinator.close()
+                for worker in workers:
+                    worker.wait()
+        else:
+            jobs = generate_scenes(scenes_to_generate, args, store=store)
+    finally:
+        if store is not None:
+            if store.remote_errors:
+                print(f"⚠️  {store.remote_errors} request(s) to the shared render cache failed; used the local cache only")
+            store.close()
+    generated_scenes = sum(1 for job in jobs if "failed_stage" not in job)
     
     print(f"\n🎯 Generated {generated_scenes}/{total_scenes} scenes")
     
-    copy_to_react()
+    report_sizes()
+    
+    if not args.no_gc:
+        # This run's outputs stay even when the app (and so the manifest) is not there
+        collect_generated(GC_MAX_BYTES, keep=[output for job in jobs for output in job.get("outputs", [])])
     
     print("\n✨ Asset generation complete!")
     print(f"📁 React assets: {REACT_PUBLIC_DIR}")
@@ -0,0 +1,52 @@
+"""
+Render pipeline used by generate_assets.py.
+
+Library code only: scene catalogue and command-line options live in
+generate_assets.py and are passed in as arguments.
+"""
+
+from .budgets import budget_bytes, enforce_budget, size_report, two_pass_encode, write_size_report
+from .cache import (
+    CacheStore, HttpCache, LocalCache, export_cache, file_hash, import_cache, pull_directory, push_directory,
+    ref_objects, serve_cache,
+)
+from .cost import estimate_scene, estimate_scenes
+from .dependencies import dependency_files, local_imports
+from .distributed import Coordinator, run_worker
+from .encoding import encode_profile, encoder_args, output_path, transcode
+from .eviction import collect_garbage
+from .ffmpeg import concat_videos, probe
+from .journal import STATES, Journal, inputs_fingerprint
+from .render import (
+    QUALITIES, RenderError, RenderTimeout, kill_process_group, kill_running, manim_command, quality_frame_rate,
+    render_scene, rendered_video, run_manim, run_process, run_scene_runner,
+)
+from .retry import call_with_retries, is_transient
+from .schedule import DurationHistory, longest_first, pixel_rate, predicted_makespan, static_estimate
+from .sections import find_sections, render_sections
+from .snapshots import section_key
+from .stages import Stage, run_stages
+from .shards import render_shards, scene_timeline, split_timeline
+from .watch import FileWatcher
+
+__all__ = [
+    "budget_bytes", "enforce_budget", "size_report", "two_pass_encode", "write_size_report",
+    "CacheStore", "HttpCache", "LocalCache", "export_cache", "file_hash", "import_cache", "pull_directory",
+    "push_directory", "ref_objects", "serve_cache",
+    "estimate_scene", "estimate_scenes",
+    "dependency_files", "local_imports",
+    "Coordinator", "run_worker",
+    "encode_profile", "encoder_args", "output_path", "transcode",
+    "collect_garbage",
+    "concat_videos", "probe",
+    "STATES", "Journal", "inputs_fingerprint",
+    "QUALITIES", "RenderError", "RenderTimeout", "kill_process_group", "kill_running", "manim_command",
+    "quality_frame_rate", "render_scene", "rendered_video", "run_manim", "run_process", "run_scene_runner",
+    "call_with_retries", "is_transient",
+    "DurationHistory", "longest_first", "pixel_rate", "predicted_makespan", "static_estimate",
+    "find_sections", "render_sections",
+    "section_key",
+    "Stage", "run_stages",
+    "render_shards", "scene_timeline", "split_timeline",
+    "FileWatcher",
+]
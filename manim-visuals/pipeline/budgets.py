@@ -0,0 +1,123 @@
+"""
+Per-scene size budgets and the size report for published assets.
+
+A budget is {"mb": N} (whole file) or {"kbps": N} (average bitrate, i.e.
+N/8 KB per second of video). Outputs over budget are re-encoded from the
+master with a two-pass encode at the bitrate the budget allows. When that
+bitrate would drop below MIN_BITS_PER_PIXEL the scene is reported as unable
+to meet its budget without visible quality loss, and the CRF encode is kept.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from .encoding import encoder_args
+from .ffmpeg import probe
+from .render import RenderError, run_process
+
+# Average bits per pixel per frame below which flat manim graphics start to show artefacts
+MIN_BITS_PER_PIXEL = 0.01
+# Share of the budget left for the container and rate-control overshoot
+CONTAINER_OVERHEAD = 0.03
+
+
+def budget_bytes(budget, duration):
+    """Size limit in bytes for a video of the given duration, or None without a budget"""
+    if not budget:
+        return None
+    if "mb" in budget:
+        return int(budget["mb"] * 1024 * 1024)
+    if "kbps" in budget:
+        return int(budget["kbps"] * 1000 / 8 * duration)
+    raise ValueError(f"Budget needs 'mb' or 'kbps': {budget}")
+
+
+def two_pass_encode(source, output, profile, frame_rate, bitrate, timeout=None):
+    """Encode source at an average bitrate (bit/s) with a two-pass encode"""
+    rate_profile = {key: value for key, value in profile.items() if key != "crf"}
+    rate_profile["bitrate"] = f"{bitrate // 1000}k"
+    args = encoder_args(rate_profile, frame_rate)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = str(Path(tmp) / "pass")
+        for number, target in ((1, ["-f", "null", os.devnull]), (2, [str(output)])):
+            command = ["ffmpeg", "-y", "-loglevel", "error", "-i", str(source), *args,
+                       "-pass", str(number), "-passlogfile", log_file, *target]
+            result = run_process(command, timeout=timeout)
+            if result.returncode != 0:
+                raise RenderError(result.stderr)
+    return Path(output)
+
+
+def enforce_budget(output, source, profile, budget, frame_rate, min_bits_per_pixel=MIN_BITS_PER_PIXEL,
+                   timeout=None):
+    """
+    Bring one output within its budget.
+
+    Returns a report entry: size before and after, limit, and status
+    "ok", "reencoded" or "over_budget".
+    """
+    info = probe(output, timeout=timeout)
+    limit = budget_bytes(budget, info["duration"])
+    entry = {"file": str(output), "size": info["size"], "limit": limit, "status": "ok"}
+    if limit is None or info["size"] <= limit:
+        return entry
+
+    bitrate = int(limit * (1 - CONTAINER_OVERHEAD) * 8 / info["duration"])
+    pixel_rate = info["width"] * info["height"] * (info["frame_rate"] or frame_rate)
+    if bitrate / pixel_rate < min_bits_per_pixel:
+        entry["status"] = "over_budget"
+        entry["needed_kbps"] = round(min_bits_per_pixel * pixel_rate / 1000)
+        return entry
+
+    reencoded = Path(output).with_name(f"budget-{Path(output).name}")
+    two_pass_encode(source, reencoded, profile, frame_rate, bitrate, timeout)
+    size = reencoded.stat().st_size
+    if size < info["size"]:
+        reencoded.replace(output)
+        entry["size"] = size
+    else:
+        reencoded.unlink()
+    entry["status"] = "reencoded" if entry["size"] <= limit else "over_budget"
+    return entry
+
+
+def size_report(output_dir, topics, budgets, extensions=(".mp4", ".webm"), timeout=None):
+    """
+    Sizes of every published asset under output_dir/<topic>, with budget status.
+
+    output_dir is the directory that ships (the React app's public visuals).
+    budgets maps scene name -> budget. Returns {"root": output_dir, "topics":
+    {topic: {"files": [...], "total": bytes}}, "total": bytes}.
+    """
+    report = {"root": str(output_dir), "topics": {}, "total": 0}
+    for topic in topics:
+        files = []
+        topic_dir = Path(output_dir) / topic
+        for path in sorted(topic_dir.glob("*")) if topic_dir.exists() else []:
+            if path.suffix not in extensions:
+                continue
+            scene_name = path.name.split(".")[0]
+            info = probe(path, timeout=timeout)
+            limit = budget_bytes(budgets.get(scene_name), info["duration"])
+            files.append({
+                "file": path.name,
+                "scene": scene_name,
+                "size": info["size"],
+                "duration": round(info["duration"], 2),
+                "kbps": round(info["bit_rate"] / 1000),
+                "limit": limit,
+                "within_budget": None if limit is None else info["size"] <= limit,
+            })
+        total = sum(entry["size"] for entry in files)
+        report["topics"][topic] = {"files": files, "total": total}
+        report["total"] += total
+    return report
+
+
+def write_size_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return Path(path)
@@ -0,0 +1,499 @@
+"""
+Content-addressed render cache with an optional shared HTTP backend.
+
+Objects are files stored under their SHA-256; refs map a name (a scene's
+inputs fingerprint, a Text/TeX cache file name) to JSON pointing at
+objects. LocalCache keeps both on disk, with an SQLite index recording the
+size and last access of every object (for garbage collection). HttpCache
+talks to a shared server; serve_cache() is a small one backed by a
+LocalCache, for CI or testing.
+
+CacheStore combines them: reads go to the local cache first and fall back
+to the remote, keeping a local copy; writes land locally and are uploaded
+in the background by a bounded pool. Writes are safe with several writers:
+an object's name is its hash, so concurrent writers of one object write
+identical bytes, each to a temporary file that is atomically renamed into
+place, and the server refuses bodies that do not match their hash.
+
+export_cache() and import_cache() move a LocalCache between machines as one
+gzip-compressed tar stream: an index.json member (refs and object access
+times) followed by objects/<hash> members, each verified on import.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+CHUNK_SIZE = 1024 * 1024
+UPLOAD_WORKERS = 4
+HTTP_TIMEOUT = 60
+# First member of an exported cache archive
+ARCHIVE_INDEX = "index.json"
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _valid_hash(value):
+    return len(value) == 64 and all(c in "0123456789abcdef" for c in value)
+
+
+def ref_objects(value):
+    """Hashes of the objects a ref value points at (any hash string nested in it)"""
+    if isinstance(value, str):
+        return {value} if _valid_hash(value) else set()
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return set().union(*map(ref_objects, value)) if value else set()
+    return set()
+
+
+class LocalCache:
+    """Objects under root/objects/<hh>/<hash>, refs and the access index in root/index.sqlite"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        with self._db() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS objects "
+                       "(hash TEXT PRIMARY KEY, size INTEGER, created REAL, accessed REAL)")
+            db.execute("CREATE TABLE IF NOT EXISTS refs (key TEXT PRIMARY KEY, value TEXT, updated REAL)")
+
+    def _db(self):
+        # One connection per call: the cache is used from worker and HTTP handler threads
+        db = sqlite3.connect(self.root / "index.sqlite", timeout=30)
+        return _Closing(db)
+
+    def object_path(self, digest):
+        return self.objects / digest[:2] / digest
+
+    def has(self, digest):
+        return self.object_path(digest).exists()
+
+    def touch(self, digest, accessed=None):
+        with self._db() as db:
+            db.execute("UPDATE objects SET accessed = ? WHERE hash = ?", (accessed or time.time(), digest))
+
+    def get(self, digest, destination):
+        """Copy an object to destination; False when it is not cached"""
+        path = self.object_path(digest)
+        if not path.exists():
+            return False
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = destination.with_name(f".{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(path, tmp_path)
+        tmp_path.replace(destination)
+        self.touch(digest)
+        return True
+
+    def put_file(self, source, digest=None):
+        """Store a copy of a file; returns its hash"""
+        digest = digest or file_hash(source)
+        if not self.has(digest):
+            with open(source, "rb") as f:
+                self.put_stream(f, digest)
+        else:
+            self.touch(digest)
+        return digest
+
+    def put_stream(self, stream, digest, length=None):
+        """Store bytes read from stream under digest; raises ValueError when they do not hash to it"""
+        path = self.object_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{digest[:8]}", delete=False) as tmp:
+            while length is None or size < length:
+                chunk = stream.read(CHUNK_SIZE if length is None else min(CHUNK_SIZE, length - size))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                tmp.write(chunk)
+                size += len(chunk)
+        if hasher.hexdigest() != digest or (length is not None and size != length):
+            os.unlink(tmp.name)
+            raise ValueError(f"Object body does not match {digest}")
+        os.replace(tmp.name, path)
+        now = time.time()
+        with self._db() as db:
+            db.execute("INSERT INTO objects VALUES (?, ?, ?, ?) ON CONFLICT(hash) DO UPDATE SET accessed = ?",
+                       (digest, size, now, now, now))
+        return digest
+
+    def get_ref(self, key):
+        with self._db() as db:
+            row = db.execute("SELECT value FROM refs WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_ref(self, key, value):
+        with self._db() as db:
+            db.execute("INSERT OR REPLACE INTO refs VALUES (?, ?, ?)", (key, json.dumps(value), time.time()))
+
+    def list_refs(self, prefix):
+        with self._db() as db:
+            rows = db.execute("SELECT key, value FROM refs WHERE substr(key, 1, ?) = ?",
+                              (len(prefix), prefix)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def accessed_times(self):
+        """Last access time of every indexed object"""
+        with self._db() as db:
+            return dict(db.execute("SELECT hash, accessed FROM objects").fetchall())
+
+    def remove(self, digests):
+        """Delete objects, their index rows and every ref pointing at one of them"""
+        digests = set(digests)
+        for digest in digests:
+            self.object_path(digest).unlink(missing_ok=True)
+        with self._db() as db:
+            db.executemany("DELETE FROM objects WHERE hash = ?", [(digest,) for digest in digests])
+            dangling = [(key,) for key, value in db.execute("SELECT key, value FROM refs")
+                        if ref_objects(json.loads(value)) & digests]
+            db.executemany("DELETE FROM refs WHERE key = ?", dangling)
+
+
+class _Closing:
+    """sqlite3 connection as a context manager that commits and closes"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self.db
+
+    def __exit__(self, kind, value, traceback):
+        if kind is None:
+            self.db.commit()
+        self.db.close()
+
+
+class HttpCache:
+    """Client for a cache server speaking the serve_cache protocol"""
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+
+    def _request(self, method, path, data=None, headers=None):
+        request = urllib.request.Request(self.url + path, data=data, method=method, headers=headers or {})
+        return urllib.request.urlopen(request, timeout=HTTP_TIMEOUT)
+
+    def has(self, digest):
+        try:
+            with self._request("HEAD", f"/objects/{digest}"):
+                return True
+        except urllib.error.HTTPError as error:
+            if error.code == 404:
+                return False
+            raise
+
+    def fetch(self, digest, local):
+        """Stream an object into the local cache; False when the server does not have it"""
+        try:
+            with self._request("GET", f"/objects/{digest}") as response:
+                local.put_stream(response, digest)
+                return True
+        except urllib.error.HTTPError as error:
+            if error.code == 404:
+                return False
+            raise
+
+    def upload(self, path, digest):
+        path = Path(path)
+        with open(path, "rb") as f:
+            with self._request("PUT", f"/objects/{digest}", data=f,
+                               headers={"Content-Length": str(path.stat().st_size)}):
+                pass
+
+    def get_ref(self, key):
+        try:
+            with self._request("GET", f"/refs/{quote(key, safe='')}") as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            if error.code == 404:
+                return None
+            raise
+
+    def put_ref(self, key, value):
+        data = json.dumps(value).encode()
+        with self._request("PUT", f"/refs/{quote(key, safe='')}", data=data,
+                           headers={"Content-Type": "application/json"}):
+            pass
+
+    def list_refs(self, prefix):
+        with self._request("GET", f"/refs?prefix={quote(prefix, safe='')}") as response:
+            return json.loads(response.read())
+
+
+class CacheStore:
+    """
+    Read-through, write-through cache: a LocalCache in front of an optional HttpCache.
+
+    Remote failures never fail a build; they are counted in `remote_errors`
+    and the local cache carries on alone.
+    """
+
+    def __init__(self, local, remote=None, upload_workers=UPLOAD_WORKERS):
+        self.local = local
+        self.remote = remote
+        self.uploads = ThreadPoolExecutor(max_workers=upload_workers) if remote is not None else None
+        self.pending = []
+        self.remote_errors = 0
+        self.lock = threading.Lock()
+
+    def _remote(self, call, *args, default=None):
+        try:
+            return call(*args)
+        except (urllib.error.URLError, OSError, ValueError):
+            with self.lock:
+                self.remote_errors += 1
+            return default
+
+    def get(self, digest, destination):
+        """Copy an object to destination, fetching it from the remote when needed"""
+        if not self.local.has(digest) and self.remote is not None:
+            self._remote(self.remote.fetch, digest, self.local, default=False)
+        return self.local.get(digest, destination)
+
+    def put_file(self, path):
+        """Store a file locally and upload it in the background; returns its hash"""
+        digest = self.local.put_file(path)
+        if self.remote is not None:
+            with self.lock:
+                self.pending.append(self.uploads.submit(self._upload, digest))
+        return digest
+
+    def _upload(self, digest):
+        if not self._remote(self.remote.has, digest, default=True):
+            self._remote(self.remote.upload, self.local.object_path(digest), digest)
+
+    def get_ref(self, key):
+        value = self.local.get_ref(key)
+        if value is None and self.remote is not None:
+            value = self._remote(self.remote.get_ref, key)
+            if value is not None:
+                self.local.put_ref(key, value)
+        return value
+
+    def put_ref(self, key, value):
+        """Record a ref locally and remotely; uploads of the objects it points at are flushed first"""
+        self.local.put_ref(key, value)
+        if self.remote is not None:
+            self.flush()
+            self._remote(self.remote.put_ref, key, value)
+
+    def list_refs(self, prefix):
+        refs = self.local.list_refs(prefix)
+        if self.remote is not None:
+            refs = {**(self._remote(self.remote.list_refs, prefix, default={}) or {}), **refs}
+        return refs
+
+    def flush(self):
+        """Wait for every background upload started so far"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        for future in pending:
+            future.result()
+
+    def close(self):
+        if self.uploads is not None:
+            self.flush()
+            self.uploads.shutdown()
+
+
+def pull_directory(store, prefix, directory):
+    """
+    Fill a hash-named cache directory (manim's texts/ or Tex/) with every file
+    the cache knows under prefix that is not there yet. Returns the count.
+    """
+    directory = Path(directory)
+    pulled = 0
+    for key, digest in store.list_refs(prefix).items():
+        target = directory / key[len(prefix):]
+        if not target.exists() and store.get(digest, target):
+            pulled += 1
+    return pulled
+
+
+def push_directory(store, prefix, directory):
+    """Store every file of a cache directory not yet in the cache under prefix; returns the count"""
+    directory = Path(directory)
+    if not directory.exists():
+        return 0
+    known = store.local.list_refs(prefix)
+    added = {}
+    for path in sorted(directory.rglob("*")):
+        key = prefix + path.relative_to(directory).as_posix()
+        if path.is_file() and not path.name.startswith(".") and key not in known:
+            added[key] = store.put_file(path)
+    # Let the uploads run in parallel before any ref points at them
+    store.flush()
+    for key, digest in added.items():
+        store.put_ref(key, digest)
+    return len(added)
+
+
+def export_cache(cache, path):
+    """
+    Write every ref of a LocalCache whose objects it holds, and those
+    objects, to a gzip-compressed tar archive at path. Objects are streamed
+    from disk one at a time. Returns the number of refs and objects written.
+    """
+    accessed = cache.accessed_times()
+    refs = {key: value for key, value in cache.list_refs("").items()
+            if all(cache.has(digest) for digest in ref_objects(value))}
+    digests = sorted(set().union(*map(ref_objects, refs.values()))) if refs else []
+    index = {"refs": refs, "accessed": {digest: accessed.get(digest) for digest in digests}}
+
+    # Stream mode wants a str name (it checks the .gz suffix itself)
+    with tarfile.open(os.fspath(path), "w|gz") as archive:
+        data = json.dumps(index).encode()
+        info = tarfile.TarInfo(ARCHIVE_INDEX)
+        info.size, info.mtime = len(data), time.time()
+        archive.addfile(info, io.BytesIO(data))
+        for digest in digests:
+            object_path = cache.object_path(digest)
+            info = archive.gettarinfo(object_path, arcname=f"objects/{digest}")
+            with open(object_path, "rb") as f:
+                archive.addfile(info, f)
+    return len(refs), len(digests)
+
+
+def import_cache(cache, path):
+    """
+    Load an archive written by export_cache into a LocalCache.
+
+    Each object is streamed into the cache and checked against its hash;
+    ones that do not match are left out, and so are the refs pointing at
+    them. Existing objects are kept. Returns a report of the objects
+    imported, already present and corrupt, and the refs added or skipped.
+    """
+    index = None
+    imported, present, corrupt = 0, 0, []
+    with tarfile.open(os.fspath(path), "r|gz") as archive:
+        for member in archive:
+            if member.name == ARCHIVE_INDEX and member.isfile():
+                index = json.load(archive.extractfile(member))
+                continue
+            folder, _, digest = member.name.partition("/")
+            if folder != "objects" or not member.isfile() or not _valid_hash(digest):
+                continue
+            if cache.has(digest):
+                present += 1
+                continue
+            try:
+                cache.put_stream(archive.extractfile(member), digest, member.size)
+            except ValueError:
+                corrupt.append(digest)
+                continue
+            imported += 1
+            if index is not None and index["accessed"].get(digest):
+                cache.touch(digest, index["accessed"][digest])
+    if index is None:
+        raise ValueError(f"{path} is not a render cache archive (no {ARCHIVE_INDEX})")
+
+    added = skipped = 0
+    for key, value in index["refs"].items():
+        if all(cache.has(digest) for digest in ref_objects(value)):
+            cache.put_ref(key, value)
+            added += 1
+        else:
+            skipped += 1
+    return {"objects": imported, "present": present, "corrupt": corrupt, "refs": added, "skipped_refs": skipped}
+
+
+def serve_cache(root, host="127.0.0.1", port=0):
+    """
+    HTTP cache server backed by LocalCache(root); returns the (not yet started) server.
+
+        GET/HEAD/PUT /objects/<sha256>   PUT bodies are verified against the hash
+        GET/PUT      /refs/<key>         JSON values
+        GET          /refs?prefix=<p>    {key: value} of every ref starting with p
+    """
+    cache = LocalCache(root)
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status, data=b"", content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+
+        def _object(self):
+            parts = self.path.strip("/").split("/")
+            if len(parts) == 2 and parts[0] == "objects" and _valid_hash(parts[1]):
+                return parts[1]
+            return None
+
+        def do_HEAD(self):
+            digest = self._object()
+            self._reply(200 if digest and cache.has(digest) else 404)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/refs":
+                prefix = parse_qs(url.query).get("prefix", [""])[0]
+                return self._reply(200, json.dumps(cache.list_refs(prefix)).encode())
+            if url.path.startswith("/refs/"):
+                value = cache.get_ref(unquote(url.path[len("/refs/"):]))
+                return self._reply(404) if value is None else self._reply(200, json.dumps(value).encode())
+
+            digest = self._object()
+            if digest is None or not cache.has(digest):
+                return self._reply(404)
+            path = cache.object_path(digest)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(path.stat().st_size))
+            self.end_headers()
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+            cache.touch(digest)
+
+        def do_PUT(self):
+            length = int(self.headers.get("Content-Length", 0))
+            if self.path.startswith("/refs/"):
+                cache.put_ref(unquote(self.path[len("/refs/"):]), json.loads(self.rfile.read(length)))
+                return self._reply(200)
+            digest = self._object()
+            if digest is None:
+                return self._reply(404)
+            if cache.has(digest):
+                while length > 0:
+                    length -= len(self.rfile.read(min(CHUNK_SIZE, length))) or length
+                return self._reply(200)
+            try:
+                cache.put_stream(self.rfile, digest, length)
+            except ValueError:
+                return self._reply(400)
+            self._reply(201)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,302 @@
+"""
+Static render-cost estimate for a scene, read from its source without rendering.
+
+The scene class's setup() and construct() (or its sections, for a
+SectionedScene) are walked with ast, following calls to its own helper
+methods, including ones inherited from base classes in the same file or
+imported from project modules (common/, sibling files), and counting per
+call site:
+
+    play / wait        number of calls and the run_time/duration they pass
+    Text, MathTex, ... text and LaTeX constructions (LaTeX runs latex + dvisvgm)
+    Table, FastTable   tables, which build a text or TeX mobject per cell
+    Heatmap, PointCloud
+                       array-backed mobjects, one raster or point set each
+    always_redraw      mobjects rebuilt on every frame once they exist
+    Capitalized calls  other mobject (and animation) constructions
+
+A SectionedScene runs its sections in order with clear_section() (a
+FadeOut and a one-second wait) between them; a `sections` value that is
+not a literal list falls back to walking construct().
+
+Everything inside a loop or comprehension is multiplied by its iteration
+count: the length of a literal range()/list when there is one, otherwise
+DEFAULT_LOOP_COUNT. Lambdas and nested functions (updaters) are not walked.
+"""
+
+import ast
+from pathlib import Path
+
+from .dependencies import _module_file
+from .render import PROJECT_ROOT, QUALITIES, quality_frame_rate
+
+# Iterations assumed for loops whose length is not a literal
+DEFAULT_LOOP_COUNT = 5
+# manim's default run_time for play() and duration for wait()
+DEFAULT_RUN_TIME = 1.0
+
+TEXT_CLASSES = {"Text", "MarkupText", "Paragraph", "Code"}
+TEX_CLASSES = {"MathTex", "Tex", "SingleStringMathTex", "Title", "BulletedList"}
+TABLE_CLASSES = {"Table", "MathTable", "MobjectTable", "IntegerTable", "DecimalTable", "FastTable"}
+ARRAY_CLASSES = {"Heatmap", "PointCloud"}
+
+# Render seconds per unit, measured on low quality with the Cairo renderer
+SECONDS_PER_FRAME = 0.05  # at 480p; scales with pixels per frame
+SECONDS_PER_TEXT = 0.05
+SECONDS_PER_TEX = 0.6
+SECONDS_PER_TABLE = 1.0
+SECONDS_PER_ARRAY = 0.05
+SECONDS_PER_MOBJECT = 0.002
+SECONDS_PER_REDRAW_FRAME = 0.01
+
+
+def _call_name(call):
+    func = call.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _is_self_call(call):
+    func = call.func
+    return isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self"
+
+
+def _literal_number(node, default):
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return default
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else default
+
+
+def _loop_count(iterable):
+    """Iterations of `for ... in iterable` when it can be read off the source"""
+    if isinstance(iterable, (ast.List, ast.Tuple, ast.Set)):
+        return len(iterable.elts)
+    if isinstance(iterable, ast.Call):
+        name = _call_name(iterable)
+        if name == "range" and iterable.args:
+            bounds = [_literal_number(arg, None) for arg in iterable.args]
+            if all(isinstance(bound, int) for bound in bounds):
+                return len(range(*bounds))
+        if name in ("enumerate", "reversed", "sorted", "zip") and iterable.args:
+            return _loop_count(iterable.args[0])
+    return DEFAULT_LOOP_COUNT
+
+
+def _keyword(call, name):
+    for keyword in call.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    return None
+
+
+def _module_classes(path, root, seen=None):
+    """
+    Class definitions visible at the top level of the module at path: its own
+    and the ones it imports by name from project modules, followed through
+    package re-exports. Maps the bound name to the ClassDef.
+    """
+    path = Path(path).resolve()
+    seen = set() if seen is None else seen
+    if path in seen:
+        return {}
+    seen.add(path)
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    classes = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = node
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            if node.level:
+                package = path.parent
+                for _ in range(node.level - 1):
+                    package = package.parent
+                bases = [package]
+            else:
+                bases = [path.parent, Path(root).resolve()]
+            module_file = next(filter(None, (_module_file(base, node.module.split(".")) for base in bases)), None)
+            if module_file is None:
+                continue
+            imported = _module_classes(module_file, root, seen)
+            for alias in node.names:
+                if alias.name in imported:
+                    classes.setdefault(alias.asname or alias.name, imported[alias.name])
+    return classes
+
+
+def _scene_methods(classes, scene_name):
+    """
+    Methods visible on the scene class, own methods overriding those of its
+    base classes, and its `sections` list (None when not declared or not a
+    literal).
+    """
+    methods = {}
+    sections = None
+
+    def collect(name, seen):
+        nonlocal sections
+        node = classes.get(name)
+        if node is None or id(node) in seen:
+            return
+        seen.add(id(node))
+        for base in reversed(node.bases):
+            if isinstance(base, ast.Name):
+                collect(base.id, seen)
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef):
+                methods[item.name] = item
+            elif (isinstance(item, ast.Assign)
+                  and any(isinstance(target, ast.Name) and target.id == "sections" for target in item.targets)):
+                try:
+                    sections = list(ast.literal_eval(item.value))
+                except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                    sections = None
+
+    collect(scene_name, set())
+    return methods, sections
+
+
+class _CostCounter:
+    def __init__(self, methods):
+        self.methods = methods
+        self.stack = []
+        self.counts = {
+            "plays": 0, "run_time": 0.0, "waits": 0, "wait_time": 0.0,
+            "texts": 0, "tex": 0, "tables": 0, "arrays": 0, "redraws": 0, "mobjects": 0,
+        }
+
+    def method(self, name, multiplier):
+        if name in self.stack or name not in self.methods:
+            return
+        self.stack.append(name)
+        for statement in self.methods[name].body:
+            self.visit(statement, multiplier)
+        self.stack.pop()
+
+    def visit(self, node, multiplier):
+        if isinstance(node, (ast.Lambda, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            self.visit(node.iter, multiplier)
+            for statement in node.body:
+                self.visit(statement, multiplier * _loop_count(node.iter))
+            for statement in node.orelse:
+                self.visit(statement, multiplier)
+            return
+        if isinstance(node, ast.While):
+            self.visit(node.test, multiplier)
+            for statement in node.body + node.orelse:
+                self.visit(statement, multiplier * DEFAULT_LOOP_COUNT)
+            return
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            inner = multiplier
+            for generator in node.generators:
+                self.visit(generator.iter, inner)
+                inner *= _loop_count(generator.iter)
+            elements = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            for element in elements:
+                self.visit(element, inner)
+            return
+        if isinstance(node, ast.Call):
+            self.call(node, multiplier)
+        for child in ast.iter_child_nodes(node):
+            self.visit(child, multiplier)
+
+    def call(self, call, multiplier):
+        counts = self.counts
+        name = _call_name(call)
+        if name is None:
+            return
+        func = call.func
+        if (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                and func.value.id in TABLE_CLASSES | ARRAY_CLASSES):
+            # Alternative constructors such as PointCloud.from_axes
+            name = func.value.id
+        if _is_self_call(call):
+            if name == "play":
+                run_time = _keyword(call, "run_time")
+                counts["plays"] += multiplier
+                counts["run_time"] += multiplier * (
+                    DEFAULT_RUN_TIME if run_time is None else _literal_number(run_time, DEFAULT_RUN_TIME))
+            elif name == "wait":
+                duration = call.args[0] if call.args else _keyword(call, "duration")
+                counts["waits"] += multiplier
+                counts["wait_time"] += multiplier * (
+                    DEFAULT_RUN_TIME if duration is None else _literal_number(duration, DEFAULT_RUN_TIME))
+            else:
+                self.method(name, multiplier)
+        elif name in TEXT_CLASSES:
+            counts["texts"] += multiplier
+        elif name in TEX_CLASSES:
+            counts["tex"] += multiplier
+        elif name in TABLE_CLASSES:
+            counts["tables"] += multiplier
+        elif name in ARRAY_CLASSES:
+            counts["arrays"] += multiplier
+        elif name == "always_redraw":
+            counts["redraws"] += multiplier
+        elif name[0].isupper():
+            counts["mobjects"] += multiplier
+
+
+def estimate_scene(scene_path, scene_name, quality="low", root=PROJECT_ROOT):
+    """
+    Estimated duration, frame count and render seconds of one scene.
+
+    Returns the call counts plus "duration" (seconds of video), "frames" and
+    "render_seconds"; a scene class that is not found estimates to zero.
+    Base classes are looked up in the scene file and the project modules it
+    imports (its directory, then root).
+    """
+    methods, sections = _scene_methods(_module_classes(scene_path, root), scene_name)
+    counter = _CostCounter(methods)
+    counter.method("setup", 1)
+    if sections is not None and "run_section" in methods:
+        # SectionedScene.construct runs the sections in order, clearing the screen between them
+        for index, section in enumerate(sections):
+            counter.method(section, 1)
+            if index < len(sections) - 1:
+                counter.method("clear_section", 1)
+    elif "construct" in methods or sections is None:
+        counter.method("construct", 1)
+    else:
+        for section in sections:
+            counter.method(section, 1)
+    estimate = dict(counter.counts)
+    estimate["run_time"] = round(estimate["run_time"], 2)
+    estimate["wait_time"] = round(estimate["wait_time"], 2)
+
+    duration = estimate["run_time"] + estimate["wait_time"]
+    frames = round(duration * quality_frame_rate(quality))
+    height = int(QUALITIES[quality][1].split("p")[0])
+    pixel_scale = (height / 480) ** 2
+    estimate["duration"] = round(duration, 2)
+    estimate["frames"] = frames
+    estimate["render_seconds"] = round(
+        frames * SECONDS_PER_FRAME * pixel_scale
+        + estimate["texts"] * SECONDS_PER_TEXT
+        + estimate["tex"] * SECONDS_PER_TEX
+        + estimate["tables"] * SECONDS_PER_TABLE
+        + estimate["arrays"] * SECONDS_PER_ARRAY
+        + estimate["mobjects"] * SECONDS_PER_MOBJECT
+        # Redrawn mobjects are rebuilt every frame; assume they live for half the scene
+        + estimate["redraws"] * frames / 2 * SECONDS_PER_REDRAW_FRAME,
+        2,
+    )
+    return estimate
+
+
+def estimate_scenes(scenes, quality="low"):
+    """
+    estimate_scene for each (scene_path, scene_name), with "relative_cost":
+    render seconds as a fraction of the most expensive scene.
+    """
+    estimates = {scene_name: estimate_scene(scene_path, scene_name, quality) for scene_path, scene_name in scenes}
+    highest = max((estimate["render_seconds"] for estimate in estimates.values()), default=0) or 1
+    for estimate in estimates.values():
+        estimate["relative_cost"] = round(estimate["render_seconds"] / highest, 3)
+    return estimates
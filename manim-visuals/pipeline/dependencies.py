@@ -0,0 +1,83 @@
+"""
+Local import graph of scene files.
+
+Scenes import sibling engine modules by bare name (the scene's directory is
+on sys.path when manim runs it), the shared common/ package and, for the
+text encoder steps, modules under scenes/ from the project root. The graph
+is read with ast, without importing anything; imports that resolve to no
+file in those places (manim, numpy, the standard library) are ignored.
+"""
+
+import ast
+from pathlib import Path
+
+from .render import PROJECT_ROOT
+
+
+def _module_file(directory, parts):
+    """File of the module or package `parts` under directory, or None"""
+    base = Path(directory).joinpath(*parts)
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _package_inits(directory, parts):
+    """__init__.py files of the packages on the way to `parts` (imported before the module itself)"""
+    inits = []
+    for depth in range(1, len(parts)):
+        init = Path(directory).joinpath(*parts[:depth]) / "__init__.py"
+        if init.is_file():
+            inits.append(init)
+    return inits
+
+
+def local_imports(path, root=PROJECT_ROOT):
+    """Files of the project that the module at path imports directly"""
+    path = Path(path).resolve()
+    search = [path.parent, Path(root).resolve()]
+    found = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Import):
+            names = [alias.name.split(".") for alias in node.names]
+            bases = search
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module.split(".") if node.module else []
+            if node.level:
+                # Relative import: from the package containing path
+                package = path.parent
+                for _ in range(node.level - 1):
+                    package = package.parent
+                bases = [package]
+            else:
+                bases = search
+            # `from package import module` imports submodules as well as names
+            names = [module] + [module + [alias.name] for alias in node.names if alias.name != "*"]
+        else:
+            continue
+
+        for parts in names:
+            if not parts:
+                continue
+            for base in bases:
+                module_file = _module_file(base, parts)
+                if module_file is not None:
+                    found.add(module_file)
+                    found.update(_package_inits(base, parts))
+                    break
+    found.discard(path)
+    return found
+
+
+def dependency_files(path, root=PROJECT_ROOT):
+    """The module at path plus every project file it imports, directly or indirectly"""
+    path = Path(path).resolve()
+    seen = {path}
+    pending = [path]
+    while pending:
+        for imported in local_imports(pending.pop(), root):
+            if imported not in seen:
+                seen.add(imported)
+                pending.append(imported)
+    return seen
@@ -0,0 +1,392 @@
+"""
+Distributed rendering: a coordinator hands scene jobs to worker processes over HTTP.
+
+The coordinator runs inside the build (generate_assets.py --serve) and keeps
+the job queue in memory. Workers (generate_assets.py --worker URL), on the
+same machine or others with a checkout of the repository, claim a job,
+render it, upload the resulting files and report the result. Encoding,
+probing and publishing stay on the coordinator.
+
+While a worker holds a job it sends a heartbeat every HEARTBEAT_INTERVAL
+seconds. A job whose worker has been silent for HEARTBEAT_TIMEOUT seconds
+is put back in the queue for another worker, up to MAX_ATTEMPTS claims; a
+late result from the worker that lost the job is refused. The build does not
+wait forever on a dead fleet: a queued job fails once no worker has been in
+touch for WORKER_TIMEOUT seconds, and a claimed one times out once its
+worker has held it past the render timeout.
+
+Protocol (JSON bodies, worker id in every request):
+
+    POST /claim                         -> {"job": {...}} | {"job": null} | {"shutdown": true}
+    POST /heartbeat  {"id"}             -> 200, or 409 when the job is no longer this worker's
+    PUT  /artifacts/<id>/<name>         raw file body
+    POST /complete   {"id", "result"}
+    POST /fail       {"id", "error", "transient"}
+"""
+
+import json
+import re
+import shutil
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from .render import RenderError, RenderTimeout
+
+HEARTBEAT_INTERVAL = 5
+HEARTBEAT_TIMEOUT = 30
+MAX_ATTEMPTS = 3
+# Seconds a queued job waits with no worker in touch before it fails
+WORKER_TIMEOUT = 120
+# Seconds an idle worker waits between claims
+POLL_INTERVAL = 1
+# Failed requests in a row after which a worker decides the coordinator is gone
+WORKER_CONNECT_RETRIES = 10
+CHUNK_SIZE = 1024 * 1024
+
+
+class Coordinator:
+    """
+    Job queue served over HTTP.
+
+    submit() queues a job; wait() blocks until a worker completes it and
+    returns its result, with "artifacts" mapping each uploaded file name to
+    its local path under artifact_dir.
+    """
+
+    def __init__(self, artifact_dir, host="127.0.0.1", port=0, heartbeat_timeout=HEARTBEAT_TIMEOUT,
+                 max_attempts=MAX_ATTEMPTS, worker_timeout=WORKER_TIMEOUT):
+        self.artifact_dir = Path(artifact_dir)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.worker_timeout = worker_timeout
+        # Last request from any worker; workers that are up but busy keep it fresh with heartbeats
+        self.last_seen = time.monotonic()
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.pending = []
+        self.closing = False
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.threads = [
+            threading.Thread(target=self.server.serve_forever, daemon=True),
+            threading.Thread(target=self._reap, daemon=True),
+        ]
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        if host in ("0.0.0.0", ""):
+            host = socket.gethostname()
+        return f"http://{host}:{port}"
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def close(self):
+        """Tell polling workers to exit, then stop serving"""
+        with self.lock:
+            self.closing = True
+        # Idle workers poll every POLL_INTERVAL; give them a chance to see the shutdown
+        time.sleep(POLL_INTERVAL * 2)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def submit(self, job_id, spec):
+        with self.lock:
+            self.jobs[job_id] = {
+                "spec": dict(spec, id=job_id), "state": "pending", "worker": None, "heartbeat": None,
+                "attempts": 0, "result": None, "error": None, "timed_out": False, "done": threading.Event(),
+                "submitted": time.monotonic(), "claimed": None,
+            }
+            self.pending.append(job_id)
+
+    def wait(self, job_id, timeout=None):
+        """
+        Result of a job once a worker completed it; RenderError if it failed.
+
+        Also raises RenderError when the job is still queued and no worker has
+        been in touch for worker_timeout seconds, and RenderTimeout when a
+        worker has held it for timeout seconds plus heartbeat_timeout (its own
+        render timeout should have fired by then).
+        """
+        job = self.jobs[job_id]
+        while not job["done"].wait(POLL_INTERVAL):
+            now = time.monotonic()
+            with self.lock:
+                if job["state"] == "pending" and now - max(self.last_seen, job["submitted"]) > self.worker_timeout:
+                    self._give_up(job_id, job, f"no worker has been in touch for {self.worker_timeout:g}s")
+                elif (job["state"] == "claimed" and timeout is not None
+                      and now - job["claimed"] > timeout + self.heartbeat_timeout):
+                    self._give_up(job_id, job, f"worker {job['worker']} held the job past its {timeout:g}s timeout",
+                                  timed_out=True)
+        if job["state"] == "failed":
+            raise (RenderTimeout if job["timed_out"] else RenderError)(job["error"])
+        return job["result"]
+
+    def status(self):
+        with self.lock:
+            return {job_id: {"state": job["state"], "worker": job["worker"], "attempts": job["attempts"]}
+                    for job_id, job in self.jobs.items()}
+
+    # Queue operations, called from request handler threads
+
+    def claim(self, worker):
+        with self.lock:
+            if self.closing:
+                return {"shutdown": True}
+            if not self.pending:
+                return {"job": None}
+            job = self.jobs[self.pending.pop(0)]
+            job.update(state="claimed", worker=worker, heartbeat=time.monotonic(), claimed=time.monotonic())
+            job["attempts"] += 1
+            return {"job": job["spec"]}
+
+    def _artifacts(self, job_id, worker):
+        """Upload directory of one claim: a requeued job's late upload cannot clobber the new claimant's files"""
+        safe = [re.sub(r"[^\w@.-]", "_", part).lstrip(".") or "_" for part in (job_id, worker)]
+        return self.artifact_dir.joinpath(*safe)
+
+    def _owned(self, job_id, worker):
+        job = self.jobs.get(job_id)
+        return job if job is not None and job["state"] == "claimed" and job["worker"] == worker else None
+
+    def heartbeat(self, job_id, worker):
+        with self.lock:
+            job = self._owned(job_id, worker)
+            if job is None:
+                return False
+            job["heartbeat"] = time.monotonic()
+            return True
+
+    def artifact_path(self, job_id, worker, name):
+        with self.lock:
+            if self._owned(job_id, worker) is None:
+                return None
+        return self._artifacts(job_id, worker) / Path(name).name
+
+    def complete(self, job_id, worker, result):
+        with self.lock:
+            job = self._owned(job_id, worker)
+            if job is None:
+                return False
+            directory = self._artifacts(job_id, worker)
+            artifacts = {path.name: str(path) for path in directory.iterdir()} if directory.exists() else {}
+            job.update(state="done", result=dict(result, artifacts=artifacts, worker=worker))
+            job["done"].set()
+            return True
+
+    def fail(self, job_id, worker, error, transient=False):
+        with self.lock:
+            job = self._owned(job_id, worker)
+            if job is None:
+                return False
+            self._release(job_id, job, f"{worker}: {error}", retry=transient)
+            return True
+
+    def _release(self, job_id, job, error, retry):
+        """Requeue a job, or fail it for good once it has used up its attempts"""
+        shutil.rmtree(self._artifacts(job_id, job["worker"]), ignore_errors=True)
+        if retry and job["attempts"] < self.max_attempts:
+            job.update(state="pending", worker=None, heartbeat=None)
+            self.pending.insert(0, job_id)
+        else:
+            job.update(state="failed", error=error)
+            job["done"].set()
+
+    def _give_up(self, job_id, job, error, timed_out=False):
+        """Fail a job for good; a worker still holding it has its result refused"""
+        if job["worker"] is not None:
+            shutil.rmtree(self._artifacts(job_id, job["worker"]), ignore_errors=True)
+        if job_id in self.pending:
+            self.pending.remove(job_id)
+        job.update(state="failed", error=error, timed_out=timed_out)
+        job["done"].set()
+
+    def _reap(self):
+        """Requeue jobs whose worker stopped sending heartbeats"""
+        while True:
+            time.sleep(min(HEARTBEAT_INTERVAL, self.heartbeat_timeout / 3))
+            now = time.monotonic()
+            with self.lock:
+                for job_id, job in self.jobs.items():
+                    if job["state"] == "claimed" and now - job["heartbeat"] > self.heartbeat_timeout:
+                        self._release(job_id, job, f"worker {job['worker']} stopped responding", retry=True)
+
+    def _handler(self):
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, body=None):
+                data = json.dumps(body if body is not None else {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_POST(self):
+                body = self._body()
+                worker = body.get("worker", "?")
+                coordinator.last_seen = time.monotonic()
+                if self.path == "/claim":
+                    return self._reply(200, coordinator.claim(worker))
+                if self.path == "/heartbeat":
+                    ok = coordinator.heartbeat(body["id"], worker)
+                elif self.path == "/complete":
+                    ok = coordinator.complete(body["id"], worker, body.get("result", {}))
+                elif self.path == "/fail":
+                    ok = coordinator.fail(body["id"], worker, body.get("error", ""), body.get("transient", False))
+                else:
+                    return self._reply(404)
+                self._reply(200 if ok else 409)
+
+            def do_PUT(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if len(parts) != 3 or parts[0] != "artifacts":
+                    return self._reply(404)
+                worker = unquote(self.headers.get("X-Worker", "?"))
+                path = coordinator.artifact_path(unquote(parts[1]), worker, unquote(parts[2]))
+                if path is None:
+                    return self._reply(409)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                remaining = int(self.headers.get("Content-Length", 0))
+                tmp_path = path.with_name(f".{path.name}.part")
+                with open(tmp_path, "wb") as f:
+                    while remaining > 0:
+                        chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        remaining -= len(chunk)
+                if remaining:
+                    tmp_path.unlink()
+                    return self._reply(400)
+                tmp_path.replace(path)
+                self._reply(200)
+
+            def do_GET(self):
+                if self.path == "/status":
+                    return self._reply(200, coordinator.status())
+                self._reply(404)
+
+        return Handler
+
+
+def _request(url, path, body=None, data=None, method="POST", headers=None):
+    if data is None:
+        data = json.dumps(body or {}).encode()
+        headers = dict(headers or {}, **{"Content-Type": "application/json"})
+    request = urllib.request.Request(url.rstrip("/") + path, data=data, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except urllib.error.HTTPError as error:
+        return error.code, {}
+
+
+def upload(url, job_id, worker, path):
+    """Stream a file to the coordinator as an artifact of job_id"""
+    path = Path(path)
+    with open(path, "rb") as f:
+        status, _ = _request(url, f"/artifacts/{quote(job_id)}/{quote(path.name)}", data=f, method="PUT",
+                             headers={"Content-Length": str(path.stat().st_size), "X-Worker": quote(worker)})
+    return status == 200
+
+
+def run_worker(url, handler, worker=None, is_transient=None):
+    """
+    Claim and run jobs from the coordinator at url until it shuts down.
+
+    handler(spec) returns (result, paths): a JSON-serializable result and
+    the files to upload, which are deleted once uploaded. Exceptions are reported as failures; those for
+    which is_transient(error) is true are requeued for another attempt.
+    Returns the number of jobs this worker completed.
+    """
+    worker = worker or f"{socket.gethostname()}-{threading.get_native_id()}"
+    completed = 0
+    failures = 0
+    while True:
+        try:
+            status, reply = _request(url, "/claim", {"worker": worker})
+        except (urllib.error.URLError, OSError):
+            failures += 1
+            if failures >= WORKER_CONNECT_RETRIES:
+                return completed
+            time.sleep(POLL_INTERVAL)
+            continue
+        failures = 0
+        if reply.get("shutdown"):
+            return completed
+        spec = reply.get("job")
+        if spec is None:
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        job_id = spec["id"]
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def beat():
+            while not stop.wait(HEARTBEAT_INTERVAL):
+                try:
+                    status, _ = _request(url, "/heartbeat", {"worker": worker, "id": job_id})
+                except (urllib.error.URLError, OSError):
+                    continue
+                if status == 409:
+                    lost.set()
+                    return
+
+        heartbeat = threading.Thread(target=beat, daemon=True)
+        heartbeat.start()
+        try:
+            result, paths = handler(spec)
+        except Exception as error:
+            _fail(url, worker, job_id, str(error), bool(is_transient and is_transient(error)))
+        else:
+            try:
+                # Requeue a result that cannot be delivered rather than leave the coordinator waiting on it
+                if lost.is_set():
+                    _fail(url, worker, job_id, "job was reassigned while it rendered", transient=True)
+                elif all(_uploaded(url, job_id, worker, path) for path in paths):
+                    _request(url, "/complete", {"worker": worker, "id": job_id, "result": result})
+                    completed += 1
+                else:
+                    _fail(url, worker, job_id, "uploading the result failed", transient=True)
+            except (urllib.error.URLError, OSError):
+                pass  # coordinator unreachable; it requeues the job when the heartbeats stop
+            finally:
+                for path in paths:
+                    Path(path).unlink(missing_ok=True)
+        finally:
+            stop.set()
+            heartbeat.join()
+
+
+def _uploaded(url, job_id, worker, path):
+    try:
+        return upload(url, job_id, worker, path)
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+def _fail(url, worker, job_id, error, transient):
+    """Report a failed job; when the coordinator is unreachable it requeues the job once the heartbeats stop"""
+    try:
+        _request(url, "/fail", {"worker": worker, "id": job_id, "error": error, "transient": transient})
+    except (urllib.error.URLError, OSError):
+        pass
@@ -0,0 +1,92 @@
+"""
+Encoder profiles: ffmpeg arguments for delivery encodes and their alternates.
+
+A profile is a dict from the catalogue in generate_assets.py:
+
+    codec              ffmpeg video encoder (libx264, libvpx-vp9, libsvtav1, ...)
+    crf / bitrate      quality target; bitrate "0" with crf means constant quality
+    preset             encoder speed preset
+    keyframe_interval  seconds between keyframes (seeking granularity)
+    faststart          move the MP4 index to the front so playback starts early
+    container          "mp4" (default) or "webm"
+    suffix             inserted before the extension, e.g. ".av1" -> Scene.av1.mp4
+    alternates         names of further profiles encoded alongside this one
+    extra_args         codec-specific ffmpeg arguments
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .render import RenderError, run_process
+
+
+def encoder_args(profile, frame_rate):
+    """ffmpeg output arguments for a profile (everything between the inputs and the output path)"""
+    args = ["-c:v", profile["codec"]]
+    if "crf" in profile:
+        args += ["-crf", str(profile["crf"])]
+    if "bitrate" in profile:
+        args += ["-b:v", str(profile["bitrate"])]
+    if "preset" in profile:
+        args += ["-preset", str(profile["preset"])]
+    if "keyframe_interval" in profile:
+        args += ["-g", str(max(1, round(profile["keyframe_interval"] * frame_rate)))]
+    args += ["-pix_fmt", profile.get("pix_fmt", "yuv420p")]
+    args += list(profile.get("extra_args", []))
+    if profile.get("faststart") and profile.get("container", "mp4") == "mp4":
+        args += ["-movflags", "+faststart"]
+    return args + ["-an"]
+
+
+def output_path(stem, profile):
+    """<stem><suffix>.<container> for a profile, e.g. generated/topic/Scene.av1.mp4"""
+    stem = Path(stem)
+    return stem.with_name(f"{stem.name}{profile.get('suffix', '')}.{profile.get('container', 'mp4')}")
+
+
+def transcode(source, output, profile, frame_rate, extra_input_args=(), timeout=None):
+    """Encode source into output with a profile; returns output"""
+    command = ["ffmpeg", "-y", "-loglevel", "error", *extra_input_args, "-i", str(source),
+               *encoder_args(profile, frame_rate), str(output)]
+    result = run_process(command, timeout=timeout)
+    if result.returncode != 0:
+        raise RenderError(result.stderr)
+    return Path(output)
+
+
+def encode_profile(master, stem, profile_name, profiles, frame_rate, primary_done=False, keep_master=False,
+                   jobs=None, timeout=None):
+    """
+    Produce every output of a profile from the rendered master video.
+
+    The primary output and each alternate are separate ffmpeg processes run
+    in parallel. With primary_done the master already is the primary output
+    (frames were piped straight into the profile's encoder) and is only moved
+    into place. The master is deleted afterwards unless keep_master is set.
+    Each encode is killed after timeout seconds.
+    Returns the output paths, primary first.
+    """
+    profile = profiles[profile_name]
+    primary = output_path(stem, profile)
+    alternates = [(profiles[name], output_path(stem, profiles[name])) for name in profile.get("alternates", [])]
+
+    if primary_done:
+        # A retried encode finds the master already moved
+        if Path(master).exists() or not primary.exists():
+            Path(master).replace(primary)
+        source = primary
+    else:
+        source = master
+
+    with ThreadPoolExecutor(max_workers=jobs or len(alternates) + 1) as pool:
+        futures = [pool.submit(transcode, source, path, alternate, frame_rate, timeout=timeout)
+                   for alternate, path in alternates]
+        if not primary_done:
+            futures.insert(0, pool.submit(transcode, source, primary, profile, frame_rate, timeout=timeout))
+        outputs = [future.result() for future in futures]
+
+    if not primary_done:
+        if not keep_master:
+            Path(master).unlink()
+        return outputs
+    return [primary] + outputs
@@ -0,0 +1,112 @@
+"""
+Size-capped garbage collection of the generated/ media directory.
+
+manim's media_dir fills up with partial movie files, Tex and texts caches,
+section and shard work directories, snapshots, render cache objects and
+videos of renamed scenes. collect_garbage() deletes the least recently used
+files until the directory fits its byte cap.
+
+Recency comes from the render cache index where it has it: cache objects
+use their recorded last access, and files of directories mirrored into the
+cache (manim's texts/ and Tex/) use the access time of their object. Every
+other file uses the later of its access and modification times (mounts with
+noatime or relatime leave the access time stale).
+
+Never deleted: files directly in the root (journal, reports), the cache
+index, the files in `keep` (the outputs the published manifest refers to)
+and the cache objects holding a copy of one of them.
+"""
+
+import os
+from pathlib import Path
+
+from .cache import file_hash
+
+
+def _remove_empty_dirs(directory, stop):
+    """Remove directory and its parents while they are empty, up to (not including) stop"""
+    directory = Path(directory)
+    while directory != stop and stop in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
+
+
+def collect_garbage(root, max_bytes, cache=None, keep=(), shared_dirs=None, dry_run=False):
+    """
+    Delete least recently used files under root until it holds at most max_bytes.
+
+    cache is the LocalCache stored under root, if any; shared_dirs maps its
+    ref prefixes to the directories mirrored under them. With dry_run
+    nothing is deleted. Returns a report: total bytes before and after,
+    protected bytes, and the evicted files (path, size, last use) in
+    eviction order.
+    """
+    root = Path(root).resolve()
+    keep = {Path(path).resolve() for path in keep if Path(path).exists()}
+    accessed = cache.accessed_times() if cache is not None else {}
+    objects_dir = cache.objects.resolve() if cache is not None else None
+    index = {cache.root.resolve() / name for name in ("index.sqlite", "index.sqlite-wal", "index.sqlite-shm")} \
+        if cache is not None else set()
+
+    # Recency of mirrored files, from the cache object each one is stored as
+    mirrored = {}
+    if cache is not None:
+        for prefix, directory in (shared_dirs or {}).items():
+            directory = Path(directory).resolve()
+            for key, digest in cache.list_refs(prefix).items():
+                if digest in accessed:
+                    mirrored[directory / key[len(prefix):]] = accessed[digest]
+    kept_objects = {file_hash(path) for path in keep} if cache is not None else set()
+
+    total = protected = 0
+    candidates = []
+    for directory, _, files in os.walk(root):
+        directory = Path(directory)
+        for name in files:
+            path = directory / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # removed while walking
+            total += stat.st_size
+            is_object = objects_dir is not None and objects_dir in path.parents
+            if directory == root or path in index or path in keep or (is_object and name in kept_objects):
+                protected += stat.st_size
+                continue
+            if is_object and name in accessed:
+                last_used = accessed[name]
+            else:
+                last_used = mirrored.get(path, max(stat.st_atime, stat.st_mtime))
+            candidates.append((last_used, stat.st_size, path, is_object))
+
+    remaining = total
+    evicted = []
+    evicted_objects = []
+    for last_used, size, path, is_object in sorted(candidates, key=lambda candidate: candidate[0]):
+        if remaining <= max_bytes:
+            break
+        evicted.append({"path": str(path.relative_to(root)), "size": size, "last_used": last_used,
+                        "object": is_object})
+        remaining -= size
+        if dry_run:
+            continue
+        if is_object:
+            evicted_objects.append(path.name)
+        else:
+            path.unlink(missing_ok=True)
+            _remove_empty_dirs(path.parent, root)
+    if evicted_objects:
+        cache.remove(evicted_objects)
+        for digest in evicted_objects:
+            _remove_empty_dirs(objects_dir / digest[:2], objects_dir)
+
+    return {
+        "total": total,
+        "remaining": remaining,
+        "protected": protected,
+        "max_bytes": max_bytes,
+        "evicted": evicted,
+    }
@@ -0,0 +1,59 @@
+"""
+ffmpeg helpers for joining and inspecting rendered videos.
+"""
+
+import json
+from pathlib import Path
+
+from .render import RenderError, run_process
+
+
+def concat_videos(inputs, output, timeout=None):
+    """
+    Join videos with the concat demuxer, copying streams without re-encoding.
+
+    All inputs must share codec, resolution and frame rate, which holds for
+    pieces of one scene rendered at the same quality. After timeout seconds
+    ffmpeg is killed and RenderTimeout raised.
+    """
+    output = Path(output)
+    list_file = output.with_suffix(".concat.txt")
+    with open(list_file, "w") as f:
+        for path in inputs:
+            escaped = str(Path(path).resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    try:
+        result = run_process([
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", str(list_file),
+            "-c", "copy", str(output),
+        ], timeout=timeout)
+    finally:
+        list_file.unlink()
+    if result.returncode != 0:
+        raise RenderError(result.stderr)
+    return output
+
+
+def probe(path, timeout=None):
+    """Duration (s), size (bytes), bit rate (bit/s), width, height and frame rate of a video, from ffprobe"""
+    result = run_process([
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "format=duration,size,bit_rate:stream=width,height,avg_frame_rate",
+        "-of", "json", str(path),
+    ], timeout=timeout)
+    if result.returncode != 0:
+        raise RenderError(result.stderr)
+
+    data = json.loads(result.stdout)
+    stream = data["streams"][0]
+    numerator, denominator = stream.get("avg_frame_rate", "0/1").split("/")
+    return {
+        "duration": float(data["format"]["duration"]),
+        "size": int(data["format"]["size"]),
+        "bit_rate": int(data["format"].get("bit_rate", 0)),
+        "width": int(stream["width"]),
+        "height": int(stream["height"]),
+        "frame_rate": float(numerator) / float(denominator) if float(denominator) else 0.0,
+    }
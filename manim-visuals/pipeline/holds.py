@@ -0,0 +1,86 @@
+"""
+Static-hold detection for wait() periods.
+
+manim already renders a wait() once when no mobject has updaters. Waits with
+updaters attached (always_redraw, trackers, ...) are rasterized frame by frame
+even when nothing visible changes. HoldDetector fingerprints the scene state
+before each frame of a Wait; when it matches the previous frame the camera's
+pixel array is reused instead of redrawn, and the file writer is told the
+frame is a repeat (PipedSceneFileWriter then duplicates it at the encoder
+instead of copying it again).
+
+Frames stay constant-rate: a variable-frame-rate MP4 cannot express how long
+its last frame lasts, so a trailing hold would be cut short.
+"""
+
+import hashlib
+
+import numpy as np
+from manim import Wait
+
+STATE_ARRAYS = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "rgbas", "pixel_array")
+STATE_VALUES = ("stroke_width", "background_stroke_width", "z_index", "sheen_factor")
+
+
+def state_fingerprint(scene):
+    """Digest of everything the camera draws: geometry, colours and draw order of every mobject"""
+    digest = hashlib.blake2b(digest_size=16)
+    camera = scene.renderer.camera
+    frame = getattr(camera, "frame", None)  # MovingCamera
+    if frame is not None:
+        digest.update(frame.points.tobytes())
+
+    for mobject in scene.mobjects + scene.foreground_mobjects:
+        for member in mobject.get_family():
+            digest.update(id(member).to_bytes(8, "little"))
+            for name in STATE_ARRAYS:
+                array = getattr(member, name, None)
+                if isinstance(array, np.ndarray):
+                    digest.update(array.tobytes())
+            digest.update(repr([getattr(member, name, None) for name in STATE_VALUES]).encode())
+    return digest.digest()
+
+
+class HoldDetector:
+    """Wraps renderer.play/render to skip rasterizing frames that repeat during a Wait"""
+
+    def __init__(self, scene):
+        renderer = scene.renderer
+        self.renderer = renderer
+        self.last = None
+        self.held_frames = 0
+        self.rendered_frames = 0
+        self._play = renderer.play
+        self._render = renderer.render
+        renderer.play = self.play
+        renderer.render = self.render
+
+    def play(self, scene, *args, **kwargs):
+        # Each play redraws its static background, so the first frame is always rendered
+        self.last = None
+        self.renderer.file_writer.frame_unchanged = False
+        try:
+            self._play(scene, *args, **kwargs)
+        finally:
+            self.renderer.file_writer.frame_unchanged = False
+
+    def render(self, scene, time, moving_mobjects):
+        renderer = self.renderer
+        if not all(isinstance(animation, Wait) for animation in scene.animations or []):
+            self.last = None
+            renderer.file_writer.frame_unchanged = False
+            self.rendered_frames += 1
+            return self._render(scene, time, moving_mobjects)
+
+        fingerprint = state_fingerprint(scene)
+        if fingerprint == self.last:
+            # The camera still holds this exact frame
+            renderer.file_writer.frame_unchanged = True
+            self.held_frames += 1
+            renderer.add_frame(renderer.get_frame())
+            return
+
+        self.last = fingerprint
+        renderer.file_writer.frame_unchanged = False
+        self.rendered_frames += 1
+        return self._render(scene, time, moving_mobjects)
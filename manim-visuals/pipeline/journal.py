@@ -0,0 +1,118 @@
+"""
+Persistent job journal: an append-only JSONL log of every scene job's progress.
+
+Each line is one state change of one job, keyed by scene and quality:
+
+    queued    the job entered the pipeline; starts a fresh record
+    rendered  master video written (master, direct)
+    encoded   profile outputs written (outputs)
+    probed    outputs checked with ffprobe (probes)
+    done      published (timings)
+    failed    a stage gave up (stage, error)
+
+Every line carries the job's inputs fingerprint. Replaying the log gives
+the latest merged state of each job, with "completed" holding the last
+state it reached (a failure does not reset it), so a run interrupted by a crash
+resumes after the last stage each job completed, as long as its inputs
+are unchanged and the files that stage left behind still exist. Lines are
+flushed and fsynced as they are written; a torn last line is skipped.
+The done records double as the render-time history used for scheduling.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Job states in pipeline order
+STATES = ("queued", "rendered", "encoded", "probed", "done")
+# Rewrite the log once it grows past this many lines
+COMPACT_LINES = 5000
+# done records kept per job when compacting (render-time history)
+KEEP_DONE = 5
+
+
+def inputs_fingerprint(files, settings, root=None):
+    """Hash of source files (path, relative to root when under it, and contents) and JSON-serializable settings"""
+    digest = hashlib.sha256()
+    for path in sorted(Path(file) for file in files):
+        name = path.relative_to(root) if root is not None and Path(root) in path.parents else path
+        digest.update(f"{name}\n".encode())
+        digest.update(path.read_bytes())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class Journal:
+    """The job journal at path; record() is safe to call from several threads"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.records = []
+        self.latest = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._apply(record)
+            if len(self.records) > COMPACT_LINES:
+                self.compact()
+
+    def _apply(self, record):
+        self.records.append(record)
+        key = record["job"]
+        if record["state"] == "queued" or record.get("snapshot"):
+            latest = dict(record)
+        else:
+            latest = {**self.latest.get(key, {}), **record}
+        if record["state"] in STATES:
+            latest["completed"] = record["state"]
+        self.latest[key] = latest
+
+    def record(self, key, state, **fields):
+        """Append a state change of job `key` and return its merged state"""
+        record = {"job": key, "state": state, "at": round(time.time(), 3), **fields}
+        line = json.dumps(record, default=str)
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._apply(json.loads(line))
+            return dict(self.latest[key])
+
+    def state(self, key, fingerprint=None):
+        """Merged latest state of a job, or None if unknown or recorded with other inputs"""
+        latest = self.latest.get(key)
+        if latest is None or (fingerprint is not None and latest.get("fingerprint") != fingerprint):
+            return None
+        return dict(latest)
+
+    def done_records(self):
+        """Every done record, oldest first"""
+        return [record for record in self.records if record["state"] == "done" and not record.get("snapshot")]
+
+    def compact(self):
+        """Rewrite the log as the last KEEP_DONE done records per job plus each job's merged state"""
+        with self.lock:
+            kept = []
+            for key, latest in self.latest.items():
+                done = [record for record in self.records
+                        if record["job"] == key and record["state"] == "done" and not record.get("snapshot")]
+                kept += done[-KEEP_DONE:]
+                kept.append({**latest, "snapshot": True})
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in kept:
+                    f.write(json.dumps(record, default=str) + "\n")
+            tmp_path.replace(self.path)
+            self.records, self.latest = [], {}
+            for record in kept:
+                self._apply(record)
@@ -0,0 +1,122 @@
+"""
+Scene file writer that streams frames into one ffmpeg process per scene.
+
+manim's default writer encodes every play() into its own partial movie file and
+concatenates them when the scene ends. PipedSceneFileWriter instead starts a
+single ffmpeg reading raw RGBA frames from stdin. Frames go through a bounded
+queue to a writer thread, so rendering the next frame overlaps with ffmpeg
+consuming the previous ones, and no partial files or final mux pass are
+needed. Frames flagged as repeats (frame_unchanged, set by HoldDetector) are
+queued once with a repeat count and duplicated as they are written to ffmpeg.
+Imports manim; used by pipeline.scene_runner only.
+"""
+
+import queue
+import subprocess
+import threading
+
+from manim import config
+from manim.scene.scene_file_writer import SceneFileWriter
+
+DEFAULT_ENCODER_ARGS = ["-c:v", "libx264", "-preset", "medium", "-crf", "23", "-pix_fmt", "yuv420p"]
+QUEUE_FRAMES = 64
+
+
+class PipedSceneFileWriter(SceneFileWriter):
+    """
+    SceneFileWriter writing every frame of the scene to one ffmpeg stdin pipe.
+
+    Partial-movie caching does not apply (there are no partial movies), and
+    audio is not supported; our scenes have none.
+    """
+
+    def __init__(self, renderer, scene_name, encoder_args=None, queue_frames=QUEUE_FRAMES, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.encoder_args = list(encoder_args or DEFAULT_ENCODER_ARGS)
+        self.frames = queue.Queue(maxsize=queue_frames)
+        self.encoder = None
+        self.writer_thread = None
+        self.writer_error = None
+        self.frame_unchanged = False
+        self.pending = None
+
+    def start_encoder(self):
+        width, height = config.pixel_width, config.pixel_height
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}",
+            "-r", str(config.frame_rate), "-i", "-",
+            "-an", *self.encoder_args, str(self.movie_file_path),
+        ]
+        self.encoder = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.writer_thread = threading.Thread(target=self._write_frames, daemon=True)
+        self.writer_thread.start()
+
+    def _write_frames(self):
+        stdin = self.encoder.stdin
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            data, count = item
+            try:
+                for _ in range(count):
+                    stdin.write(data)
+            except (BrokenPipeError, OSError) as error:
+                self.writer_error = error
+                break
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+    # Partial movie hooks: nothing to open or close per animation
+    def begin_animation(self, allow_write=False, file_path=None):
+        if allow_write and config.write_to_movie and self.encoder is None:
+            self.start_encoder()
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+    def add_partial_movie_file(self, hash_animation):
+        pass
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not config.write_to_movie:
+            return super().write_frame(frame_or_renderer, num_frames)
+        if self.encoder is None:
+            self.start_encoder()
+        if self.writer_error is not None:
+            raise RuntimeError(f"ffmpeg stopped accepting frames: {self.writer_error}")
+        if self.frame_unchanged and self.pending is not None:
+            self.pending[1] += num_frames
+            return
+        self.flush_pending()
+        # The camera reuses its pixel array, so the queue gets a copy
+        self.pending = [frame_or_renderer.tobytes(), num_frames]
+
+    def flush_pending(self):
+        if self.pending is not None:
+            self.frames.put(self.pending)
+            self.pending = None
+
+    def close_encoder(self):
+        if self.encoder is None:
+            return
+        self.flush_pending()
+        self.frames.put(None)
+        self.writer_thread.join()
+        stderr = self.encoder.stderr.read().decode(errors="replace")
+        if self.encoder.wait() != 0 or self.writer_error is not None:
+            raise RuntimeError(f"ffmpeg failed encoding {self.movie_file_path}: {stderr}")
+        self.encoder = None
+
+    def combine_to_movie(self):
+        self.close_encoder()
+        self.print_file_ready_message(self.movie_file_path)
+
+    def combine_to_section_videos(self):
+        pass
@@ -0,0 +1,179 @@
+"""
+Running manim as a subprocess and locating the videos it writes.
+
+Every subprocess runs in its own session, so a timeout can kill the whole
+process group: manim together with the latex, dvisvgm and ffmpeg processes
+it started. Processes still running when the interpreter exits (Ctrl-C in
+the middle of a build) are killed the same way.
+"""
+
+import atexit
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Quality name -> (manim flag, output directory manim uses for it)
+QUALITIES = {
+    "low": ("-ql", "480p15"),
+    "medium": ("-qm", "720p30"),
+    "high": ("-qh", "1080p60"),
+    "4k": ("-qk", "2160p60"),
+}
+
+
+def quality_frame_rate(quality):
+    """Frames per second manim renders at for a quality, e.g. 15 for "low" (480p15)"""
+    return int(QUALITIES[quality][1].split("p")[1])
+
+
+# Seconds between SIGTERM and SIGKILL when stopping a process group
+KILL_GRACE = 5
+
+_running = set()
+_running_lock = threading.Lock()
+
+
+class RenderError(Exception):
+    """A manim or ffmpeg subprocess failed; the message carries its stderr"""
+
+
+class RenderTimeout(RenderError):
+    """A subprocess ran past its timeout and was killed with its process group"""
+
+
+def kill_process_group(process, grace=KILL_GRACE):
+    """SIGTERM the process group of process, then SIGKILL whatever is left after grace seconds"""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        process.wait(grace)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.wait()
+
+
+@atexit.register
+def kill_running():
+    """Kill the process groups of every subprocess still running"""
+    with _running_lock:
+        processes = list(_running)
+    for process in processes:
+        kill_process_group(process, grace=1)
+
+
+def run_process(command, env=None, timeout=None):
+    """
+    subprocess.run(command, capture_output=True, text=True) in a new process group.
+
+    After timeout seconds the group is killed and RenderTimeout raised. A
+    process killed by a signal gets a note saying so appended to its stderr.
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env,
+                               start_new_session=True)
+    with _running_lock:
+        _running.add(process)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill_process_group(process)
+        stdout, stderr = process.communicate()
+        raise RenderTimeout(f"{Path(command[0]).name} timed out after {timeout:g}s and was killed\n{stderr}")
+    except BaseException:
+        kill_process_group(process)
+        raise
+    finally:
+        with _running_lock:
+            _running.discard(process)
+
+    if process.returncode < 0:
+        stderr += f"\n{Path(command[0]).name} killed by signal {-process.returncode}"
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def manim_command(scene_path, scene_name, output_name, quality="low", media_dir=None):
+    """Command line rendering one scene to <output_name>.mp4"""
+    command = ["manim", QUALITIES[quality][0], "--output_file", f"{output_name}.mp4"]
+    if media_dir is not None:
+        command += ["--media_dir", str(media_dir)]
+    return command + [str(scene_path), scene_name]
+
+
+def rendered_video(media_dir, scene_path, output_name, quality="low"):
+    """Where manim puts the video for manim_command(...) with the same arguments"""
+    return Path(media_dir) / "videos" / Path(scene_path).stem / QUALITIES[quality][1] / f"{output_name}.mp4"
+
+
+def run_manim(scene_path, scene_name, output_name, media_dir, quality="low", env=None, timeout=None):
+    """Render one scene and return the path of the video it produced"""
+    command = manim_command(scene_path, scene_name, output_name, quality, media_dir)
+    result = run_process(command, env, timeout)
+    if result.returncode != 0:
+        raise RenderError(result.stderr)
+
+    video = rendered_video(media_dir, scene_path, output_name, quality)
+    if not video.exists():
+        raise RenderError(f"Could not find generated file: {video}")
+    return video
+
+
+def run_scene_runner(scene_path, scene_name, arguments, env=None, timeout=None):
+    """Run pipeline.scene_runner in a subprocess and return its JSON result"""
+    env = dict(os.environ if env is None else env)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = Path(tmp) / "result.json"
+        command = [sys.executable, "-m", "pipeline.scene_runner", str(scene_path), scene_name,
+                   "--result", str(result_file)] + list(arguments)
+        result = run_process(command, env, timeout)
+        if result.returncode != 0:
+            raise RenderError(result.stderr)
+        with open(result_file) as f:
+            return json.load(f)
+
+
+def render_scene(scene_path, scene_name, media_dir, quality="low", snapshot_dir=None,
+                 from_section=None, pipe=False, holds=True, encoder_args=None, env=None, timeout=None,
+                 snapshot_inputs=()):
+    """
+    Render one scene with pipeline.scene_runner and return the video path and runner result.
+
+    With snapshot_dir, SectionedScene state is snapshotted at every section
+    boundary, keyed by the scene's imports and the data files in
+    snapshot_inputs; from_section resumes at that section. pipe streams
+    frames into one ffmpeg process (with encoder_args as its output
+    arguments, when given) instead of per-play partial movies. holds reuses
+    frames that repeat during wait() instead of rasterizing them again.
+    The render is killed after timeout seconds.
+    """
+    arguments = ["--quality", quality, "--media-dir", str(media_dir)]
+    if snapshot_dir is not None:
+        arguments += ["--snapshot-dir", str(snapshot_dir)]
+        for path in snapshot_inputs:
+            arguments += ["--snapshot-input", str(path)]
+    if from_section is not None:
+        arguments += ["--from-section", from_section]
+    if pipe:
+        arguments.append("--pipe")
+        if encoder_args is not None:
+            arguments += ["--encoder-args", json.dumps(encoder_args)]
+    if not holds:
+        arguments.append("--no-holds")
+    result = run_scene_runner(scene_path, scene_name, arguments, env, timeout)
+
+    video = rendered_video(media_dir, scene_path, scene_name, quality)
+    if not video.exists():
+        raise RenderError(f"Could not find generated file: {video}")
+    return video, result
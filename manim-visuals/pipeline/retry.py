@@ -0,0 +1,47 @@
+"""
+Bounded retries with exponential backoff for transient render failures.
+
+Only failures that a second attempt can plausibly fix are retried: timeouts
+(a stalled LaTeX or ffmpeg), resource exhaustion and processes killed from
+outside (the OOM killer). A scene that raises in its own code fails the same
+way every time and is reported straight away.
+"""
+
+import time
+
+from .render import RenderError, RenderTimeout
+
+# stderr fragments of failures worth retrying
+TRANSIENT_ERRORS = (
+    "Resource temporarily unavailable",
+    "Cannot allocate memory",
+    "MemoryError",
+    "Broken pipe",
+    "Connection reset",
+    "killed by signal",
+)
+
+
+def is_transient(error):
+    """Whether a failed render is worth retrying"""
+    return isinstance(error, RenderTimeout) or any(text in str(error) for text in TRANSIENT_ERRORS)
+
+
+def call_with_retries(function, retries=2, backoff=5.0, factor=2.0, on_retry=None):
+    """
+    Call function(), retrying transient RenderErrors up to `retries` times.
+
+    The wait before retry n is backoff * factor**(n-1) seconds;
+    on_retry(attempt, error, delay) is called before each wait.
+    """
+    delay = backoff
+    for attempt in range(1, retries + 2):
+        try:
+            return function()
+        except RenderError as error:
+            if attempt > retries or not is_transient(error):
+                raise
+            if on_retry is not None:
+                on_retry(attempt, error, delay)
+            time.sleep(delay)
+            delay *= factor
@@ -0,0 +1,165 @@
+"""
+In-process scene rendering, run as `python -m pipeline.scene_runner`.
+
+The only pipeline module that imports manim; the package __init__ leaves it
+out. It loads a scene file the way the manim CLI does, renders with a fixed
+random seed so separate processes produce identical frames, and reports what
+it did as JSON in the --result file:
+
+    --timeline        dry run; "durations" holds the run time of every play
+    --plays A,B       render only plays A..B (inclusive, 0-based); "start_hash"
+                      and "end_hash" are frame hashes just before play A and
+                      just after play B
+    --snapshot-dir D  snapshot SectionedScene state at every section boundary
+    --snapshot-input F
+                      data file the scene reads, folded into the snapshot
+                      keys (repeatable)
+    --from-section S  resume at section S from its snapshot, or by replaying
+                      the earlier sections without rendering; "resumed" says
+                      which
+    --pipe            stream frames into one ffmpeg process instead of
+                      writing a partial movie per play
+    --encoder-args J  JSON list of ffmpeg output arguments for --pipe
+    --no-holds        rasterize every frame of wait() holds; by default
+                      repeated frames are reused ("held_frames" in the result)
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import manim
+from manim import tempconfig
+from manim.utils.exceptions import EndSceneEarlyException
+
+from pipeline.holds import HoldDetector
+from pipeline.piped_writer import PipedSceneFileWriter
+from pipeline.snapshots import SnapshotManager
+
+SEED = 0
+
+QUALITY_CONFIG = {
+    "low": "low_quality",
+    "medium": "medium_quality",
+    "high": "high_quality",
+    "4k": "fourk_quality",
+}
+
+
+def load_scene_class(scene_path, scene_name):
+    """Import a scene file as a top-level module with its directory on sys.path, like the manim CLI"""
+    scene_path = Path(scene_path).resolve()
+    sys.path.insert(0, str(scene_path.parent))
+    spec = importlib.util.spec_from_file_location(scene_path.stem, scene_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[scene_path.stem] = module
+    spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+def frame_hash(scene):
+    """SHA-256 of the frame showing the scene's current state"""
+    scene.renderer.update_frame(scene, ignore_skipping=True)
+    return hashlib.sha256(scene.renderer.get_frame().tobytes()).hexdigest()
+
+
+class PlayRecorder:
+    """Wraps renderer.play to record play durations and boundary frame hashes"""
+
+    def __init__(self, scene, first=None, last=None):
+        self.scene = scene
+        self.first = first
+        self.last = last
+        self.durations = []
+        self.start_hash = None
+        self.end_hash = None
+        self._play = scene.renderer.play
+        scene.renderer.play = self.play
+
+    def play(self, scene, *args, **kwargs):
+        index = scene.renderer.num_plays
+        if index == self.first:
+            self.start_hash = frame_hash(scene)
+        self._play(scene, *args, **kwargs)
+        self.durations.append(scene.duration)
+        if index == self.last:
+            self.end_hash = frame_hash(scene)
+            # Stop here ourselves: manim ignores upto_animation_number=0
+            raise EndSceneEarlyException()
+
+
+def render(scene_path, scene_name, quality="low", media_dir="generated", output_name=None,
+           plays=None, timeline=False, snapshot_dir=None, from_section=None, pipe=False,
+           holds=True, encoder_args=None, snapshot_inputs=()):
+    options = {
+        "quality": QUALITY_CONFIG[quality],
+        "media_dir": str(media_dir),
+        "input_file": str(scene_path),
+        "output_file": output_name or scene_name,
+    }
+    first = last = None
+    if timeline:
+        options["dry_run"] = True
+    elif plays is not None:
+        first, last = plays
+        options["from_animation_number"] = first
+        options["upto_animation_number"] = last
+
+    with tempconfig(options):
+        scene = load_scene_class(scene_path, scene_name)(random_seed=SEED)
+        if pipe and not timeline:
+            scene.renderer.file_writer = PipedSceneFileWriter(scene.renderer, type(scene).__name__,
+                                                              encoder_args=encoder_args)
+        recorder = PlayRecorder(scene, first, last)
+        detector = HoldDetector(scene) if holds and not timeline else None
+        resumed = {"mode": None}
+        if snapshot_dir is not None and getattr(scene, "sections", None):
+            snapshots = SnapshotManager(scene, scene_path, snapshot_dir, salt=manim.__version__,
+                                        inputs=snapshot_inputs)
+            resumed = snapshots.attach(from_section)
+        elif from_section is not None:
+            raise ValueError("--from-section needs a SectionedScene and --snapshot-dir")
+        scene.render()
+
+    return {
+        "durations": recorder.durations,
+        "start_hash": recorder.start_hash,
+        "end_hash": recorder.end_hash,
+        "resumed": resumed["mode"],
+        "held_frames": detector.held_frames if detector else 0,
+        "rendered_frames": detector.rendered_frames if detector else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render one scene in-process")
+    parser.add_argument("scene_path")
+    parser.add_argument("scene_name")
+    parser.add_argument("--quality", default="low", choices=sorted(QUALITY_CONFIG))
+    parser.add_argument("--media-dir", default="generated")
+    parser.add_argument("--output-name")
+    parser.add_argument("--plays", help="First and last play to render, e.g. 10,24")
+    parser.add_argument("--timeline", action="store_true", help="Dry run recording play durations")
+    parser.add_argument("--snapshot-dir", help="Snapshot cache for SectionedScene state")
+    parser.add_argument("--snapshot-input", action="append", default=[],
+                        help="Data file the scene reads, part of the snapshot keys (repeatable)")
+    parser.add_argument("--from-section", help="Section to resume rendering at")
+    parser.add_argument("--pipe", action="store_true", help="Stream frames to a single ffmpeg encoder")
+    parser.add_argument("--encoder-args", type=json.loads, help="JSON list of ffmpeg output arguments for --pipe")
+    parser.add_argument("--no-holds", action="store_true", help="Rasterize every frame of wait() holds")
+    parser.add_argument("--result", required=True, help="JSON file to write the result to")
+    args = parser.parse_args()
+
+    plays = tuple(int(n) for n in args.plays.split(",")) if args.plays else None
+    result = render(args.scene_path, args.scene_name, args.quality, args.media_dir,
+                    args.output_name, plays, args.timeline, args.snapshot_dir, args.from_section, args.pipe,
+                    not args.no_holds, args.encoder_args, args.snapshot_input)
+    with open(args.result, "w") as f:
+        json.dump(result, f)
+
+
+if __name__ == "__main__":
+    main()
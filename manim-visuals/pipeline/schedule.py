@@ -0,0 +1,80 @@
+"""
+Longest-expected-first scheduling of scene renders.
+
+Render times per scene and quality come from the done records of the job
+journal (pipeline.journal). A scene's expected time is the average of its
+recent renders at that quality; without one, renders at another quality are
+scaled by pixel rate, and a scene that has never been rendered falls back to
+the static estimate of pipeline.cost.
+Starting the longest jobs first keeps a long scene from finishing alone at
+the end of a parallel rebuild.
+"""
+
+import heapq
+
+from .cost import estimate_scene
+from .render import QUALITIES, quality_frame_rate
+
+# Recent renders averaged for the expected time
+HISTORY_RUNS = 5
+# Floor for static estimates, so unreadable scenes still get a slot
+MIN_ESTIMATE = 1.0
+
+
+def pixel_rate(quality):
+    """Pixels per second of video at a quality, e.g. 854*480*15 for "low" """
+    height = int(QUALITIES[quality][1].split("p")[0])
+    return height * height * 16 // 9 * quality_frame_rate(quality)
+
+
+def static_estimate(scene_path, scene_name, quality="low"):
+    """Render seconds predicted by the static cost estimator, for scenes without history"""
+    try:
+        return estimate_scene(scene_path, scene_name, quality)["render_seconds"] or MIN_ESTIMATE
+    except (OSError, SyntaxError):
+        return MIN_ESTIMATE
+
+
+class DurationHistory:
+    """Recent render seconds per scene and quality"""
+
+    def __init__(self, runs=None):
+        self.runs = runs or {}
+
+    @classmethod
+    def from_journal(cls, journal):
+        """History of the journal's done jobs whose render ran in full (not resumed or partial)"""
+        history = cls()
+        for record in journal.done_records():
+            if record.get("measured") and "render" in record.get("timings", {}):
+                history.record(record["scene"], record["quality"], record["timings"]["render"])
+        return history
+
+    def record(self, scene_name, quality, seconds):
+        runs = self.runs.setdefault(scene_name, {}).setdefault(quality, [])
+        runs.append(round(seconds, 2))
+        del runs[:-HISTORY_RUNS]
+
+    def expected(self, scene_name, quality):
+        """Expected render seconds from history, or None when the scene was never rendered"""
+        by_quality = self.runs.get(scene_name, {})
+        if by_quality.get(quality):
+            runs = by_quality[quality]
+            return sum(runs) / len(runs)
+        for other, runs in by_quality.items():
+            if runs and other in QUALITIES:
+                return sum(runs) / len(runs) * pixel_rate(quality) / pixel_rate(other)
+        return None
+
+
+def longest_first(jobs, expected):
+    """Jobs sorted by expected seconds, longest first; expected(job) -> seconds"""
+    return sorted(jobs, key=expected, reverse=True)
+
+
+def predicted_makespan(durations, workers):
+    """Wall time of running durations in the given order on `workers` parallel slots"""
+    slots = [0.0] * max(1, workers)
+    for duration in durations:
+        heapq.heapreplace(slots, slots[0] + duration)
+    return max(slots)
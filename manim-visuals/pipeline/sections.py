@@ -0,0 +1,51 @@
+"""
+Parallel rendering of SectionedScene sections.
+
+Each section renders in its own manim process with MANIM_SECTION set and its
+own media directory (manim's partial-movie lists would collide otherwise); the
+section videos are then joined with the concat demuxer.
+"""
+
+import ast
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .ffmpeg import concat_videos
+from .render import run_manim
+
+# Must match common.sections.SECTION_ENV; not imported so the pipeline does not need manim
+SECTION_ENV = "MANIM_SECTION"
+
+
+def find_sections(scene_path, scene_name):
+    """
+    Section names declared as `sections = [...]` in the scene class body.
+
+    Read with ast, without importing the scene; returns [] for scenes that
+    do not declare sections.
+    """
+    tree = ast.parse(Path(scene_path).read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == scene_name:
+            for statement in node.body:
+                if (isinstance(statement, ast.Assign)
+                        and any(isinstance(t, ast.Name) and t.id == "sections" for t in statement.targets)):
+                    return list(ast.literal_eval(statement.value))
+    return []
+
+
+def render_sections(scene_path, scene_name, sections, output, work_dir, quality="low", jobs=None, env=None,
+                    timeout=None):
+    """Render every section in parallel and concatenate them into output; each section and the concat get timeout seconds"""
+    work_dir = Path(work_dir)
+    env = dict(os.environ if env is None else env)
+
+    def render(section):
+        section_env = dict(env, **{SECTION_ENV: section})
+        return run_manim(scene_path, scene_name, f"{scene_name}_{section}",
+                         work_dir / section, quality, section_env, timeout)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        videos = list(pool.map(render, sections))
+    return concat_videos(videos, output, timeout=timeout)
@@ -0,0 +1,86 @@
+"""
+Frame-range sharding of one long scene across processes.
+
+A dry run records the duration of every play; the timeline is cut into K
+windows of about equal length at play boundaries. Each shard process runs
+construct() with the plays before its window skipped (state still advances)
+and stops after its last play. Frame hashes at the window edges must agree
+between neighbouring shards, otherwise skipping changed the scene state and
+the shards cannot be stitched.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .ffmpeg import concat_videos
+from .render import RenderError, rendered_video, run_scene_runner
+
+
+def scene_timeline(scene_path, scene_name, env=None, timeout=None):
+    """Run time of every play (wait() included) from a dry run"""
+    return run_scene_runner(scene_path, scene_name, ["--timeline"], env, timeout)["durations"]
+
+
+def split_timeline(durations, shards):
+    """
+    Cut plays into at most `shards` contiguous (first, last) ranges of about equal run time.
+
+    Each cut goes at the play boundary closest to k/shards of the total time;
+    ranges are never empty.
+    """
+    count = len(durations)
+    shards = max(1, min(shards, count))
+    ends = []
+    elapsed = 0.0
+    for duration in durations:
+        elapsed += duration
+        ends.append(elapsed)
+
+    total = ends[-1] if ends else 0.0
+    boundaries = []
+    previous = -1
+    for k in range(1, shards):
+        target = total * k / shards
+        # Boundary after play i; keep room for the remaining shards
+        lowest, highest = previous + 1, count - (shards - k) - 1
+        cut = min(range(lowest, highest + 1), key=lambda i: abs(ends[i] - target))
+        boundaries.append(cut)
+        previous = cut
+
+    starts = [0] + [cut + 1 for cut in boundaries]
+    stops = boundaries + [count - 1]
+    return list(zip(starts, stops))
+
+
+def render_shards(scene_path, scene_name, output, work_dir, shards, quality="low", env=None, jobs=None,
+                  pipe=False, timeout=None):
+    """
+    Render a scene as `shards` parallel frame ranges and stitch them into output.
+
+    Returns the list of (first, last) play ranges that were rendered.
+    """
+    work_dir = Path(work_dir)
+    ranges = split_timeline(scene_timeline(scene_path, scene_name, env, timeout), shards)
+
+    def render(index):
+        first, last = ranges[index]
+        media_dir = work_dir / f"shard{index}"
+        output_name = f"{scene_name}_shard{index}"
+        result = run_scene_runner(scene_path, scene_name, [
+            "--quality", quality, "--media-dir", str(media_dir),
+            "--output-name", output_name, "--plays", f"{first},{last}",
+        ] + (["--pipe"] if pipe else []), env, timeout)
+        return rendered_video(media_dir, scene_path, output_name, quality), result
+
+    with ThreadPoolExecutor(max_workers=jobs or len(ranges)) as pool:
+        results = list(pool.map(render, range(len(ranges))))
+
+    for index in range(1, len(results)):
+        if results[index - 1][1]["end_hash"] != results[index][1]["start_hash"]:
+            raise RenderError(
+                f"{scene_name}: frames differ at the boundary before play {ranges[index][0]}; "
+                "the scene does not render deterministically when earlier plays are skipped"
+            )
+
+    concat_videos([video for video, _ in results], output, timeout=timeout)
+    return ranges
@@ -0,0 +1,166 @@
+"""
+Scene state snapshots at section boundaries.
+
+Before each section of a SectionedScene, the scene's mobject list and the
+attributes its code set to mobjects (ValueTrackers, element lists, ...) are
+pickled into the snapshot cache. Other attributes, such as tokenizers built
+in setup(), are rebuilt by the resumed run rather than restored. The key
+hashes the scene source with the methods of this and later sections blanked
+out, plus every project module the scene imports (sibling engines, common/)
+and the data files it reads, so editing a later section keeps earlier
+snapshots valid while any earlier change invalidates them.
+
+A resumed render restores the snapshot for its first section and renders from
+there. Without a usable snapshot (never saved, or state that cannot be
+pickled, such as lambda updaters) the earlier sections are replayed with
+rendering skipped, which still avoids rasterizing and encoding them.
+"""
+
+import ast
+import hashlib
+import pickle
+from pathlib import Path
+
+from .dependencies import dependency_files
+
+
+def section_key(scene_path, scene_name, sections, index, salt="", inputs=()):
+    """
+    Hash of everything that can affect scene state before sections[index] runs.
+
+    inputs are the data files the scene reads; a missing one hashes as missing.
+    """
+    scene_path = Path(scene_path).resolve()
+    source = scene_path.read_text(encoding="utf-8")
+    later = set(sections[index:])
+
+    # Blank out the methods of this and later sections
+    lines = source.splitlines()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ClassDef) and node.name == scene_name:
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name in later:
+                    for line in range(item.lineno - 1, item.end_lineno):
+                        lines[line] = ""
+
+    digest = hashlib.sha256()
+    digest.update(f"{scene_name}\n{index}\n{salt}\n".encode())
+    digest.update("\n".join(lines).encode())
+    for path in sorted(dependency_files(scene_path) - {scene_path}):
+        digest.update(f"{path.name}\n".encode())
+        digest.update(path.read_bytes())
+    for path in sorted(Path(path).resolve() for path in inputs):
+        digest.update(f"{path}\n".encode())
+        digest.update(path.read_bytes() if path.is_file() else b"missing")
+    return digest.hexdigest()
+
+
+def _is_scene_state(value):
+    """Mobjects (ValueTrackers included), or lists, tuples and dicts of them"""
+    from manim import Mobject
+
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return all(isinstance(item, Mobject) for item in value)
+    return isinstance(value, Mobject)
+
+
+class SnapshotManager:
+    """
+    Saves and restores the state of one SectionedScene instance.
+
+    Create it right after the scene is constructed so the attributes manim
+    sets up itself can be told apart from the ones the scene code adds.
+    """
+
+    def __init__(self, scene, scene_path, snapshot_dir, salt="", inputs=()):
+        self.scene = scene
+        self.scene_path = scene_path
+        self.snapshot_dir = Path(snapshot_dir)
+        self.salt = salt
+        self.inputs = list(inputs)
+        self.base_attributes = set(vars(scene))
+
+    def path(self, index):
+        scene = self.scene
+        key = section_key(self.scene_path, type(scene).__name__, scene.sections, index, self.salt, self.inputs)
+        return self.snapshot_dir / type(scene).__name__ / f"{index:02d}-{key[:16]}.pickle"
+
+    def save(self, index):
+        """Snapshot the state before sections[index]; returns False if it cannot be pickled"""
+        scene = self.scene
+        attributes = {name: value for name, value in vars(scene).items()
+                      if name not in self.base_attributes and _is_scene_state(value)}
+        state = {
+            "mobjects": scene.mobjects,
+            "foreground_mobjects": scene.foreground_mobjects,
+            "attributes": attributes,
+        }
+        try:
+            data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+
+        path = self.path(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return True
+
+    def restore(self, index):
+        """Load the state before sections[index] into the scene; returns False when there is none"""
+        path = self.path(index)
+        if not path.exists():
+            return False
+        try:
+            state = pickle.loads(path.read_bytes())
+        except Exception:
+            return False
+
+        scene = self.scene
+        scene.mobjects = state["mobjects"]
+        scene.foreground_mobjects = state["foreground_mobjects"]
+        for name, value in state["attributes"].items():
+            setattr(scene, name, value)
+        return True
+
+    def attach(self, from_section=None):
+        """
+        Hook the scene so each section boundary is snapshotted; with from_section,
+        construct() resumes at that section instead of starting from the top.
+
+        Returns a dict whose "mode" becomes "snapshot" or "replay" once the
+        resumed construct() has run (None when not resuming).
+        """
+        scene = self.scene
+        sections = scene.sections
+        boundary = {name: index for index, name in enumerate(sections)}
+        scene.begin_section = lambda name: self.save(boundary[name])
+        resumed = {"mode": None}
+        if from_section is None:
+            return resumed
+
+        if from_section not in boundary:
+            raise ValueError(f"{type(scene).__name__} has no section {from_section!r}")
+        start = boundary[from_section]
+
+        def construct():
+            scene.current_elements = []
+            if start == 0 or self.restore(start):
+                resumed["mode"] = "snapshot"
+            else:
+                # No snapshot: run the earlier sections with rendering skipped
+                resumed["mode"] = "replay"
+                renderer = scene.renderer
+                skipping = renderer._original_skipping_status
+                renderer._original_skipping_status = True
+                for index in range(start):
+                    scene.run_section(index)
+                renderer._original_skipping_status = skipping
+            for index in range(start, len(sections)):
+                scene.run_section(index)
+
+        scene.construct = construct
+        return resumed
@@ -0,0 +1,104 @@
+"""
+Staged execution: jobs flow through a chain of stages connected by bounded queues.
+
+Each stage has its own worker threads, so while one scene renders, the one
+before it is being encoded, probed and published. The heavy lifting happens
+in subprocesses (manim, ffmpeg, ffprobe), so threads are enough to overlap
+them. Bounded queues hold an upstream stage back when a downstream one falls
+behind, so finished masters do not pile up on disk.
+
+Jobs are dicts. A stage function takes a job and updates it in place; an
+exception marks the job failed (job["failed_stage"], job["error"]) and it
+skips the remaining stages. The time spent in each stage is recorded in
+job["timings"].
+"""
+
+import queue
+import threading
+import time
+
+# Queue marker telling a worker there are no more jobs
+_DONE = object()
+
+
+class Stage:
+    """One step of the pipeline: a function run on each job by a number of worker threads"""
+
+    def __init__(self, name, function, workers=1, queue_size=2):
+        self.name = name
+        self.function = function
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+
+
+def run_stages(jobs, stages, on_finished=None):
+    """
+    Push jobs through stages in order and wait for all of them.
+
+    on_finished(job, error) is called from the calling thread as each job
+    leaves the pipeline, error being None when every stage succeeded.
+    Returns the jobs in the order they finished.
+    """
+    inputs = [queue.Queue(maxsize=stage.queue_size) for stage in stages]
+    finished = queue.Queue()
+    remaining = [stage.workers for stage in stages]
+    lock = threading.Lock()
+
+    def work(index):
+        stage = stages[index]
+        while True:
+            job = inputs[index].get()
+            if job is _DONE:
+                break
+            start = time.perf_counter()
+            try:
+                stage.function(job)
+            except Exception as error:
+                job.setdefault("timings", {})[stage.name] = time.perf_counter() - start
+                job["failed_stage"] = stage.name
+                job["error"] = error
+                finished.put((job, error))
+                continue
+            job.setdefault("timings", {})[stage.name] = time.perf_counter() - start
+            if index + 1 < len(stages):
+                inputs[index + 1].put(job)
+            else:
+                finished.put((job, None))
+
+        # The last worker out closes the next stage (or the pipeline)
+        with lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last:
+            if index + 1 < len(stages):
+                for _ in range(stages[index + 1].workers):
+                    inputs[index + 1].put(_DONE)
+            else:
+                finished.put(_DONE)
+
+    def feed():
+        for job in jobs:
+            inputs[0].put(job)
+        for _ in range(stages[0].workers):
+            inputs[0].put(_DONE)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for index, stage in enumerate(stages):
+        threads += [threading.Thread(target=work, args=(index,), name=f"{stage.name}-{number}", daemon=True)
+                    for number in range(stage.workers)]
+    for thread in threads:
+        thread.start()
+
+    done = []
+    while True:
+        item = finished.get()
+        if item is _DONE:
+            break
+        job, error = item
+        done.append(job)
+        if on_finished is not None:
+            on_finished(job, error)
+
+    for thread in threads:
+        thread.join()
+    return done
@@ -0,0 +1,66 @@
+"""
+Polling file watcher for watch mode.
+
+Files matching glob patterns are scanned every `interval` seconds and
+compared by modification time and size, with the standard library only.
+Editors save in bursts (write, rename, format-on-save), so changes are
+collected until nothing has changed for `debounce` seconds and then
+reported as one batch.
+"""
+
+import time
+from pathlib import Path
+
+POLL_INTERVAL = 0.5
+DEBOUNCE = 1.0
+
+
+class FileWatcher:
+    """Changes to the files matching patterns (globs relative to root, "**" allowed)"""
+
+    def __init__(self, patterns, root=".", interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        self.patterns = list(patterns)
+        self.root = Path(root)
+        self.interval = interval
+        self.debounce = debounce
+        self.state = self._scan()
+
+    def _scan(self):
+        state = {}
+        for pattern in self.patterns:
+            for path in self.root.glob(pattern):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue  # deleted between glob and stat
+                if path.is_file():
+                    state[path.resolve()] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    @property
+    def files(self):
+        return set(self.state)
+
+    def changes(self, timeout=None):
+        """
+        Wait for a debounced batch of changes and return the paths created,
+        modified or deleted. Returns an empty set when nothing changed within
+        timeout seconds (a burst already in progress is still waited out).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        last_change = None
+        while True:
+            time.sleep(self.interval)
+            current = self._scan()
+            now = time.monotonic()
+            difference = {path for path in current.keys() | self.state.keys()
+                          if current.get(path) != self.state.get(path)}
+            self.state = current
+            if difference:
+                changed |= difference
+                last_change = now
+            elif changed and now - last_change >= self.debounce:
+                return changed
+            if not changed and deadline is not None and now >= deadline:
+                return changed
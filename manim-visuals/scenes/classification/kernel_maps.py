@@ -0,0 +1,115 @@
+"""
+Kernel feature maps and precomputed surface meshes for the KernelTrick scene.
+
+Feature maps lift whole (N, 2) point arrays to (N, 3) in one NumPy expression.
+Surface meshes are vertex grids computed once per (kernel, parameters, range,
+resolution) and cached, then turned into Bezier control points for a single
+VMobject, so no Python callable runs per vertex while building the scene.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Planes whose z weight is this small relative to the normal stand (nearly) vertical
+VERTICAL_TOLERANCE = 1e-9
+
+
+def polynomial_height(x, y, degree=2, coef0=0.0):
+    """(x² + y² + coef0)^(degree / 2): the classic degree-2 lift when degree=2, coef0=0"""
+    return (x * x + y * y + coef0) ** (degree / 2)
+
+
+def rbf_height(x, y, gamma=0.5, center=(0.0, 0.0)):
+    """Similarity to a landmark, exp(-gamma * |p - center|²)"""
+    return np.exp(-gamma * ((x - center[0]) ** 2 + (y - center[1]) ** 2))
+
+
+FEATURE_MAPS = {
+    "polynomial": polynomial_height,
+    "rbf": rbf_height,
+}
+
+
+def lift(points, kernel="polynomial", **params):
+    """Map (N, 2) points to (N, 3) as (x, y, height) for the given kernel"""
+    points = np.asarray(points, dtype=float)
+    heights = FEATURE_MAPS[kernel](points[:, 0], points[:, 1], **params)
+    return np.column_stack([points, heights])
+
+
+def mesh_resolution(pixel_height, curved=True):
+    """
+    Grid cells per side for a surface rendered at the given output height.
+
+    Flat surfaces need a single cell; curved ones get roughly one cell per
+    24 output pixels, clamped so previews stay cheap and 4K stays bounded.
+    """
+    if not curved:
+        return 1
+    return int(np.clip(pixel_height // 24, 8, 48))
+
+
+@lru_cache(maxsize=32)
+def _cached_mesh(kernel, params, u_range, v_range, resolution):
+    us = np.linspace(u_range[0], u_range[1], resolution + 1)
+    vs = np.linspace(v_range[0], v_range[1], resolution + 1)
+    grid_u, grid_v = np.meshgrid(us, vs)
+    heights = FEATURE_MAPS[kernel](grid_u, grid_v, **dict(params))
+    mesh = np.stack([grid_u, grid_v, heights], axis=-1)
+    mesh.setflags(write=False)
+    return mesh
+
+
+def surface_mesh(kernel, u_range, v_range, resolution, **params):
+    """
+    (resolution + 1, resolution + 1, 3) vertex grid of the kernel's height surface.
+
+    Cached by kernel, parameters, ranges and resolution; the returned array is
+    read-only because it is shared between callers.
+    """
+    key_params = tuple(sorted((name, tuple(value) if isinstance(value, (list, tuple)) else value)
+                              for name, value in params.items()))
+    return _cached_mesh(kernel, key_params, tuple(u_range), tuple(v_range), int(resolution))
+
+
+def plane_mesh(coef, intercept, u_range, v_range, resolution=1, z_range=None):
+    """
+    Vertex grid of the plane {coef . (u, v, z) + intercept = 0}, solved for z,
+    or None when the plane is parallel to the z-axis and has no such form.
+
+    With z_range the heights are clipped to it; a clipped plane bends along
+    the clip line, so it needs more than one cell to look right.
+    """
+    w_u, w_v, w_z = coef
+    if abs(w_z) <= VERTICAL_TOLERANCE * np.linalg.norm(coef):
+        return None
+    us = np.linspace(u_range[0], u_range[1], resolution + 1)
+    vs = np.linspace(v_range[0], v_range[1], resolution + 1)
+    grid_u, grid_v = np.meshgrid(us, vs)
+    heights = -(w_u * grid_u + w_v * grid_v + intercept) / w_z
+    if z_range is not None:
+        heights = np.clip(heights, *z_range)
+    return np.stack([grid_u, grid_v, heights], axis=-1)
+
+
+def quad_bezier_points(mesh):
+    """
+    Cubic Bezier control points outlining every cell of a vertex grid.
+
+    Each cell becomes a closed four-edge path (16 control points), so the
+    result can be handed to a single VMobject's set_points.
+    """
+    corners = np.stack([
+        mesh[:-1, :-1], mesh[:-1, 1:], mesh[1:, 1:], mesh[1:, :-1]
+    ], axis=2).reshape(-1, 4, 3)
+    starts = corners
+    ends = np.roll(corners, -1, axis=1)
+    # Straight edges: handles at one and two thirds
+    edges = np.stack([
+        starts,
+        starts + (ends - starts) / 3,
+        starts + 2 * (ends - starts) / 3,
+        ends,
+    ], axis=2)
+    return edges.reshape(-1, 3)
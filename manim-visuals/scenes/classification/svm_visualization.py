@@ -1,11 +1,53 @@
 from manim import (
-    Scene, Text, VGroup, Axes, Dot, Circle, ThreeDAxes, Surface,
-    Write, FadeOut, Create, Transform,
+    Scene, Text, VGroup, VMobject, Axes, Dot, Circle, Line, ThreeDAxes, ImageMobject,
+    Write, FadeIn, FadeOut, Create, Transform,
     BLUE, WHITE, RED, GREEN, YELLOW, ORANGE, GRAY, PURPLE,
-    UP, DOWN, LEFT, RIGHT
+    UP, DOWN, LEFT, RIGHT, color_to_int_rgb, config
 )
 import numpy as np
 
+from common import axes_to_scene
+from kernel_maps import lift, mesh_resolution, plane_mesh, quad_bezier_points, surface_mesh
+from svm_solver import SVM
+
+
+def decision_region(axes, svm, x_range, y_range, resolution=160,
+                    colors=(RED, GREEN), opacity=0.3):
+    """Shade the plane by predicted class from one dense-grid evaluation; the margin band is lighter"""
+    _, _, values = svm.decision_grid(x_range, y_range, resolution)
+
+    negative, positive = (np.array(color_to_int_rgb(color), dtype=np.uint8) for color in colors)
+    rgba = np.empty(values.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = np.where(values[..., None] >= 0, positive, negative)
+    alpha = np.where(np.abs(values) < 1, opacity * 0.5, opacity)
+    rgba[..., 3] = (alpha * 255).astype(np.uint8)
+
+    # Grid row 0 is the lowest y, image row 0 is the top
+    region = ImageMobject(rgba[::-1])
+    lower_left = axes.coords_to_point(x_range[0], y_range[0])
+    upper_right = axes.coords_to_point(x_range[1], y_range[1])
+    region.stretch_to_fit_width(upper_right[0] - lower_left[0])
+    region.stretch_to_fit_height(upper_right[1] - lower_left[1])
+    region.move_to((lower_left + upper_right) / 2)
+    return region
+
+
+def boundary_line(axes, svm, x_range, y_range, level=0.0, **line_kwargs):
+    """Line for {w . x + b = level} clipped to the plotted range, or None when it misses the range"""
+    segment = svm.boundary_segment(x_range, y_range, level)
+    if segment is None:
+        return None
+    start, end = segment
+    return Line(axes.coords_to_point(*start), axes.coords_to_point(*end), **line_kwargs)
+
+
+def mesh_surface(axes, mesh, **style):
+    """One VMobject for a precomputed (rows, cols, 3) vertex grid in axes coordinates"""
+    scene_mesh = axes_to_scene(axes, mesh.reshape(-1, 3)).reshape(mesh.shape)
+    surface = VMobject(**style)
+    surface.set_points(quad_bezier_points(scene_mesh))
+    return surface
+
 class SVMIntroduction(Scene):
     def construct(self):
         title = Text("Support Vector Machine", font_size=48, color=BLUE)
@@ -54,20 +96,29 @@ class SVMIntroduction(Scene):
         self.play(Create(possible_lines))
         self.wait(1)
         
-        # Fade out and show the optimal boundary
-        optimal_line = axes.plot(lambda x: x, color=YELLOW, x_range=[-3, 3])
-        self.play(FadeOut(possible_lines), Create(optimal_line))
-        
-        # Show margin lines
-        margin_line_1 = axes.plot(lambda x: x - 1.5, color=ORANGE, x_range=[-3, 3])
-        margin_line_2 = axes.plot(lambda x: x + 1.5, color=ORANGE, x_range=[-3, 3])
+        # Fit a hard-margin SVM to the data instead of guessing the boundary
+        points = np.array(class_1_points + class_2_points)
+        labels = np.array([0] * len(class_1_points) + [1] * len(class_2_points))
+        svm = SVM(kernel="linear", C=1000).fit(points, labels)
+        plot_range = ([-3, 3], [-3, 3])
         
-        self.play(Create(margin_line_1), Create(margin_line_2))
+        # Fade out and show the optimal boundary
+        region = decision_region(axes, svm, *plot_range)
+        optimal_line = boundary_line(axes, svm, *plot_range, color=YELLOW)
+        self.play(FadeOut(possible_lines), FadeIn(region),
+                  *([Create(optimal_line)] if optimal_line is not None else []))
+        self.bring_to_front(class_1_dots, class_2_dots)
+        
+        # Show margin lines (a line that falls outside the plotted range is skipped)
+        margin_lines = [boundary_line(axes, svm, *plot_range, level=level, color=ORANGE) for level in (-1, 1)]
+        margin_lines = [line for line in margin_lines if line is not None]
+        if margin_lines:
+            self.play(*[Create(line) for line in margin_lines])
         
         # Highlight support vectors
         support_vectors = [
-            Dot(axes.coords_to_point(-1, -1), color=RED, radius=0.15),
-            Dot(axes.coords_to_point(1, 1), color=GREEN, radius=0.15),
+            Dot(axes.coords_to_point(*points[index]), color=GREEN if labels[index] else RED, radius=0.15)
+            for index in svm.support_
         ]
         
         for sv in support_vectors:
@@ -135,32 +186,62 @@ class KernelTrick(Scene):
             z_length=3,
         ).shift(RIGHT * 3)
         
-        # Map points to 3D using kernel function z = x^2 + y^2
+        # Map all points to 3D at once using the kernel feature map z = x^2 + y^2
+        points_2d = np.array(inner_points + outer_points)
+        lifted = lift(points_2d, "polynomial")
+        lifted_positions = axes_to_scene(axes_3d, lifted)
+        
         inner_dots_3d = VGroup(*[
-            Dot(axes_3d.coords_to_point(x, y, x**2 + y**2), color=RED, radius=0.08)
-            for x, y in inner_points
+            Dot(position, color=RED, radius=0.08)
+            for position in lifted_positions[:len(inner_points)]
         ])
         
         outer_dots_3d = VGroup(*[
-            Dot(axes_3d.coords_to_point(x, y, x**2 + y**2), color=GREEN, radius=0.08)
-            for x, y in outer_points
+            Dot(position, color=GREEN, radius=0.08)
+            for position in lifted_positions[len(inner_points):]
         ])
         
+        # The feature-map surface itself, from a cached mesh sized for the output quality
+        surface_range = [-2.2, 2.2]
+        paraboloid = surface_mesh("polynomial", surface_range, surface_range,
+                                  mesh_resolution(config.pixel_height)).copy()
+        paraboloid[..., 2] = np.minimum(paraboloid[..., 2], 5)
+        kernel_surface = mesh_surface(
+            axes_3d, paraboloid,
+            fill_color=BLUE, fill_opacity=0.15, stroke_color=BLUE, stroke_width=0.5
+        )
+        
         self.play(Create(axes_3d))
+        self.play(Create(kernel_surface))
         self.play(Create(inner_dots_3d), Create(outer_dots_3d))
         
-        # Show linear separation in 3D
-        plane = Surface(
-            lambda u, v: axes_3d.coords_to_point(u, v, 2),
-            u_range=[-3, 3],
-            v_range=[-3, 3],
-            fill_color=YELLOW,
-            fill_opacity=0.3
-        )
-        
-        self.play(Create(plane))
+        # Fit a linear SVM in the lifted space; its plane separates the classes
+        labels = np.array([0] * len(inner_points) + [1] * len(outer_points))
+        svm_3d = SVM(kernel="linear", C=1000).fit(lifted, labels)
+        
+        # Show linear separation in 3D, clipped to the z-axis range; a single mesh cell
+        # while the plane stays inside it, a full grid once the clip bends it. A plane
+        # parallel to the z-axis has no height form and is skipped
+        plane_range, z_range = [-3, 3], (0, 5)
+        corners = plane_mesh(svm_3d.coef_, svm_3d.intercept_, plane_range, plane_range)
+        if corners is not None:
+            flat = bool(np.all((corners[..., 2] >= z_range[0]) & (corners[..., 2] <= z_range[1])))
+            plane = mesh_surface(
+                axes_3d,
+                plane_mesh(svm_3d.coef_, svm_3d.intercept_, plane_range, plane_range,
+                           mesh_resolution(config.pixel_height, curved=not flat), z_range=z_range),
+                fill_color=YELLOW, fill_opacity=0.3, stroke_width=0
+            )
+            self.play(Create(plane))
         self.wait(2)
         
+        # The same separation back in 2D is a curved boundary (RBF kernel)
+        svm_rbf = SVM(kernel="rbf", C=10).fit(points_2d, labels)
+        region_2d = decision_region(axes_2d, svm_rbf, [-3, 3], [-3, 3])
+        self.play(FadeIn(region_2d))
+        self.bring_to_front(inner_dots, outer_dots)
+        self.wait(1)
+        
         # Title
         final_title = Text("Kernel Trick: Linear in Higher Dimensions", font_size=24, color=WHITE)
         final_title.to_edge(UP)
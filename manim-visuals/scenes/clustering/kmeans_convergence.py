@@ -0,0 +1,96 @@
+from manim import (
+    Scene, Text, VGroup, Axes, Dot,
+    Write, FadeIn, FadeOut, Create, Transform, UpdateFromAlphaFunc,
+    BLUE, WHITE, RED, GREEN, YELLOW, GRAY, BLACK,
+    UP, DOWN
+)
+import numpy as np
+
+from common import PointCloud, palette_to_rgba
+from kmeans_engine import KMeans, make_blobs
+
+N_POINTS = 100_000
+BLOB_CENTERS = [(-2.5, -1.5), (2, -1.5), (-0.5, 2), (3, 2)]
+CLUSTER_COLORS = [RED, GREEN, BLUE, YELLOW]
+
+
+def blend_colors(cloud, start, end):
+    """Animation fading every point of the cloud from one colour array to another"""
+    return UpdateFromAlphaFunc(cloud, lambda mob, alpha: mob.blend_rgbas(start, end, alpha))
+
+
+class KMeansConvergence(Scene):
+    def construct(self):
+        title = Text("K-Means Clustering", font_size=48, color=BLUE)
+        subtitle = Text("Watching centroids find the clusters", font_size=32, color=WHITE)
+        title.to_edge(UP)
+        subtitle.next_to(title, DOWN)
+        
+        self.play(Write(title))
+        self.play(Write(subtitle))
+        self.wait(2)
+        self.play(FadeOut(title), FadeOut(subtitle))
+        
+        axes = Axes(
+            x_range=[-5, 5, 1],
+            y_range=[-4, 4, 1],
+            x_length=9,
+            y_length=6,
+            axis_config={"color": BLUE},
+            tips=False,
+        )
+        
+        # Data and the whole convergence run are computed up front
+        X, _ = make_blobs(N_POINTS, BLOB_CENTERS, spread=0.7)
+        inside = (np.abs(X[:, 0]) < 5) & (np.abs(X[:, 1]) < 4)
+        X = X[inside]
+        kmeans = KMeans(n_clusters=len(CLUSTER_COLORS), init="random", random_state=3, max_iter=20).fit(X)
+        history = kmeans.history_
+        palette = palette_to_rgba(CLUSTER_COLORS)
+        
+        # One array-backed mobject for every point
+        cloud = PointCloud.from_axes(axes, X, colors=BLACK, stroke_width=1)
+        unassigned = np.tile(palette_to_rgba([GRAY])[0], (len(X), 1))
+        
+        self.play(Create(axes))
+        self.add(cloud)
+        self.play(blend_colors(cloud, cloud.rgbas.copy(), unassigned), run_time=1)
+        
+        count_text = Text(f"{len(X):,} points", font_size=24, color=WHITE)
+        count_text.to_edge(UP)
+        self.play(Write(count_text))
+        
+        centroid_dots = VGroup(*[
+            Dot(axes.coords_to_point(*centroid), color=color, radius=0.15).set_stroke(WHITE, width=2)
+            for centroid, color in zip(history.centroids[0], CLUSTER_COLORS)
+        ])
+        self.play(FadeIn(centroid_dots))
+        self.wait(1)
+        
+        iteration_text = Text("Iteration 0", font_size=24, color=YELLOW)
+        iteration_text.to_edge(DOWN)
+        self.play(Write(iteration_text))
+        
+        for step in range(len(history.labels)):
+            # Assignment: every point takes the colour of its nearest centroid
+            new_iteration_text = Text(f"Iteration {step}", font_size=24, color=YELLOW).to_edge(DOWN)
+            self.play(
+                blend_colors(cloud, cloud.rgbas.copy(), palette[history.labels[step]]),
+                Transform(iteration_text, new_iteration_text),
+                run_time=0.8,
+            )
+            
+            # Update: centroids move to the mean of their points
+            if step + 1 < len(history.centroids):
+                self.play(*[
+                    dot.animate.move_to(axes.coords_to_point(*centroid))
+                    for dot, centroid in zip(centroid_dots, history.centroids[step + 1])
+                ], run_time=0.8)
+        
+        final_text = Text(
+            f"Converged after {kmeans.n_iter_} iterations",
+            font_size=28, color=GREEN
+        )
+        final_text.to_edge(UP)
+        self.play(Transform(count_text, final_text))
+        self.wait(2)
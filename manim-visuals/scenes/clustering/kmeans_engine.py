@@ -0,0 +1,179 @@
+"""
+Vectorized K-means for the clustering scenes.
+
+Pure NumPy, no Manim import. Distances are computed for whole blocks of points
+at once, mini-batch updates keep very large datasets cheap, and every iteration's
+assignments and centroids are recorded so a scene can replay convergence from
+arrays instead of recomputing anything while rendering.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+KMeansHistory = namedtuple("KMeansHistory", ["centroids", "labels", "inertia"])
+
+
+def squared_distances(X, centroids, x_sq=None):
+    """Squared Euclidean distances, shape (len(X), len(centroids))"""
+    x_sq = np.einsum("ij,ij->i", X, X) if x_sq is None else x_sq
+    c_sq = np.einsum("ij,ij->i", centroids, centroids)
+    return np.maximum(x_sq[:, None] - 2.0 * X @ centroids.T + c_sq[None, :], 0.0)
+
+
+def assign(X, centroids, x_sq=None, chunk_size=65536):
+    """Nearest centroid per point and the total inertia, in bounded-memory chunks"""
+    labels = np.empty(len(X), dtype=np.int32)
+    inertia = 0.0
+    for start in range(0, len(X), chunk_size):
+        stop = start + chunk_size
+        block_sq = None if x_sq is None else x_sq[start:stop]
+        distances = squared_distances(X[start:stop], centroids, block_sq)
+        block_labels = distances.argmin(axis=1)
+        labels[start:stop] = block_labels
+        inertia += distances[np.arange(len(block_labels)), block_labels].sum()
+    return labels, float(inertia)
+
+
+def kmeans_plus_plus(X, n_clusters, rng, x_sq=None):
+    """k-means++ seeding with a running minimum distance array"""
+    centroids = np.empty((n_clusters, X.shape[1]))
+    centroids[0] = X[rng.integers(len(X))]
+    closest = squared_distances(X, centroids[:1], x_sq)[:, 0]
+    for k in range(1, n_clusters):
+        total = closest.sum()
+        if total <= 0:
+            centroids[k:] = centroids[0]
+            break
+        index = rng.choice(len(X), p=closest / total)
+        centroids[k] = X[index]
+        closest = np.minimum(closest, squared_distances(X, centroids[k:k + 1], x_sq)[:, 0])
+    return centroids
+
+
+class KMeans:
+    """
+    Lloyd's K-means, or mini-batch K-means when batch_size is set.
+
+    After fit(): centroids_, labels_, inertia_, n_iter_ and, when
+    record_history is on, history_ with centroids (T, k, d), labels (T, n)
+    and inertia (T,). Entry t holds the centroids and the assignment to them
+    at iteration t, so entry 0 is the initial seeding. In mini-batch mode
+    only the points of each batch are reassigned (the others keep their last
+    label) and the inertia is the batch estimate, except in the last entry,
+    which is a full assignment.
+    """
+
+    def __init__(self, n_clusters=3, max_iter=100, tol=1e-4, batch_size=None,
+                 init="k-means++", random_state=0, record_history=True):
+        self.n_clusters = n_clusters
+        self.max_iter = max_iter
+        self.tol = tol
+        self.batch_size = batch_size
+        self.init = init
+        self.random_state = random_state
+        self.record_history = record_history
+
+    def fit(self, X):
+        X = np.asarray(X, dtype=float)
+        rng = np.random.default_rng(self.random_state)
+        x_sq = np.einsum("ij,ij->i", X, X)
+
+        if isinstance(self.init, str) and self.init == "k-means++":
+            centroids = kmeans_plus_plus(X, self.n_clusters, rng, x_sq)
+        elif isinstance(self.init, str) and self.init == "random":
+            centroids = X[rng.choice(len(X), self.n_clusters, replace=False)].copy()
+        else:
+            centroids = np.array(self.init, dtype=float)
+
+        label_dtype = np.uint8 if self.n_clusters <= 256 else np.int32
+        history_centroids, history_labels, history_inertia = [], [], []
+        counts = np.zeros(self.n_clusters)
+
+        def record(centroids, labels, inertia):
+            if self.record_history:
+                history_centroids.append(centroids.copy())
+                history_labels.append(labels.astype(label_dtype))
+                history_inertia.append(inertia)
+
+        # Lloyd steps assign every point. Mini-batch steps assign only their batch: history
+        # frames keep each point's label from the last batch that drew it, with the batch
+        # inertia scaled to the whole dataset, and the final frame is a full assignment
+        full_assignments = self.record_history or not self.batch_size
+        if full_assignments:
+            labels, inertia = assign(X, centroids, x_sq)
+            record(centroids, labels, inertia)
+
+        n_iter = 0
+        for n_iter in range(1, self.max_iter + 1):
+            if self.batch_size:
+                new_centroids, batch, batch_labels, batch_inertia = self._mini_batch_step(
+                    X, centroids, counts, rng, x_sq)
+            else:
+                new_centroids = self._lloyd_step(X, labels, centroids)
+
+            shift = np.max(np.sum((new_centroids - centroids) ** 2, axis=1))
+            centroids = new_centroids
+            if not self.batch_size:
+                labels, inertia = assign(X, centroids, x_sq)
+                record(centroids, labels, inertia)
+            elif self.record_history:
+                labels[batch] = batch_labels
+                record(centroids, labels, batch_inertia * len(X) / len(batch))
+            if shift <= self.tol:
+                break
+
+        if self.batch_size:
+            labels, inertia = assign(X, centroids, x_sq)
+            if self.record_history:
+                history_labels[-1] = labels.astype(label_dtype)
+                history_inertia[-1] = inertia
+
+        self.centroids_ = centroids
+        self.labels_ = labels
+        self.inertia_ = inertia
+        self.n_iter_ = n_iter
+        if self.record_history:
+            self.history_ = KMeansHistory(
+                np.stack(history_centroids),
+                np.stack(history_labels),
+                np.array(history_inertia),
+            )
+        return self
+
+    def _lloyd_step(self, X, labels, centroids):
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, X)
+        counts = np.bincount(labels, minlength=self.n_clusters)
+        # Empty clusters keep their previous position
+        return np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+
+    def _mini_batch_step(self, X, centroids, counts, rng, x_sq):
+        batch = rng.choice(len(X), min(self.batch_size, len(X)), replace=False)
+        batch_labels, batch_inertia = assign(X[batch], centroids, x_sq[batch])
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, batch_labels, X[batch])
+        batch_counts = np.bincount(batch_labels, minlength=self.n_clusters)
+
+        # Per-centre learning rate 1 / (points seen so far), as in Sculley (2010)
+        counts += batch_counts
+        seen = batch_counts > 0
+        new_centroids = centroids.copy()
+        rate = batch_counts[seen] / counts[seen]
+        batch_means = sums[seen] / batch_counts[seen][:, None]
+        new_centroids[seen] += rate[:, None] * (batch_means - centroids[seen])
+        return new_centroids, batch, batch_labels, batch_inertia
+
+    def predict(self, X):
+        labels, _ = assign(np.asarray(X, dtype=float), self.centroids_)
+        return labels
+
+
+def make_blobs(n_points, centers, spread=0.6, random_state=0):
+    """Gaussian blobs around the given centres, shuffled; returns (X, true_labels)"""
+    rng = np.random.default_rng(random_state)
+    centers = np.asarray(centers, dtype=float)
+    true_labels = rng.integers(len(centers), size=n_points)
+    X = centers[true_labels] + rng.normal(scale=spread, size=(n_points, centers.shape[1]))
+    return X, true_labels
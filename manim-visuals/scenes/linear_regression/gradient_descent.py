@@ -1,11 +1,13 @@
 from manim import (
-    Scene, Text, VGroup, Axes, Dot, Line, Arrow,
-    Write, FadeOut, Create, Transform,
-    BLUE, WHITE, RED, GREEN, YELLOW, ORANGE,
+    Scene, Text, VGroup, Axes, Dot, Line, Arrow, DecimalNumber, ValueTracker, always_redraw, linear,
+    Write, FadeOut, Create, Transform, ReplacementTransform,
+    BLUE, WHITE, RED, GREEN, YELLOW, ORANGE, GRAY,
     DOWN, UP, LEFT, RIGHT, ORIGIN
 )
 import numpy as np
 
+from online_regression import fit_batch, prefix_fits
+
 class GradientDescentIntro(Scene):
     def construct(self):
         # Title
@@ -122,12 +124,46 @@ class LinearRegressionVisualization(Scene):
         ]
         
         dots = VGroup(*[
-            Dot(axes.coords_to_point(x, y), color=YELLOW, radius=0.08)
+            Dot(axes.coords_to_point(x, y), color=YELLOW, radius=0.08).set_opacity(0)
             for x, y in data_points
         ])
         
         self.play(Create(axes))
-        self.play(Create(dots))
+        
+        # Stream the points in with the fitted line following every frame: entry k of the
+        # prefix fits is the online fit after its first k + 1 points, each one an O(1) update
+        xs, ys = np.array(data_points, dtype=float).T
+        slopes, intercepts, r_squared = prefix_fits(xs, ys)
+        shown = ValueTracker(0)
+        
+        def running_fit(value):
+            """Slope and intercept with `value` points shown, blending into the next fit as its point fades in"""
+            index = int(np.clip(value, 2, len(xs))) - 1
+            following = min(index + 1, len(xs) - 1)
+            t = float(np.clip(value - index - 1, 0, 1))
+            return (1 - t) * slopes[index] + t * slopes[following], (1 - t) * intercepts[index] + t * intercepts[following]
+        
+        def running_r_squared(value):
+            index = int(np.clip(value, 1, len(xs))) - 1
+            following = min(index + 1, len(xs) - 1)
+            t = float(np.clip(value - index - 1, 0, 1))
+            return (1 - t) * r_squared[index] + t * r_squared[following]
+        
+        for index, dot in enumerate(dots):
+            dot.add_updater(lambda d, index=index: d.set_opacity(float(np.clip(shown.get_value() - index, 0, 1))))
+        running_line = always_redraw(lambda: axes.plot(
+            lambda t, fit=running_fit(shown.get_value()): fit[0] * t + fit[1], color=GRAY, x_range=[0, 10]
+        ).set_stroke(opacity=float(np.clip(shown.get_value() - 1, 0, 1))))
+        running_label = Text("R² =", font_size=24, color=GRAY)
+        running_value = DecimalNumber(0, num_decimal_places=3, font_size=24, color=GRAY)
+        running_value.add_updater(lambda number: number.set_value(running_r_squared(shown.get_value())))
+        running_readout = VGroup(running_label, running_value).arrange(RIGHT, buff=0.15)
+        running_readout.to_corner(UP + RIGHT)
+        self.add(dots, running_line, running_readout)
+        self.play(shown.animate.set_value(len(xs)), run_time=0.4 * len(xs), rate_func=linear)
+        for mobject in [*dots, running_line, running_value]:
+            mobject.clear_updaters()
+        self.play(FadeOut(running_readout))
         
         # Show multiple possible lines
         lines = VGroup()
@@ -138,14 +174,15 @@ class LinearRegressionVisualization(Scene):
         self.play(Create(lines))
         self.wait(1)
         
-        # Fade out wrong lines and show the best fit
-        best_line = axes.plot(lambda x: 0.9 * x + 1.2, color=GREEN, x_range=[0, 10])
-        self.play(FadeOut(lines), Create(best_line))
+        # Fade out wrong lines and show the best fit (batch least squares)
+        fit = fit_batch(*np.array(data_points).T)
+        best_line = axes.plot(lambda x: fit.slope * x + fit.intercept, color=GREEN, x_range=[0, 10])
+        self.play(FadeOut(lines), ReplacementTransform(running_line, best_line))
         
         # Show error lines
         error_lines = VGroup()
         for x, y in data_points:
-            predicted_y = 0.9 * x + 1.2
+            predicted_y = fit.slope * x + fit.intercept
             error_line = Line(
                 axes.coords_to_point(x, y),
                 axes.coords_to_point(x, predicted_y),
@@ -156,6 +193,10 @@ class LinearRegressionVisualization(Scene):
         self.play(Create(error_lines))
         self.wait(2)
         
+        r_squared_text = Text(f"R² = {fit.r_squared:.3f}", font_size=24, color=GREEN)
+        r_squared_text.next_to(axes, DOWN)
+        self.play(Write(r_squared_text))
+        
         # Title
         title = Text("Linear Regression: Finding the Best Fit", font_size=28, color=WHITE)
         title.to_edge(UP)
@@ -0,0 +1,92 @@
+"""
+Least-squares line fitting for the regression scenes.
+
+OnlineLinearRegression keeps Welford-style running means and co-moments, so
+each added point updates the slope, intercept and R² in O(1) without the
+cancellation of raw sums of squares (x values around 1e6 stay exact to the
+last few digits). prefix_fits() runs the same recurrence over a dataset to
+give the fit after every point, which drives the streaming line of
+LinearRegressionVisualization; fit_batch() covers whole datasets with
+np.linalg.lstsq.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+RegressionFit = namedtuple("RegressionFit", ["slope", "intercept", "r_squared", "n"])
+
+
+class OnlineLinearRegression:
+    """Simple linear regression y = slope * x + intercept from running sufficient statistics"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0   # sum of squared deviations of x
+        self.m2_y = 0.0   # sum of squared deviations of y
+        self.c_xy = 0.0   # sum of co-deviations
+
+    def add(self, x, y):
+        """Add one point in O(1)"""
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+        return self
+
+    @property
+    def slope(self):
+        return self.c_xy / self.m2_x if self.m2_x > 0 else 0.0
+
+    @property
+    def intercept(self):
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def r_squared(self):
+        if self.m2_x <= 0:
+            return 0.0
+        if self.m2_y <= 0:
+            return 1.0
+        return self.c_xy * self.c_xy / (self.m2_x * self.m2_y)
+
+    def fit(self):
+        return RegressionFit(float(self.slope), float(self.intercept), float(self.r_squared), self.n)
+
+    def predict(self, x):
+        return self.slope * np.asarray(x, dtype=float) + self.intercept
+
+
+def fit_batch(xs, ys):
+    """Fit a full dataset with np.linalg.lstsq"""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    design = np.column_stack([xs, np.ones_like(xs)])
+    (slope, intercept), *_ = np.linalg.lstsq(design, ys, rcond=None)
+
+    total = np.sum((ys - ys.mean()) ** 2)
+    residual = np.sum((ys - (slope * xs + intercept)) ** 2)
+    r_squared = 1.0 - residual / total if total > 0 else 1.0
+    return RegressionFit(float(slope), float(intercept), float(r_squared), xs.size)
+
+
+def prefix_fits(xs, ys):
+    """
+    Fit after each prefix of the points, from one OnlineLinearRegression pass.
+
+    Returns arrays (slopes, intercepts, r_squared), where entry k is the fit of
+    the first k + 1 points. Entries with fewer than two distinct x values have
+    slope 0 and R² 0.
+    """
+    model = OnlineLinearRegression()
+    fits = np.empty((len(xs), 3))
+    for k, (x, y) in enumerate(zip(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))):
+        model.add(x, y)
+        fits[k] = model.slope, model.intercept, model.r_squared
+    return fits[:, 0], fits[:, 1], fits[:, 2]
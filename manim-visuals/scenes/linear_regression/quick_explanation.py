@@ -6,6 +6,8 @@ from manim import (
 )
 import numpy as np
 
+from online_regression import fit_batch
+
 class LinearRegression30Second(Scene):
     def construct(self):
         # Title appears quickly
@@ -72,14 +74,15 @@ class LinearRegression30Second(Scene):
         solution_text.to_edge(UP)
         self.play(Transform(problem_text, solution_text), run_time=0.8)
         
-        # Show the perfect line appearing
-        best_line = axes.plot(lambda x: 0.75 * x + 1.5, color=GREEN, stroke_width=6, x_range=[0, 10])
+        # Show the perfect line appearing (least-squares fit of the data)
+        fit = fit_batch(*np.array(data_points).T)
+        best_line = axes.plot(lambda x: fit.slope * x + fit.intercept, color=GREEN, stroke_width=6, x_range=[0, 10])
         self.play(Create(best_line), run_time=1.0)
         
         # Show error lines (residuals) briefly
         error_lines = VGroup()
         for x, y in data_points:
-            predicted_y = 0.75 * x + 1.5
+            predicted_y = fit.slope * x + fit.intercept
             if abs(y - predicted_y) > 0.1:  # Only show visible errors
                 error_line = Line(
                     axes.coords_to_point(x, y),
@@ -1,5 +1,22 @@
-from .network_architecture import NetworkArchitectureIntro
-from .training_process import TrainingProcessDetail
-from .text_encoder import TextEncoderExplained
+"""
+Neural network scenes.
 
-__all__ = ["NetworkArchitectureIntro", "TrainingProcessDetail", "TextEncoderExplained"] 
\ No newline at end of file
+Scene classes are imported on first access, so importing an engine module
+such as scenes.neural_network.tokenizer does not load manim and every scene.
+"""
+
+import importlib
+
+_SCENE_MODULES = {
+    "NetworkArchitectureIntro": "network_architecture",
+    "TrainingProcessDetail": "training_process",
+    "TextEncoderExplained": "text_encoder",
+}
+
+__all__ = list(_SCENE_MODULES)
+
+
+def __getattr__(name):
+    if name not in _SCENE_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_SCENE_MODULES[name]}", __name__), name)
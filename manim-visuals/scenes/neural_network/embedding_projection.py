@@ -0,0 +1,182 @@
+"""
+Projection of (V, D) embedding matrices to 2-D/3-D for the embedding scenes.
+
+Pure NumPy, no Manim import. Matrices are read in row blocks, so a memory-mapped
+.npy file of a 50k-token vocabulary is never copied into memory as a whole.
+PCA accumulates the D x D covariance block by block; randomized SVD (Halko et
+al.) only needs a handful of passes of block products. Projections can be
+cached as .npy files keyed by the matrix hash.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+BLOCK_ROWS = 8192
+
+
+def load_embeddings(path, mmap_threshold=64 * 1024 * 1024):
+    """Load a .npy embedding matrix, memory-mapped when the file is larger than the threshold"""
+    path = Path(path)
+    mmap_mode = "r" if path.stat().st_size > mmap_threshold else None
+    matrix = np.load(path, mmap_mode=mmap_mode)
+    if matrix.ndim != 2:
+        raise ValueError(f"Embedding matrix must be 2-D, got shape {matrix.shape}")
+    return matrix
+
+
+def iter_blocks(matrix, block_rows=BLOCK_ROWS):
+    """Yield (start, block) row slices as float64 arrays"""
+    for start in range(0, len(matrix), block_rows):
+        yield start, np.asarray(matrix[start:start + block_rows], dtype=np.float64)
+
+
+def matrix_hash(matrix, block_rows=BLOCK_ROWS):
+    """SHA-256 of shape, dtype and contents, read block by block"""
+    digest = hashlib.sha256(f"{matrix.shape}{matrix.dtype}".encode())
+    for start in range(0, len(matrix), block_rows):
+        digest.update(np.ascontiguousarray(matrix[start:start + block_rows]).tobytes())
+    return digest.hexdigest()
+
+
+def column_mean(matrix, block_rows=BLOCK_ROWS):
+    total = np.zeros(matrix.shape[1])
+    for _, block in iter_blocks(matrix, block_rows):
+        total += block.sum(axis=0)
+    return total / len(matrix)
+
+
+def pca_components(matrix, n_components=2, block_rows=BLOCK_ROWS):
+    """
+    Top principal directions from the covariance, accumulated block by block.
+
+    Returns (mean, components) with components of shape (n_components, D).
+    Cost is O(V D²) time and O(D²) memory, so this suits D up to a few thousand.
+    """
+    mean = column_mean(matrix, block_rows)
+    covariance = np.zeros((matrix.shape[1], matrix.shape[1]))
+    for _, block in iter_blocks(matrix, block_rows):
+        centered = block - mean
+        covariance += centered.T @ centered
+    _, vectors = np.linalg.eigh(covariance)
+    components = vectors[:, ::-1][:, :n_components].T
+    return mean, _fix_signs(components)
+
+
+def randomized_components(matrix, n_components=2, n_oversamples=10, n_iter=4,
+                          random_state=0, block_rows=BLOCK_ROWS):
+    """
+    Top principal directions by randomized SVD of the centered matrix.
+
+    Each power iteration is two streamed passes (X @ Q and X.T @ Q), with the
+    centering applied on the fly instead of materialising X - mean.
+    """
+    rng = np.random.default_rng(random_state)
+    mean = column_mean(matrix, block_rows)
+    rank = min(n_components + n_oversamples, *matrix.shape)
+
+    def times(right):
+        # (X - mean) @ right, shape (V, k)
+        shift = mean @ right
+        out = np.empty((len(matrix), right.shape[1]))
+        for start, block in iter_blocks(matrix, block_rows):
+            out[start:start + len(block)] = block @ right - shift
+        return out
+
+    def transpose_times(left):
+        # (X - mean).T @ left, shape (D, k)
+        out = np.zeros((matrix.shape[1], left.shape[1]))
+        for start, block in iter_blocks(matrix, block_rows):
+            out += block.T @ left[start:start + len(block)]
+        return out - np.outer(mean, left.sum(axis=0))
+
+    basis, _ = np.linalg.qr(times(rng.normal(size=(matrix.shape[1], rank))))
+    for _ in range(n_iter):
+        right, _ = np.linalg.qr(transpose_times(basis))
+        basis, _ = np.linalg.qr(times(right))
+
+    small = transpose_times(basis).T  # (rank, D) = Q.T @ (X - mean)
+    _, _, vt = np.linalg.svd(small, full_matrices=False)
+    return mean, _fix_signs(vt[:n_components])
+
+
+def _fix_signs(components):
+    # Largest-magnitude entry positive, so re-running never mirrors the picture
+    signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+    return components * np.where(signs == 0, 1.0, signs)[:, None]
+
+
+def project(matrix, n_components=2, method="randomized", cache_dir=None, block_rows=BLOCK_ROWS, **params):
+    """
+    (V, n_components) float32 coordinates of every row in the top principal directions.
+
+    method is "pca" (exact, from the covariance) or "randomized" (randomized
+    SVD). With cache_dir set, results are stored as .npy keyed by the matrix
+    hash and settings and loaded on later calls.
+    """
+    if method not in ("pca", "randomized"):
+        raise ValueError(f"Unknown projection method: {method}")
+
+    cache_path = None
+    if cache_dir is not None:
+        settings = "-".join([method, str(n_components)] + [f"{k}={v}" for k, v in sorted(params.items())])
+        cache_path = Path(cache_dir) / f"{matrix_hash(matrix, block_rows)[:16]}-{settings}.npy"
+        if cache_path.exists():
+            return np.load(cache_path)
+
+    if method == "pca":
+        mean, components = pca_components(matrix, n_components, block_rows)
+    else:
+        mean, components = randomized_components(matrix, n_components, block_rows=block_rows, **params)
+
+    coords = np.empty((len(matrix), n_components), dtype=np.float32)
+    shift = mean @ components.T
+    for start, block in iter_blocks(matrix, block_rows):
+        coords[start:start + len(block)] = block @ components.T - shift
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent workers each write their own temp file; the rename is atomic
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, prefix=f".{cache_path.stem}", suffix=".tmp",
+                                         delete=False) as f:
+            np.save(f, coords)
+        os.replace(f.name, cache_path)
+    return coords
+
+
+def fit_to_range(coords, ranges, margin=0.05):
+    """
+    Scale coordinates uniformly into the given per-axis (min, max) ranges.
+
+    Uses robust 0.5/99.5 percentile bounds so a few outlier tokens do not
+    squash the rest of the vocabulary into the middle of the axes.
+    """
+    coords = np.asarray(coords, dtype=float)
+    low = np.percentile(coords, 0.5, axis=0)
+    high = np.percentile(coords, 99.5, axis=0)
+    center = (low + high) / 2
+    spans = np.array([r[1] - r[0] for r in ranges]) * (1 - 2 * margin)
+    scale = np.min(spans / np.maximum(high - low, 1e-12))
+    targets = np.array([(r[0] + r[1]) / 2 for r in ranges])
+    fitted = (coords - center) * scale + targets
+    return np.clip(fitted, [r[0] for r in ranges], [r[1] for r in ranges])
+
+
+def synthetic_embeddings(n_tokens=50_000, dim=64, n_groups=6, spread=0.35, random_state=0):
+    """
+    Embedding-like matrix with semantic groups, for scenes without a trained model.
+
+    Returns (matrix float32 (n_tokens, dim), group labels). Group centres sit
+    on random directions; token frequency rank shrinks vectors towards the
+    origin, as rare tokens tend to have small, noisy embeddings.
+    """
+    rng = np.random.default_rng(random_state)
+    centers = rng.normal(size=(n_groups, dim))
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    labels = rng.integers(n_groups, size=n_tokens)
+    rank_scale = 1.0 / np.sqrt(1.0 + np.arange(n_tokens) / (n_tokens / 10))
+    matrix = centers[labels] * rank_scale[:, None] + rng.normal(scale=spread / np.sqrt(dim), size=(n_tokens, dim))
+    return matrix.astype(np.float32), labels
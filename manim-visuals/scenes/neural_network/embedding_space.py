@@ -0,0 +1,99 @@
+from manim import (
+    Scene, Text, Axes,
+    Write, FadeIn, FadeOut, Create, UpdateFromAlphaFunc,
+    BLUE, WHITE, RED, GREEN, YELLOW, ORANGE, PURPLE, TEAL, BLACK,
+    UP, DOWN
+)
+import os
+from pathlib import Path
+
+import numpy as np
+
+from common import Heatmap, PointCloud, palette_to_rgba
+from embedding_projection import load_embeddings, project, fit_to_range, synthetic_embeddings
+
+# Set EMBEDDINGS_PATH to a (V, D) .npy file to show a real model's vocabulary
+EMBEDDINGS_PATH = os.environ.get("EMBEDDINGS_PATH")
+PROJECTION_CACHE_DIR = Path(__file__).resolve().parents[2] / "generated" / "cache" / "projections"
+N_TOKENS = 50_000
+EMBEDDING_DIM = 64
+HEATMAP_ROWS = 128
+HEATMAP_SCROLL_ROWS = 2_000
+GROUP_COLORS = [RED, GREEN, BLUE, YELLOW, ORANGE, PURPLE]
+
+
+class EmbeddingSpace(Scene):
+    def construct(self):
+        title = Text("Embedding Space", font_size=48, color=BLUE)
+        subtitle = Text("Every token is a point; similar tokens sit together", font_size=28, color=WHITE)
+        title.to_edge(UP)
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title))
+        self.play(Write(subtitle))
+        self.wait(2)
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        if EMBEDDINGS_PATH:
+            matrix = load_embeddings(EMBEDDINGS_PATH)
+            groups = None
+        else:
+            matrix, groups = synthetic_embeddings(N_TOKENS, EMBEDDING_DIM, n_groups=len(GROUP_COLORS))
+
+        # The raw matrix first: a window of rows drawn as one image, recoloured in place as it scrolls
+        window = np.asarray(matrix[:HEATMAP_ROWS], dtype=float)
+        limit = float(np.abs(window).max()) or 1.0
+        heatmap = Heatmap(window, cmap="coolwarm", vmin=-limit, vmax=limit, width=3, height=5)
+        heatmap.shift(DOWN * 0.4)
+        heatmap_text = Text("One row per token", font_size=24, color=WHITE)
+        heatmap_text.next_to(heatmap, UP)
+        last_start = max(0, min(len(matrix), HEATMAP_SCROLL_ROWS) - len(window))
+
+        def scroll(mob, alpha):
+            start = int(alpha * last_start)
+            mob.set_values(matrix[start:start + len(window)])
+
+        self.play(FadeIn(heatmap), Write(heatmap_text))
+        self.play(UpdateFromAlphaFunc(heatmap, scroll), run_time=3)
+        self.play(FadeOut(heatmap), FadeOut(heatmap_text))
+
+        axes = Axes(
+            x_range=[-5, 5, 1],
+            y_range=[-3, 3, 1],
+            x_length=10,
+            y_length=6,
+            axis_config={"color": BLUE},
+            tips=False,
+        )
+        axes.shift(DOWN * 0.4)
+
+        # (V, D) -> (V, 2) in a few streamed passes, cached by matrix hash
+        coords = project(matrix, 2, "randomized", cache_dir=PROJECTION_CACHE_DIR)
+        coords = fit_to_range(coords, [(-5, 5), (-3, 3)])
+
+        # One array-backed mobject for the whole vocabulary
+        cloud = PointCloud.from_axes(axes, coords, colors=BLACK, stroke_width=1)
+        if groups is not None:
+            target = palette_to_rgba(GROUP_COLORS)[groups]
+        else:
+            target = np.tile(palette_to_rgba([TEAL])[0], (len(coords), 1))
+
+        shape_text = Text(f"{matrix.shape[0]:,} tokens × {matrix.shape[1]} dimensions → 2-D",
+                          font_size=24, color=WHITE)
+        shape_text.to_edge(UP)
+
+        self.play(Create(axes))
+        self.play(Write(shape_text))
+        self.add(cloud)
+        start = cloud.rgbas.copy()
+        self.play(
+            UpdateFromAlphaFunc(cloud, lambda mob, alpha: mob.blend_rgbas(start, target, alpha)),
+            run_time=2,
+        )
+        self.wait(1)
+
+        caption = Text("Projected with randomized SVD onto the top two principal directions",
+                       font_size=20, color=YELLOW)
+        caption.to_edge(DOWN)
+        self.play(FadeIn(caption))
+        self.wait(3)
@@ -1,5 +1,5 @@
 from manim import (
-    Scene, Text, VGroup, Dot, Line, Arrow, Rectangle, Circle, MathTex, Table,
+    Scene, Text, VGroup, Dot, Line, Arrow, Rectangle, Circle, MathTex,
     FadeIn, FadeOut, Write, Transform, Create, AnimationGroup,
     RIGHT, LEFT, UP, DOWN, ORIGIN, UL, UR, DL, DR,
     BLUE, RED, GREEN, YELLOW, ORANGE, WHITE, PURPLE, PINK, GRAY,
@@ -8,6 +8,8 @@ from manim import (
 )
 import numpy as np
 
+from common import FastTable
+
 class TextEncoderExplained(Scene):
     def construct(self):
         # Screen dimensions for reference: typically 16:9, let's manage our space carefully
@@ -82,7 +84,7 @@ class TextEncoderExplained(Scene):
         for i, char in enumerate(unique_chars):
             vocab_data.append([f'"{char}"', str(i)])
         
-        vocab_table = Table(vocab_data, include_outer_lines=True)
+        vocab_table = FastTable(vocab_data, include_outer_lines=True)
         vocab_table.scale(0.7)
         vocab_table.move_to(ORIGIN + LEFT * 2)
         
@@ -143,7 +145,7 @@ class TextEncoderExplained(Scene):
         for i, token in enumerate(tokens):
             word_vocab_data.append([f'"{token}"', str(i)])
         
-        word_table = Table(word_vocab_data, include_outer_lines=True)
+        word_table = FastTable(word_vocab_data, include_outer_lines=True)
         word_table.scale(0.7)
         word_table.move_to(ORIGIN + DOWN * 1.5)
         
@@ -197,7 +199,7 @@ class TextEncoderExplained(Scene):
             ["<END>", "End sequence"]
         ]
         
-        special_table = Table(special_tokens_data, include_outer_lines=True)
+        special_table = FastTable(special_tokens_data, include_outer_lines=True)
         special_table.scale(0.8)
         special_table.move_to(ORIGIN + UP * 0.5)
         
@@ -0,0 +1,326 @@
+"""
+Corpus-driven tokenizers behind the tokenization scenes.
+
+Character, word and BPE (subword) tokenizers trained from a corpus file that is
+streamed in chunks, so corpora of hundreds of MB never have to fit in memory.
+Token counts live in a growing NumPy array indexed by token id, BPE merges are
+learned with an incremental pair-count index (only words containing the merged
+pair are touched), and subword encoding walks a trie of the vocabulary.
+
+load_or_train() caches the trained vocabulary as JSON keyed by the corpus hash,
+so re-rendering a scene does not re-read the corpus.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+SPECIAL_TOKENS = ["<UNK>", "<PAD>", "<START>", "<END>", "<MASK>"]
+WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+CHUNK_SIZE = 1 << 20
+
+
+def iter_corpus(path, chunk_size=CHUNK_SIZE):
+    """Yield text chunks from a file, split on whitespace so no word is cut in half"""
+    carry = ""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunk = carry + chunk
+            cut = max(chunk.rfind(" "), chunk.rfind("\n"))
+            if cut == -1:
+                carry = chunk
+                continue
+            carry = chunk[cut + 1:]
+            yield chunk[:cut + 1]
+    if carry:
+        yield carry
+
+
+def corpus_hash(path, chunk_size=CHUNK_SIZE):
+    """SHA-256 of the corpus file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TokenCounter:
+    """Token -> id index with counts in a NumPy array that grows by doubling"""
+
+    def __init__(self):
+        self.index = {}
+        self.counts = np.zeros(1024, dtype=np.int64)
+
+    def update(self, tokens):
+        batch = Counter(tokens)
+        ids = np.fromiter((self.index.setdefault(token, len(self.index)) for token in batch),
+                          dtype=np.int64, count=len(batch))
+        if len(self.index) > len(self.counts):
+            grown = np.zeros(max(len(self.index), 2 * len(self.counts)), dtype=np.int64)
+            grown[:len(self.counts)] = self.counts
+            self.counts = grown
+        np.add.at(self.counts, ids, np.fromiter(batch.values(), dtype=np.int64, count=len(batch)))
+
+    def most_common(self, limit=None):
+        """(token, count) pairs by descending count, ties broken alphabetically"""
+        tokens = list(self.index)
+        counts = self.counts[:len(tokens)]
+        order = sorted(range(len(tokens)), key=lambda i: (-counts[i], tokens[i]))
+        if limit is not None:
+            order = order[:limit]
+        return [(tokens[i], int(counts[i])) for i in order]
+
+
+class Trie:
+    """Prefix tree over vocabulary pieces for greedy longest-match encoding"""
+
+    def __init__(self, pieces=()):
+        self.root = {}
+        for piece in pieces:
+            self.insert(piece)
+
+    def insert(self, piece):
+        node = self.root
+        for char in piece:
+            node = node.setdefault(char, {})
+        node[None] = piece
+
+    def longest_match(self, text, start):
+        node = self.root
+        match = None
+        for position in range(start, len(text)):
+            node = node.get(text[position])
+            if node is None:
+                break
+            if None in node:
+                match = node[None]
+        return match
+
+
+def learn_bpe(word_counts, num_merges, min_frequency=2):
+    """
+    Learn BPE merges from {word: count}.
+
+    Pair counts are kept in a dict with an index of which words contain each
+    pair; a merge only rewrites the words that contain it, and a lazy heap
+    picks the next most frequent pair.
+    """
+    words = [list(word) for word in word_counts]
+    freqs = list(word_counts.values())
+
+    pair_counts = Counter()
+    where = {}
+    for word_index, (symbols, freq) in enumerate(zip(words, freqs)):
+        for pair in zip(symbols, symbols[1:]):
+            pair_counts[pair] += freq
+            where.setdefault(pair, set()).add(word_index)
+
+    heap = [(-count, pair) for pair, count in pair_counts.items()]
+    heapq.heapify(heap)
+    merges = []
+
+    while heap and len(merges) < num_merges:
+        negative_count, pair = heapq.heappop(heap)
+        if pair_counts.get(pair, 0) != -negative_count:
+            continue  # stale heap entry
+        if -negative_count < min_frequency:
+            break
+
+        merged = pair[0] + pair[1]
+        merges.append(pair)
+        changed = set()
+        for word_index in where.pop(pair, ()):
+            symbols, freq = words[word_index], freqs[word_index]
+            if len(symbols) < 2:
+                continue
+            new_symbols = []
+            i = 0
+            while i < len(symbols):
+                if i + 1 < len(symbols) and (symbols[i], symbols[i + 1]) == pair:
+                    new_symbols.append(merged)
+                    i += 2
+                else:
+                    new_symbols.append(symbols[i])
+                    i += 1
+            if len(new_symbols) == len(symbols):
+                continue
+
+            for old_pair in zip(symbols, symbols[1:]):
+                pair_counts[old_pair] -= freq
+                changed.add(old_pair)
+            for new_pair in zip(new_symbols, new_symbols[1:]):
+                pair_counts[new_pair] += freq
+                where.setdefault(new_pair, set()).add(word_index)
+                changed.add(new_pair)
+            words[word_index] = new_symbols
+
+        pair_counts.pop(pair, None)
+        for changed_pair in changed:
+            count = pair_counts.get(changed_pair, 0)
+            if count > 0:
+                heapq.heappush(heap, (-count, changed_pair))
+            else:
+                pair_counts.pop(changed_pair, None)
+
+    return merges
+
+
+class Tokenizer:
+    """
+    Character, word or BPE tokenizer with special tokens at the front of the vocabulary.
+
+    vocab maps token -> id; counts[id] is the corpus frequency of that token
+    (0 for special tokens and BPE merge results).
+    """
+
+    def __init__(self, method="word", vocab_size=5000, lowercase=True, special_tokens=SPECIAL_TOKENS):
+        if method not in ("char", "word", "bpe"):
+            raise ValueError(f"Unknown tokenization method: {method}")
+        self.method = method
+        self.vocab_size = vocab_size
+        self.lowercase = lowercase
+        self.special_tokens = list(special_tokens)
+        self.vocab = {}
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.merges = []
+        self._trie = None
+        self._word_cache = {}
+
+    def _normalize(self, text):
+        return text.lower() if self.lowercase else text
+
+    def _words(self, text):
+        return WORD_PATTERN.findall(self._normalize(text))
+
+    def train(self, corpus_path):
+        counter = TokenCounter()
+        for chunk in iter_corpus(corpus_path):
+            if self.method == "char":
+                counter.update(self._normalize(chunk))
+            else:
+                counter.update(self._words(chunk))
+
+        budget = max(self.vocab_size - len(self.special_tokens), 0)
+        if self.method == "bpe":
+            word_counts = dict(counter.most_common())
+            char_counts = Counter()
+            for word, count in word_counts.items():
+                for char in word:
+                    char_counts[char] += count
+            alphabet = sorted(char_counts.items(), key=lambda item: (-item[1], item[0]))
+            self.merges = learn_bpe(word_counts, max(budget - len(alphabet), 0))
+            entries = alphabet + [(a + b, 0) for a, b in self.merges]
+        else:
+            entries = counter.most_common(budget)
+
+        self._set_vocab(entries[:budget])
+        return self
+
+    def _set_vocab(self, entries):
+        tokens = self.special_tokens + [token for token, _ in entries]
+        self.vocab = {token: index for index, token in enumerate(tokens)}
+        self.counts = np.array([0] * len(self.special_tokens) + [count for _, count in entries],
+                               dtype=np.int64)
+        self._trie = Trie(token for token, _ in entries) if self.method == "bpe" else None
+        self._word_cache = {}
+
+    @property
+    def unk_id(self):
+        return self.vocab.get("<UNK>", 0)
+
+    def tokenize(self, text):
+        if self.method == "char":
+            return list(self._normalize(text))
+        words = self._words(text)
+        if self.method == "word":
+            return words
+        return [piece for word in words for piece in self._split_word(word)]
+
+    def _split_word(self, word):
+        pieces = self._word_cache.get(word)
+        if pieces is None:
+            pieces = []
+            position = 0
+            while position < len(word):
+                match = self._trie.longest_match(word, position)
+                if match is None:
+                    pieces.append(word[position])
+                    position += 1
+                else:
+                    pieces.append(match)
+                    position += len(match)
+            self._word_cache[word] = pieces
+        return pieces
+
+    def encode(self, text, add_special=False):
+        ids = [self.vocab.get(token, self.unk_id) for token in self.tokenize(text)]
+        if add_special:
+            ids = [self.vocab["<START>"]] + ids + [self.vocab["<END>"]]
+        return ids
+
+    def decode(self, ids):
+        tokens = list(self.vocab)
+        return [tokens[i] for i in ids]
+
+    def most_frequent(self, limit):
+        """Regular (non-special) tokens with their counts, most frequent first"""
+        offset = len(self.special_tokens)
+        tokens = list(self.vocab)[offset:]
+        order = np.argsort(-self.counts[offset:], kind="stable")[:limit]
+        return [(tokens[i], int(self.counts[offset + i])) for i in order]
+
+    def to_dict(self):
+        return {
+            "method": self.method,
+            "vocab_size": self.vocab_size,
+            "lowercase": self.lowercase,
+            "special_tokens": self.special_tokens,
+            "tokens": list(self.vocab),
+            "counts": self.counts.tolist(),
+            "merges": [list(pair) for pair in self.merges],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tokenizer = cls(data["method"], data["vocab_size"], data["lowercase"], data["special_tokens"])
+        offset = len(tokenizer.special_tokens)
+        tokenizer.merges = [tuple(pair) for pair in data["merges"]]
+        tokenizer._set_vocab(list(zip(data["tokens"][offset:], data["counts"][offset:])))
+        return tokenizer
+
+
+def load_or_train(corpus_path, method="word", vocab_size=5000, lowercase=True, cache_dir=None):
+    """
+    Train a tokenizer on a corpus, or load it from the vocab cache.
+
+    The cache file name combines the corpus SHA-256 with the settings, so
+    editing the corpus or the settings trains a fresh vocabulary.
+    """
+    if cache_dir is None:
+        return Tokenizer(method, vocab_size, lowercase).train(corpus_path)
+
+    settings = f"{method}-{vocab_size}-{'lower' if lowercase else 'cased'}"
+    cache_path = Path(cache_dir) / f"{corpus_hash(corpus_path)[:16]}-{settings}.json"
+    if cache_path.exists():
+        with open(cache_path, encoding="utf-8") as f:
+            return Tokenizer.from_dict(json.load(f))
+
+    tokenizer = Tokenizer(method, vocab_size, lowercase).train(corpus_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Section and shard workers may train the same vocabulary at once: each writes its own temp file
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=cache_path.parent, prefix=f".{cache_path.stem}",
+                                     suffix=".tmp", delete=False) as f:
+        json.dump(tokenizer.to_dict(), f)
+    os.replace(f.name, cache_path)
+    return tokenizer
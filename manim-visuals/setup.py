@@ -33,6 +33,7 @@ def create_directory_structure():
     directories = [
         Path("scenes/linear_regression"),
         Path("scenes/classification"),
+        Path("scenes/clustering"),
         Path("scenes/neural_network"),
         Path("generated"),
         Path("../apps/org/public/visuals"),
@@ -0,0 +1,13 @@
+"""
+Import paths for the tests: the project root (pipeline/, common/) and every
+scene directory, so engine modules import by bare name as the scenes do.
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+for directory in [PROJECT_ROOT, *sorted((PROJECT_ROOT / "scenes").iterdir())]:
+    if directory.is_dir() and not directory.name.startswith("__") and str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
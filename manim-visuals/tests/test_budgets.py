@@ -0,0 +1,81 @@
+import pytest
+
+from pipeline import budgets
+from pipeline.budgets import budget_bytes, enforce_budget, size_report
+
+PROFILE = {"codec": "libx264", "crf": 23}
+
+
+def video_info(size, duration=10.0, width=1280, height=720, frame_rate=30):
+    return {"size": size, "duration": duration, "width": width, "height": height, "frame_rate": frame_rate,
+            "bit_rate": size * 8 / duration}
+
+
+def test_budget_bytes():
+    assert budget_bytes(None, 10) is None
+    assert budget_bytes({"mb": 2}, 10) == 2 * 1024 * 1024
+    assert budget_bytes({"kbps": 400}, 10) == 500_000
+    with pytest.raises(ValueError):
+        budget_bytes({"gb": 1}, 10)
+
+
+@pytest.fixture
+def encoded(monkeypatch, tmp_path):
+    """An output file whose probe reports `sizes[0]`; two-pass encodes write `sizes[1]` bytes"""
+    output = tmp_path / "Scene.mp4"
+    output.write_bytes(b"x" * 10)
+    sizes = {}
+    calls = []
+
+    def two_pass_encode(source, target, profile, frame_rate, bitrate, timeout=None):
+        calls.append(bitrate)
+        target.write_bytes(b"y" * sizes["after"])
+
+    monkeypatch.setattr(budgets, "probe", lambda path, **kwargs: video_info(sizes["before"]))
+    monkeypatch.setattr(budgets, "two_pass_encode", two_pass_encode)
+    return output, sizes, calls
+
+
+def test_within_budget_is_left_alone(encoded):
+    output, sizes, calls = encoded
+    sizes["before"] = 400_000
+    entry = enforce_budget(output, output, PROFILE, {"kbps": 400}, 30)
+    assert entry["status"] == "ok" and calls == []
+
+
+def test_over_budget_is_reencoded(encoded):
+    output, sizes, calls = encoded
+    sizes.update(before=900_000, after=450_000)
+    entry = enforce_budget(output, output, PROFILE, {"kbps": 400}, 30)
+
+    assert entry["status"] == "reencoded"
+    assert entry["size"] == 450_000 == output.stat().st_size
+    # 97% of the 500 KB limit over 10 s
+    assert calls == [388_000]
+
+
+def test_budget_below_quality_floor_is_reported(encoded):
+    output, sizes, calls = encoded
+    sizes["before"] = 900_000
+    entry = enforce_budget(output, output, PROFILE, {"kbps": 20}, 30)
+
+    assert entry["status"] == "over_budget"
+    assert entry["needed_kbps"] == round(0.01 * 1280 * 720 * 30 / 1000)
+    assert calls == []
+
+
+def test_size_report_covers_the_shipped_directory(monkeypatch, tmp_path):
+    (tmp_path / "topic").mkdir()
+    for name, size in (("Scene.mp4", 300), ("Scene.webm", 200), ("Other.mp4", 100), ("notes.txt", 5)):
+        (tmp_path / "topic" / name).write_bytes(b"x" * size)
+    monkeypatch.setattr(budgets, "probe", lambda path, **kwargs: video_info(path.stat().st_size, duration=0.01))
+
+    # 2000 kbps over 10 ms allows 2500 bytes
+    report = size_report(tmp_path, ["topic", "missing"], {"Scene": {"kbps": 2000}})
+    files = {entry["file"]: entry for entry in report["topics"]["topic"]["files"]}
+    assert report["root"] == str(tmp_path)
+    assert set(files) == {"Scene.mp4", "Scene.webm", "Other.mp4"}
+    assert files["Scene.mp4"]["within_budget"] is True
+    assert files["Other.mp4"]["within_budget"] is None
+    assert report["topics"]["topic"]["total"] == report["total"] == 600
+    assert report["topics"]["missing"] == {"files": [], "total": 0}
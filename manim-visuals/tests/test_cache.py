@@ -0,0 +1,31 @@
+import pytest
+
+from pipeline.cache import LocalCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LocalCache(tmp_path / "cache")
+
+
+def test_put_get_roundtrip(cache, tmp_path):
+    source = tmp_path / "master.mp4"
+    source.write_bytes(b"video bytes" * 1000)
+    digest = cache.put_file(source)
+    cache.put_ref("scene/abc", {"master": digest})
+
+    destination = tmp_path / "out" / "copy.mp4"
+    assert cache.get(digest, destination)
+    assert destination.read_bytes() == source.read_bytes()
+    assert cache.get_ref("scene/abc") == {"master": digest}
+    assert cache.list_refs("scene/") == {"scene/abc": {"master": digest}}
+    assert not cache.get("0" * 64, tmp_path / "missing.mp4")
+
+
+def test_put_stream_rejects_wrong_body(cache, tmp_path):
+    source = tmp_path / "a.txt"
+    source.write_bytes(b"expected")
+    with open(source, "rb") as f, pytest.raises(ValueError):
+        cache.put_stream(f, "f" * 64)
+    assert not cache.has("f" * 64)
+    assert not list(cache.objects.rglob(".*"))
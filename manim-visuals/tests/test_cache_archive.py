@@ -0,0 +1,46 @@
+import tarfile
+
+import pytest
+
+from pipeline.cache import LocalCache, export_cache, file_hash, import_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LocalCache(tmp_path / "cache")
+
+
+def test_import_skips_corrupt_objects(cache, tmp_path):
+    good, bad = tmp_path / "good.mp4", tmp_path / "bad.mp4"
+    good.write_bytes(b"good" * 100)
+    bad.write_bytes(b"bad" * 100)
+    good_digest, bad_digest = cache.put_file(good), cache.put_file(bad)
+    cache.put_ref("scene/good", {"master": good_digest})
+    cache.put_ref("scene/bad", {"master": bad_digest, "extra": good_digest})
+    # Bit rot on disk after the object was stored
+    cache.object_path(bad_digest).write_bytes(b"rotten")
+
+    archive = tmp_path / "cache.tar.gz"
+    assert export_cache(cache, archive) == (2, 2)
+
+    target = LocalCache(tmp_path / "other")
+    report = import_cache(target, archive)
+    assert report["objects"] == 1
+    assert report["corrupt"] == [bad_digest]
+    assert (report["refs"], report["skipped_refs"]) == (1, 1)
+    assert target.has(good_digest) and not target.has(bad_digest)
+    assert target.get_ref("scene/good") == {"master": good_digest}
+    assert target.get_ref("scene/bad") is None
+    assert file_hash(target.object_path(good_digest)) == good_digest
+
+    # Importing again finds everything already present
+    again = import_cache(target, archive)
+    assert (again["objects"], again["present"]) == (0, 1)
+
+
+def test_import_rejects_other_archives(cache, tmp_path):
+    archive = tmp_path / "other.tar.gz"
+    with tarfile.open(archive, "w:gz"):
+        pass
+    with pytest.raises(ValueError):
+        import_cache(cache, archive)
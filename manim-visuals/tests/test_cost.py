@@ -0,0 +1,100 @@
+import textwrap
+
+import pytest
+
+from pipeline.cost import DEFAULT_LOOP_COUNT, estimate_scene, estimate_scenes
+
+
+def scene_file(tmp_path, source, name="scene.py"):
+    path = tmp_path / name
+    path.write_text(textwrap.dedent(source))
+    return path
+
+
+def test_counts_plays_waits_and_constructions(tmp_path):
+    path = scene_file(tmp_path, """
+        class Demo(Scene):
+            def construct(self):
+                title = Text("Title")
+                self.play(Write(title), run_time=2)
+                for x in range(4):
+                    self.play(Create(Dot()))
+                for item in items:
+                    self.add(MathTex(item))
+                self.helper()
+                self.wait(3)
+
+            def helper(self):
+                table = Table([["a"]])
+                line = always_redraw(lambda: Line(Text("ignored")))
+                self.wait()
+    """)
+    estimate = estimate_scene(path, "Demo", "low")
+
+    assert estimate["plays"] == 5
+    assert estimate["run_time"] == 6.0
+    assert (estimate["waits"], estimate["wait_time"]) == (2, 4.0)
+    assert estimate["texts"] == 1
+    assert estimate["tex"] == DEFAULT_LOOP_COUNT
+    assert (estimate["tables"], estimate["redraws"]) == (1, 1)
+    assert estimate["duration"] == 10.0 and estimate["frames"] == 150
+    assert estimate_scene(path, "Missing")["render_seconds"] == 0
+
+
+def test_sectioned_scene_counts_inherited_clears(tmp_path):
+    # SectionedScene comes from the project's common/ package
+    path = scene_file(tmp_path, """
+        from common import FastTable, Heatmap, PointCloud, SectionedScene
+
+        class Demo(SectionedScene):
+            sections = ["first", "second", "third"]
+
+            def first(self):
+                self.play(FadeIn(FastTable([["a"]])))
+
+            def second(self):
+                self.play(FadeIn(Heatmap(values)))
+
+            def third(self):
+                self.add(PointCloud.from_axes(axes, points))
+    """)
+    estimate = estimate_scene(path, "Demo")
+
+    # Two clear_section() calls between three sections: a FadeOut and a one-second wait each
+    assert estimate["plays"] == 2 + 2
+    assert (estimate["waits"], estimate["wait_time"]) == (2, 2.0)
+    assert estimate["tables"] == 1 and estimate["arrays"] == 2
+
+
+def test_sections_that_are_not_literals_fall_back_to_construct(tmp_path):
+    path = scene_file(tmp_path, """
+        SECTIONS = ["intro"]
+
+        class Demo(Scene):
+            sections = SECTIONS + ["outro"]
+
+            def construct(self):
+                self.play(FadeIn(Dot()))
+
+            def intro(self):
+                self.play(FadeIn(Dot()), run_time=10)
+    """)
+    estimate = estimate_scene(path, "Demo")
+
+    assert (estimate["plays"], estimate["run_time"]) == (1, 1.0)
+
+
+def test_relative_cost(tmp_path):
+    path = scene_file(tmp_path, """
+        class Short(Scene):
+            def construct(self):
+                self.wait(1)
+
+        class Long(Scene):
+            def construct(self):
+                self.wait(10)
+    """)
+    estimates = estimate_scenes([(path, "Short"), (path, "Long")])
+
+    assert estimates["Long"]["relative_cost"] == 1.0
+    assert estimates["Short"]["relative_cost"] == pytest.approx(0.1, abs=0.01)
@@ -0,0 +1,37 @@
+from pipeline.dependencies import dependency_files, local_imports
+
+
+def write(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path.resolve()
+
+
+def test_local_imports(tmp_path):
+    scene = write(tmp_path / "scenes" / "topic" / "scene.py",
+                  "import os\nimport numpy as np\nfrom manim import *\n"
+                  "from engine import fit\nfrom common.widgets import Table\nimport common\n")
+    engine = write(tmp_path / "scenes" / "topic" / "engine.py")
+    common = write(tmp_path / "common" / "__init__.py")
+    widgets = write(tmp_path / "common" / "widgets.py")
+
+    assert local_imports(scene, tmp_path) == {engine, common, widgets}
+
+
+def test_relative_and_submodule_imports(tmp_path):
+    package = tmp_path / "scenes" / "topic"
+    init = write(package / "__init__.py", "from .scene import Scene\nfrom . import engine\n")
+    scene = write(package / "scene.py")
+    engine = write(package / "engine.py")
+
+    assert local_imports(init, tmp_path) == {scene, engine}
+
+
+def test_dependency_files_follow_imports_transitively(tmp_path):
+    scene = write(tmp_path / "scenes" / "topic" / "scene.py", "from engine import fit\n")
+    engine = write(tmp_path / "scenes" / "topic" / "engine.py", "from common.math import norm\n")
+    common = write(tmp_path / "common" / "__init__.py")
+    math = write(tmp_path / "common" / "math.py", "import numpy\n")
+    write(tmp_path / "scenes" / "topic" / "unused.py")
+
+    assert dependency_files(scene, tmp_path) == {scene, engine, common, math}
@@ -0,0 +1,137 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from pipeline import distributed
+from pipeline.distributed import Coordinator, run_worker
+from pipeline.render import RenderError, RenderTimeout
+from pipeline.retry import is_transient
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(distributed, "POLL_INTERVAL", 0.02)
+    monkeypatch.setattr(distributed, "HEARTBEAT_INTERVAL", 0.05)
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    coordinators = []
+
+    def start(**kwargs):
+        coordinators.append(Coordinator(tmp_path / "artifacts", **kwargs).start())
+        return coordinators[-1]
+
+    yield start
+    for coordinator in coordinators:
+        coordinator.close()
+
+
+def start_worker(url, handler, name="worker", **kwargs):
+    completed = []
+    thread = threading.Thread(target=lambda: completed.append(run_worker(url, handler, name, **kwargs)),
+                              daemon=True)
+    thread.start()
+    return thread, completed
+
+
+def video_handler(tmp_path):
+    """Handler that 'renders' a file named after the scene and uploads it"""
+    def handler(spec):
+        path = tmp_path / "worker" / f"{spec['scene']}.mp4"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(spec["scene"].encode())
+        return {"seconds": 1.0}, [path]
+    return handler
+
+
+def test_worker_renders_and_uploads(coordinator, tmp_path):
+    server = coordinator()
+    server.submit("A@low", {"scene": "A"})
+    server.submit("B@low", {"scene": "B"})
+    thread, completed = start_worker(server.url, video_handler(tmp_path))
+
+    for scene in "AB":
+        result = server.wait(f"{scene}@low", timeout=10)
+        assert result["seconds"] == 1.0 and result["worker"] == "worker"
+        assert Path(result["artifacts"][f"{scene}.mp4"]).read_bytes() == scene.encode()
+
+    server.close()
+    thread.join(5)
+    assert completed == [2]
+    # Uploaded files are removed from the worker
+    assert not list((tmp_path / "worker").iterdir())
+
+
+def test_transient_failure_is_requeued(coordinator, tmp_path):
+    server = coordinator()
+    server.submit("A@low", {"scene": "A"})
+    render = video_handler(tmp_path)
+    failures = [RenderTimeout("manim timed out after 1s and was killed")]
+
+    def flaky(spec):
+        if failures:
+            raise failures.pop()
+        return render(spec)
+
+    start_worker(server.url, flaky, is_transient=is_transient)
+    assert "A.mp4" in server.wait("A@low", timeout=10)["artifacts"]
+    assert server.status()["A@low"]["attempts"] == 2
+
+
+def test_scene_error_fails_the_job(coordinator):
+    server = coordinator()
+    server.submit("A@low", {"scene": "A"})
+
+    def broken(spec):
+        raise RenderError("NameError: name 'Circel' is not defined")
+
+    start_worker(server.url, broken, is_transient=is_transient)
+    with pytest.raises(RenderError, match="Circel"):
+        server.wait("A@low", timeout=10)
+    assert server.status()["A@low"]["attempts"] == 1
+
+
+def test_silent_worker_loses_its_job(coordinator, tmp_path):
+    server = coordinator(heartbeat_timeout=0.2)
+    server.submit("A@low", {"scene": "A"})
+
+    # A worker that claims the job and dies without a heartbeat
+    _, reply = distributed._request(server.url, "/claim", {"worker": "dead"})
+    assert reply["job"]["id"] == "A@low"
+
+    start_worker(server.url, video_handler(tmp_path), name="alive")
+    assert server.wait("A@low", timeout=10)["worker"] == "alive"
+    # The late result of the dead worker is refused
+    status, _ = distributed._request(server.url, "/complete", {"worker": "dead", "id": "A@low", "result": {}})
+    assert status == 409
+
+
+def test_queued_job_fails_without_workers(coordinator):
+    server = coordinator(worker_timeout=0.2)
+    server.submit("A@low", {"scene": "A"})
+    with pytest.raises(RenderError, match="no worker"):
+        server.wait("A@low")
+
+
+def test_job_held_past_its_timeout_times_out(coordinator, tmp_path):
+    server = coordinator(heartbeat_timeout=0.2)
+    server.submit("A@low", {"scene": "A"})
+    release = threading.Event()
+    render = video_handler(tmp_path)
+
+    def stuck(spec):
+        release.wait(10)
+        return render(spec)
+
+    thread, completed = start_worker(server.url, stuck)
+    with pytest.raises(RenderTimeout):
+        server.wait("A@low", timeout=0.1)
+
+    # The worker's late result is not accepted
+    release.set()
+    server.close()
+    thread.join(5)
+    assert completed == [0]
+    assert server.status()["A@low"]["state"] == "failed"
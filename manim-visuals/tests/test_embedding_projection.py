@@ -0,0 +1,23 @@
+import numpy as np
+
+from embedding_projection import project, synthetic_embeddings
+
+
+def test_randomized_matches_pca():
+    matrix, _ = synthetic_embeddings(4000, 32, n_groups=4, random_state=5)
+    exact = project(matrix, 2, "pca", block_rows=512)
+    randomized = project(matrix, 2, "randomized", block_rows=512)
+
+    # Both fix the component signs, so the coordinates agree up to SVD precision
+    scale = np.abs(exact).max()
+    np.testing.assert_allclose(randomized, exact, atol=1e-3 * scale)
+
+
+def test_projection_cache(tmp_path):
+    matrix, _ = synthetic_embeddings(1000, 16, random_state=6)
+    first = project(matrix, 2, "pca", cache_dir=tmp_path)
+    second = project(matrix, 2, "pca", cache_dir=tmp_path)
+
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+    np.testing.assert_array_equal(first, second)
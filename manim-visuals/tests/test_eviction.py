@@ -0,0 +1,49 @@
+import os
+
+from pipeline.cache import LocalCache
+from pipeline.eviction import collect_garbage
+
+
+def write(path, size, used):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+    os.utime(path, (used, used))
+    return path
+
+
+def test_evicts_oldest_first(tmp_path):
+    journal = write(tmp_path / "journal.jsonl", 100, 1)
+    old = write(tmp_path / "partial" / "old.mp4", 1000, 100)
+    middle = write(tmp_path / "partial" / "middle.mp4", 1000, 200)
+    new = write(tmp_path / "videos" / "new.mp4", 1000, 300)
+
+    report = collect_garbage(tmp_path, 2100)
+    assert [entry["path"] for entry in report["evicted"]] == [os.path.join("partial", "old.mp4")]
+    assert not old.exists() and middle.exists() and new.exists() and journal.exists()
+    assert report["remaining"] == 2100
+
+
+def test_keep_protects_outputs_and_their_cache_objects(tmp_path):
+    cache = LocalCache(tmp_path / "cache")
+    published = write(tmp_path / "videos" / "published.mp4", 1000, 100)
+    stale = write(tmp_path / "videos" / "stale.mp4", 1000, 200)
+    digest = cache.put_file(published)
+    cache.touch(digest, 50)
+    cache.put_ref("scene/published", {"master": digest})
+
+    report = collect_garbage(tmp_path, 0, cache=cache, keep=[published])
+    assert published.exists() and cache.has(digest)
+    assert cache.get_ref("scene/published") == {"master": digest}
+    assert not stale.exists()
+    assert report["protected"] >= 2000
+
+
+def test_dry_run_deletes_nothing(tmp_path):
+    cache = LocalCache(tmp_path / "cache")
+    video = write(tmp_path / "videos" / "a.mp4", 1000, 100)
+    digest = cache.put_file(video)
+
+    report = collect_garbage(tmp_path, 0, cache=cache, dry_run=True)
+    evicted = {entry["path"] for entry in report["evicted"]}
+    assert os.path.join("videos", "a.mp4") in evicted
+    assert video.exists() and cache.has(digest)
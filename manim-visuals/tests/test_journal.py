@@ -0,0 +1,51 @@
+from pipeline.journal import Journal, inputs_fingerprint
+
+
+def test_resume_after_reload(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(path)
+    journal.record("Scene@low", "queued", fingerprint="abc")
+    journal.record("Scene@low", "rendered", fingerprint="abc", master="master.mp4")
+    journal.record("Scene@low", "failed", fingerprint="abc", stage="encode", error="ffmpeg died")
+    # A crash mid-write leaves a torn last line
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"job": "Scene@low", "sta')
+
+    state = Journal(path).state("Scene@low", "abc")
+    assert state["completed"] == "rendered"
+    assert state["master"] == "master.mp4"
+    assert state["state"] == "failed"
+
+
+def test_state_ignores_other_fingerprints(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.record("Scene@low", "queued", fingerprint="abc")
+
+    assert journal.state("Scene@low", "def") is None
+    assert journal.state("Scene@low") is not None
+    assert journal.state("Other@low") is None
+
+
+def test_queued_starts_a_fresh_record(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.record("Scene@low", "queued", fingerprint="abc")
+    journal.record("Scene@low", "done", fingerprint="abc", timings={"render": 1.0})
+    journal.record("Scene@low", "queued", fingerprint="def")
+
+    state = journal.state("Scene@low", "def")
+    assert state["completed"] == "queued"
+    assert "timings" not in state
+    assert len(journal.done_records()) == 1
+
+
+def test_fingerprint_tracks_contents_and_settings(tmp_path):
+    scene = tmp_path / "scene.py"
+    scene.write_text("one")
+    data = tmp_path.parent / f"{tmp_path.name}-corpus.txt"
+    data.write_text("corpus")
+
+    base = inputs_fingerprint([scene, data], {"quality": "low"}, root=tmp_path)
+    assert inputs_fingerprint([data, scene], {"quality": "low"}, root=tmp_path) == base
+    assert inputs_fingerprint([scene, data], {"quality": "high"}, root=tmp_path) != base
+    data.write_text("edited corpus")
+    assert inputs_fingerprint([scene, data], {"quality": "low"}, root=tmp_path) != base
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from kernel_maps import lift, mesh_resolution, plane_mesh, quad_bezier_points, surface_mesh
+
+
+def test_lift_matches_feature_maps():
+    points = np.array([(1.0, 2.0), (0.0, 0.0), (-3.0, 1.0)])
+
+    np.testing.assert_allclose(lift(points)[:, 2], [5.0, 0.0, 10.0])
+    np.testing.assert_allclose(lift(points, "rbf", gamma=1.0)[:, 2], np.exp(-np.array([5.0, 0.0, 10.0])))
+    np.testing.assert_array_equal(lift(points)[:, :2], points)
+
+
+def test_surface_mesh_is_cached_and_read_only():
+    mesh = surface_mesh("polynomial", [-2, 2], [-2, 2], 8)
+
+    assert mesh.shape == (9, 9, 3)
+    assert surface_mesh("polynomial", (-2, 2), (-2, 2), 8) is mesh
+    with pytest.raises(ValueError):
+        mesh[0, 0, 2] = 1.0
+
+
+def test_mesh_resolution_bounds():
+    assert mesh_resolution(480, curved=False) == 1
+    assert mesh_resolution(100) == 8
+    assert mesh_resolution(720) == 30
+    assert mesh_resolution(2160) == 48
+
+
+def test_plane_mesh_solves_and_clips():
+    coef, intercept = np.array([1.0, 0.0, -1.0]), 0.0  # z = u
+    mesh = plane_mesh(coef, intercept, [-3, 3], [-3, 3], resolution=6)
+
+    np.testing.assert_allclose(mesh[..., 2], mesh[..., 0])
+    clipped = plane_mesh(coef, intercept, [-3, 3], [-3, 3], resolution=6, z_range=(0, 5))
+    assert clipped[..., 2].min() == 0 and clipped[..., 2].max() == 3
+
+
+def test_vertical_plane_has_no_mesh():
+    assert plane_mesh(np.array([1.0, 2.0, 0.0]), 0.5, [-3, 3], [-3, 3]) is None
+
+
+def test_quad_bezier_points_outline_every_cell():
+    mesh = plane_mesh(np.array([0.0, 0.0, 1.0]), -2.0, [0, 1], [0, 1], resolution=3)
+    points = quad_bezier_points(mesh)
+
+    assert points.shape == (3 * 3 * 4 * 4, 3)
+    np.testing.assert_allclose(points[:, 2], 2.0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from kmeans_engine import KMeans, make_blobs
+
+CENTERS = [(-5, -5), (0, 5), (5, -5)]
+
+
+def matched_error(centroids):
+    """Largest distance from each true centre to its nearest fitted centroid"""
+    distances = np.linalg.norm(np.asarray(CENTERS)[:, None] - centroids[None], axis=2)
+    return distances.min(axis=1).max()
+
+
+@pytest.mark.parametrize("batch_size", [None, 256])
+def test_converges_to_blob_centres(batch_size):
+    X, _ = make_blobs(6000, CENTERS, spread=0.5, random_state=1)
+    model = KMeans(n_clusters=3, max_iter=200, batch_size=batch_size, random_state=0).fit(X)
+
+    assert matched_error(model.centroids_) < 0.15
+    assert model.n_iter_ < model.max_iter
+    assert len(np.unique(model.labels_)) == 3
+
+
+def test_lloyd_history_is_monotone():
+    X, _ = make_blobs(3000, CENTERS, spread=1.5, random_state=2)
+    model = KMeans(n_clusters=3, init="random", random_state=3).fit(X)
+
+    history = model.history_
+    assert len(history.inertia) == model.n_iter_ + 1
+    assert history.centroids.shape == (model.n_iter_ + 1, 3, 2)
+    assert np.all(np.diff(history.inertia) <= 1e-9 * history.inertia[0])
+    assert history.inertia[-1] == pytest.approx(model.inertia_)
+
+
+def test_minibatch_without_history_still_labels_every_point():
+    X, _ = make_blobs(5000, CENTERS, spread=0.5, random_state=4)
+    model = KMeans(n_clusters=3, batch_size=128, record_history=False).fit(X)
+
+    assert not hasattr(model, "history_")
+    assert model.labels_.shape == (len(X),)
+    np.testing.assert_array_equal(model.labels_, model.predict(X))
+
+
+def test_minibatch_history_assigns_only_batches(monkeypatch):
+    import kmeans_engine
+
+    X, _ = make_blobs(20000, CENTERS, spread=0.5, random_state=5)
+    sizes = []
+    original = kmeans_engine.assign
+    monkeypatch.setattr(kmeans_engine, "assign", lambda X, *args, **kwargs: sizes.append(len(X)) or
+                        original(X, *args, **kwargs))
+    model = KMeans(n_clusters=3, batch_size=256, max_iter=30, tol=0).fit(X)
+
+    # The seeding frame and the final frame assign everything, every step only its batch
+    assert sizes.count(len(X)) == 2
+    assert sizes.count(256) == model.n_iter_ == 30
+    history = model.history_
+    assert len(history.labels) == model.n_iter_ + 1
+    np.testing.assert_array_equal(history.labels[-1], model.labels_)
+    assert history.inertia[-1] == pytest.approx(model.inertia_)
+    # Labels only change for the points a batch drew
+    assert np.count_nonzero(history.labels[1] != history.labels[0]) <= 256
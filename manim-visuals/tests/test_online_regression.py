@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from online_regression import OnlineLinearRegression, fit_batch, prefix_fits
+
+
+def test_streaming_matches_batch_with_large_offset():
+    rng = np.random.default_rng(0)
+    xs = 1e6 + rng.uniform(0, 10, size=500)
+    ys = 3.0 * (xs - 1e6) + 2.0 + rng.normal(scale=0.5, size=500)
+
+    model = OnlineLinearRegression()
+    for x, y in zip(xs, ys):
+        model.add(x, y)
+    streamed, batch = model.fit(), fit_batch(xs - 1e6, ys)
+
+    assert streamed.n == 500
+    assert streamed.slope == pytest.approx(batch.slope, rel=1e-9)
+    assert streamed.intercept + streamed.slope * 1e6 == pytest.approx(batch.intercept, rel=1e-6)
+    assert streamed.r_squared == pytest.approx(batch.r_squared, rel=1e-9)
+
+
+def test_prefix_fits_follow_the_accumulator():
+    rng = np.random.default_rng(1)
+    xs = 1e6 + rng.uniform(0, 5, size=50)
+    ys = -0.5 * xs + rng.normal(size=50)
+
+    slopes, intercepts, r_squared = prefix_fits(xs, ys)
+    for k in (1, 9, 49):
+        batch = fit_batch(xs[:k + 1] - 1e6, ys[:k + 1])
+        assert slopes[k] == pytest.approx(batch.slope, rel=1e-8)
+        assert r_squared[k] == pytest.approx(batch.r_squared, rel=1e-8)
+    assert intercepts[-1] + slopes[-1] * 1e6 == pytest.approx(fit_batch(xs - 1e6, ys).intercept, abs=1e-4)
+
+
+def test_single_x_value_has_no_slope():
+    slopes, intercepts, r_squared = prefix_fits([2.0, 2.0, 2.0], [1.0, 3.0, 5.0])
+
+    np.testing.assert_array_equal(slopes, 0)
+    np.testing.assert_array_equal(r_squared, 0)
+    assert intercepts[-1] == pytest.approx(3.0)
@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+
+import pytest
+
+from pipeline import ffmpeg, retry
+from pipeline.render import RenderError, RenderTimeout, run_process
+from pipeline.retry import call_with_retries, is_transient
+
+
+def test_transient_errors():
+    assert is_transient(RenderTimeout("manim timed out after 10s and was killed"))
+    assert is_transient(RenderError("OSError: [Errno 12] Cannot allocate memory"))
+    assert is_transient(RenderError("...\nmanim killed by signal 9"))
+    assert not is_transient(RenderError("NameError: name 'Circel' is not defined"))
+
+
+def test_retries_transient_failures_with_backoff(monkeypatch):
+    sleeps, retries = [], []
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    failures = [RenderTimeout("timed out"), RenderError("Broken pipe")]
+
+    def flaky():
+        if failures:
+            raise failures.pop(0)
+        return "video.mp4"
+
+    result = call_with_retries(flaky, retries=2, backoff=1.0, factor=3.0,
+                               on_retry=lambda attempt, error, delay: retries.append(attempt))
+    assert result == "video.mp4"
+    assert sleeps == [1.0, 3.0]
+    assert retries == [1, 2]
+
+
+def test_gives_up_after_retries(monkeypatch):
+    monkeypatch.setattr(retry.time, "sleep", lambda delay: None)
+    calls = []
+
+    def stalled():
+        calls.append(1)
+        raise RenderTimeout("timed out")
+
+    with pytest.raises(RenderTimeout):
+        call_with_retries(stalled, retries=2)
+    assert len(calls) == 3
+
+
+def test_scene_errors_are_not_retried(monkeypatch):
+    monkeypatch.setattr(retry.time, "sleep", lambda delay: pytest.fail("slept before a retry"))
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise RenderError("NameError: name 'Circel' is not defined")
+
+    with pytest.raises(RenderError):
+        call_with_retries(broken)
+    assert len(calls) == 1
+
+
+def alive(pid):
+    """Whether pid is a running process; a killed but unreaped zombie does not count"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups are POSIX")
+def test_timeout_kills_the_process_group(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    # The shell forks a grandchild that would outlive a plain kill of the shell
+    command = ["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"]
+
+    start = time.monotonic()
+    with pytest.raises(RenderTimeout):
+        run_process(command, timeout=0.5)
+    assert time.monotonic() - start < 10
+
+    assert not alive(int(pid_file.read_text()))
+
+
+def test_probe_times_out(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_run_process(command, env=None, timeout=None):
+        calls.append(timeout)
+        raise RenderTimeout(f"{command[0]} timed out after {timeout:g}s and was killed")
+
+    monkeypatch.setattr(ffmpeg, "run_process", fake_run_process)
+    with pytest.raises(RenderTimeout):
+        ffmpeg.probe(tmp_path / "video.mp4", timeout=30)
+
+    video = tmp_path / "part.mp4"
+    video.touch()
+    with pytest.raises(RenderTimeout):
+        ffmpeg.concat_videos([video], tmp_path / "joined.mp4", timeout=60)
+    assert calls == [30, 60]
+    assert not (tmp_path / "joined.concat.txt").exists()
@@ -0,0 +1,53 @@
+import pytest
+
+from pipeline.journal import Journal
+from pipeline.schedule import (
+    HISTORY_RUNS, MIN_ESTIMATE, DurationHistory, longest_first, pixel_rate, predicted_makespan, static_estimate,
+)
+
+
+def test_expected_averages_recent_runs():
+    history = DurationHistory()
+    for seconds in [100.0] + [10.0] * HISTORY_RUNS:
+        history.record("Scene", "low", seconds)
+
+    assert history.expected("Scene", "low") == pytest.approx(10.0)
+    assert history.expected("Other", "low") is None
+
+
+def test_other_quality_scales_by_pixel_rate():
+    history = DurationHistory()
+    history.record("Scene", "low", 12.0)
+
+    # 1080p60 has 2.25² times the pixels of 480p15, at four times the frame rate
+    assert pixel_rate("high") / pixel_rate("low") == pytest.approx(2.25 ** 2 * 4, rel=1e-3)
+    assert history.expected("Scene", "high") == pytest.approx(12.0 * pixel_rate("high") / pixel_rate("low"))
+
+
+def test_history_skips_resumed_and_partial_renders(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.record("A@low", "done", scene="A", quality="low", measured=True, timings={"render": 30.0})
+    journal.record("B@low", "done", scene="B", quality="low", measured=False, timings={"render": 1.0})
+    journal.record("C@low", "done", scene="C", quality="low", measured=True, timings={"encode": 2.0})
+
+    history = DurationHistory.from_journal(journal)
+    assert history.runs == {"A": {"low": [30.0]}}
+
+
+def test_longest_first_shortens_the_makespan():
+    durations = {"short1": 1, "short2": 1, "short3": 1, "short4": 1, "long": 4}
+    submitted = list(durations)
+    ordered = longest_first(submitted, durations.get)
+
+    assert ordered[0] == "long"
+    assert predicted_makespan([durations[job] for job in submitted], 2) == 6
+    assert predicted_makespan([durations[job] for job in ordered], 2) == 4
+    assert predicted_makespan([3, 3], 0) == 6
+
+
+def test_static_estimate_falls_back_for_unreadable_scenes(tmp_path):
+    broken = tmp_path / "broken.py"
+    broken.write_text("class Broken(:\n")
+
+    assert static_estimate(broken, "Broken") == MIN_ESTIMATE
+    assert static_estimate(tmp_path / "missing.py", "Missing") == MIN_ESTIMATE
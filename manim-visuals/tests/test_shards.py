@@ -0,0 +1,63 @@
+import pytest
+
+from pipeline import shards
+from pipeline.render import RenderError
+from pipeline.shards import split_timeline
+
+
+def test_equal_plays_split_evenly():
+    assert split_timeline([1.0] * 8, 4) == [(0, 1), (2, 3), (4, 5), (6, 7)]
+
+
+def test_cuts_land_near_equal_run_time():
+    # Half of the 15 s is 7.5 s: the boundary after the long play (12 s) is closer than the one before (2 s)
+    assert split_timeline([1.0, 1.0, 10.0, 1.0, 1.0, 1.0], 2) == [(0, 2), (3, 5)]
+
+
+def test_never_more_shards_than_plays_and_never_empty():
+    ranges = split_timeline([5.0, 0.1, 0.1], 8)
+    assert ranges == [(0, 0), (1, 1), (2, 2)]
+
+    ranges = split_timeline([0.0, 0.0, 0.0, 9.0], 3)
+    assert len(ranges) == 3
+    assert all(first <= last for first, last in ranges)
+    assert [first for first, _ in ranges[1:]] == [last + 1 for _, last in ranges[:-1]]
+
+
+def fake_runner(hashes):
+    def run_scene_runner(scene_path, scene_name, args, env=None, timeout=None):
+        first, last = map(int, args[args.index("--plays") + 1].split(","))
+        return {"start_hash": hashes[first], "end_hash": hashes[last + 1]}
+    return run_scene_runner
+
+
+@pytest.fixture
+def stitched(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(shards, "scene_timeline", lambda *args, **kwargs: [1.0] * 4)
+    monkeypatch.setattr(shards, "rendered_video", lambda media_dir, *args: media_dir / "video.mp4")
+    monkeypatch.setattr(shards, "concat_videos", lambda videos, output, *args, **kwargs: calls.append(videos))
+    return calls
+
+
+def test_render_shards_stitches_matching_boundaries(monkeypatch, tmp_path, stitched):
+    monkeypatch.setattr(shards, "run_scene_runner", fake_runner(["h0", "h1", "h2", "h3", "h4"]))
+
+    ranges = shards.render_shards("scene.py", "Scene", tmp_path / "out.mp4", tmp_path, 2)
+    assert ranges == [(0, 1), (2, 3)]
+    assert stitched == [[tmp_path / "shard0" / "video.mp4", tmp_path / "shard1" / "video.mp4"]]
+
+
+def test_render_shards_rejects_mismatched_boundaries(monkeypatch, tmp_path, stitched):
+    hashes = ["h0", "h1", "h2", "h3", "h4"]
+
+    def runner(scene_path, scene_name, args, env=None, timeout=None):
+        result = fake_runner(hashes)(scene_path, scene_name, args, env, timeout)
+        if args[args.index("--plays") + 1].startswith("2,"):
+            result["start_hash"] = "different"
+        return result
+
+    monkeypatch.setattr(shards, "run_scene_runner", runner)
+    with pytest.raises(RenderError, match="before play 2"):
+        shards.render_shards("scene.py", "Scene", tmp_path / "out.mp4", tmp_path, 2)
+    assert stitched == []
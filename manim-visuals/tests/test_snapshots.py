@@ -0,0 +1,58 @@
+import pytest
+
+from pipeline.snapshots import section_key
+
+SCENE = '''from engine import build
+
+
+class Demo(SectionedScene):
+    sections = ["intro", "middle", "outro"]
+
+    def intro(self):
+        self.value = build(1)
+
+    def middle(self):
+        self.value = build(2)
+
+    def outro(self):
+        self.value = build(3)
+'''
+
+
+@pytest.fixture
+def scene(tmp_path):
+    (tmp_path / "engine.py").write_text("def build(n):\n    return n\n")
+    (tmp_path / "corpus.txt").write_text("hello world\n")
+    path = tmp_path / "demo.py"
+    path.write_text(SCENE)
+    return path
+
+
+def key(scene, index=2, inputs=None):
+    inputs = [scene.parent / "corpus.txt"] if inputs is None else inputs
+    return section_key(scene, "Demo", ["intro", "middle", "outro"], index, inputs=inputs)
+
+
+def test_later_sections_do_not_change_the_key(scene):
+    before = key(scene)
+    scene.write_text(SCENE.replace("build(3)", "build(30)"))
+    assert key(scene) == before
+    scene.write_text(SCENE.replace("build(1)", "build(10)"))
+    assert key(scene) != before
+
+
+def test_sibling_imports_change_the_key(scene):
+    before = key(scene)
+    (scene.parent / "engine.py").write_text("def build(n):\n    return 2 * n\n")
+    assert key(scene) != before
+
+
+def test_data_inputs_change_the_key(scene):
+    before = key(scene)
+    (scene.parent / "corpus.txt").write_text("edited corpus\n")
+    assert key(scene) != before
+    assert key(scene, inputs=[scene.parent / "missing.txt"]) != key(scene, inputs=[])
+
+
+def test_keys_differ_per_section(scene):
+    assert len({key(scene, index) for index in range(3)}) == 3
@@ -0,0 +1,47 @@
+import threading
+
+from pipeline.stages import Stage, run_stages
+
+
+def test_failure_skips_remaining_stages():
+    seen = {"encode": [], "publish": []}
+    lock = threading.Lock()
+
+    def visit(name):
+        def function(job):
+            with lock:
+                seen[name].append(job["id"])
+        return function
+
+    def render(job):
+        if job["id"] == 2:
+            raise RuntimeError("render failed")
+
+    stages = [Stage("render", render, workers=2), Stage("encode", visit("encode"), workers=2),
+              Stage("publish", visit("publish"))]
+    jobs = [{"id": index} for index in range(5)]
+    finished = []
+    done = run_stages(jobs, stages, on_finished=lambda job, error: finished.append((job["id"], error)))
+
+    assert sorted(job["id"] for job in done) == list(range(5))
+    assert sorted(seen["encode"]) == sorted(seen["publish"]) == [0, 1, 3, 4]
+    errors = dict(finished)
+    assert isinstance(errors.pop(2), RuntimeError)
+    assert set(errors.values()) == {None}
+
+    failed = jobs[2]
+    assert failed["failed_stage"] == "render"
+    assert str(failed["error"]) == "render failed"
+    assert set(failed["timings"]) == {"render"}
+    assert set(jobs[0]["timings"]) == {"render", "encode", "publish"}
+
+
+def test_every_job_failing_still_finishes():
+    def boom(job):
+        raise ValueError(job["id"])
+
+    jobs = [{"id": index} for index in range(4)]
+    done = run_stages(jobs, [Stage("render", boom, workers=3), Stage("encode", lambda job: None)])
+
+    assert len(done) == 4
+    assert all(job["failed_stage"] == "render" for job in done)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from svm_solver import SVM
+
+
+def test_linear_margin_on_toy_set():
+    # Separable along x = y with the closest points (0, 1)/(1, 0) and (0, -1)/(-1, 0): margin sqrt(2)
+    X = np.array([(-1, 0), (0, -1), (-2, -2), (-3, -1), (1, 0), (0, 1), (2, 2), (1, 3)], dtype=float)
+    y = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+    svm = SVM(kernel="linear", C=1000).fit(X, y)
+
+    np.testing.assert_allclose(svm.margin_width, np.sqrt(2), rtol=1e-2)
+    np.testing.assert_allclose(svm.coef_ / np.linalg.norm(svm.coef_), [np.sqrt(0.5), np.sqrt(0.5)], atol=1e-2)
+    # The dual is degenerate here: any of the four margin points may carry the weight
+    assert set(svm.support_) <= {0, 1, 4, 5}
+    assert {0, 1} & set(svm.support_) and {4, 5} & set(svm.support_)
+    np.testing.assert_allclose(np.abs(svm.decision_function(X[svm.support_])), 1, atol=1e-2)
+    assert (svm.predict(X) == y).all()
+
+
+def test_boundary_segment_outside_range_is_none():
+    X = np.array([(-1, 0), (0, -1), (1, 0), (0, 1)], dtype=float)
+    svm = SVM(kernel="linear", C=1000).fit(X, [0, 0, 1, 1])
+
+    start, end = svm.boundary_segment([-3, 3], [-3, 3])
+    np.testing.assert_allclose(svm.decision_function(np.array([start, end])), 0, atol=1e-6)
+    assert svm.boundary_segment([10, 12], [10, 12]) is None
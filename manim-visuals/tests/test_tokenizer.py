@@ -0,0 +1,36 @@
+import pytest
+
+from tokenizer import Tokenizer, load_or_train
+
+CORPUS = """the lowest lower newer newest wider widest
+low lower lowest new newer newest wide wider widest
+the newest tokenizer splits lower words into pieces
+""" * 20
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text(CORPUS, encoding="utf-8")
+    return path
+
+
+def test_bpe_round_trip(corpus):
+    tokenizer = Tokenizer("bpe", vocab_size=60).train(corpus)
+
+    for word in ["lowest", "newer", "widest", "tokenizer", "wow"]:
+        ids = tokenizer.encode(word)
+        assert tokenizer.unk_id not in ids
+        assert "".join(tokenizer.decode(ids)) == word
+    assert len(tokenizer.encode("lowest")) < len("lowest")
+
+
+def test_bpe_survives_the_vocab_cache(corpus, tmp_path):
+    trained = load_or_train(corpus, "bpe", 60, cache_dir=tmp_path / "vocab")
+    loaded = load_or_train(corpus, "bpe", 60, cache_dir=tmp_path / "vocab")
+
+    assert [path.suffix for path in (tmp_path / "vocab").iterdir()] == [".json"]
+    assert loaded.vocab == trained.vocab
+    assert loaded.merges == trained.merges
+    text = "the newest lower words"
+    assert loaded.encode(text) == trained.encode(text)
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from pipeline.watch import FileWatcher
+
+
+def watcher(root):
+    return FileWatcher(["**/*.py"], root, interval=0.02, debounce=0.1)
+
+
+def test_reports_created_modified_and_deleted_files(tmp_path):
+    (tmp_path / "scenes").mkdir()
+    kept, removed = tmp_path / "scenes" / "kept.py", tmp_path / "removed.py"
+    kept.write_text("x = 1\n")
+    removed.write_text("y = 1\n")
+    files = watcher(tmp_path)
+    assert files.files == {kept.resolve(), removed.resolve()}
+
+    kept.write_text("x = 2  # longer\n")
+    removed.unlink()
+    (tmp_path / "created.py").write_text("z = 1\n")
+    (tmp_path / "notes.txt").write_text("not watched\n")
+
+    assert files.changes(timeout=5) == {kept.resolve(), removed.resolve(), (tmp_path / "created.py").resolve()}
+
+
+def test_timeout_without_changes(tmp_path):
+    (tmp_path / "scene.py").write_text("x = 1\n")
+    start = time.monotonic()
+    assert watcher(tmp_path).changes(timeout=0.1) == set()
+    assert time.monotonic() - start < 2
+
+
+def test_a_burst_of_saves_is_one_batch(tmp_path):
+    paths = [tmp_path / f"scene{index}.py" for index in range(3)]
+    files = watcher(tmp_path)
+
+    def save_in_burst():
+        for path in paths:
+            path.write_text("x = 1\n")
+            time.sleep(0.05)
+
+    thread = threading.Thread(target=save_in_burst)
+    thread.start()
+    batch = files.changes(timeout=5)
+    thread.join()
+    assert batch == {path.resolve() for path in paths}
+    assert files.changes(timeout=0.1) == set()
@@ -1,44 +1,23 @@
 from manim import *
 import numpy as np
 
-class TextEncoderStep1Problem(Scene):
-    def construct(self):
-        """
-        Step 1: The Fundamental Problem
-        - Computers only understand numbers
-        - Neural networks need fixed-size numerical inputs
-        - Text is variable length, discrete symbols
-        - The solution: Map text → dense vectors that capture meaning
-        """
-        # Track current elements for proper fade-out management
-        self.current_elements = []
-        
-        # Section 1.1: Computers Only Understand Numbers
-        self.show_computers_need_numbers()
-        self.clear_section()
-        
-        # Section 1.2: Text vs Numbers Challenge
-        self.show_text_vs_numbers_challenge()
-        self.clear_section()
-        
-        # Section 1.3: Neural Network Requirements
-        self.show_neural_network_requirements()
-        self.clear_section()
-        
-        # Section 1.4: The Solution Preview
-        self.show_solution_preview()
-    
-    def add_element(self, element):
-        """Track element for proper cleanup"""
-        self.current_elements.append(element)
-        return element
+from common import SectionedScene
+
+class TextEncoderStep1Problem(SectionedScene):
+    """
+    Step 1: The Fundamental Problem
+    - Computers only understand numbers
+    - Neural networks need fixed-size numerical inputs
+    - Text is variable length, discrete symbols
+    - The solution: Map text → dense vectors that capture meaning
+    """
     
-    def clear_section(self):
-        """Fade out all current elements with proper spacing"""
-        if self.current_elements:
-            self.play(FadeOut(*self.current_elements))
-            self.current_elements = []
-        self.wait(1)
+    sections = [
+        "show_computers_need_numbers",        # Section 1.1: Computers Only Understand Numbers
+        "show_text_vs_numbers_challenge",     # Section 1.2: Text vs Numbers Challenge
+        "show_neural_network_requirements",   # Section 1.3: Neural Network Requirements
+        "show_solution_preview",              # Section 1.4: The Solution Preview
+    ]
     
     def show_computers_need_numbers(self):
         """Demonstrate that computers only understand numbers"""
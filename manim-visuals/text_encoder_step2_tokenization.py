@@ -1,49 +1,60 @@
 from manim import *
 import numpy as np
+import json
+import os
+from pathlib import Path
 
-class TextEncoderStep2Tokenization(Scene):
-    def construct(self):
-        """
-        Step 2: Raw Text to Tokens (Preprocessing)
-        - Character-level vs word-level vs subword tokenization
-        - Building vocabularies from training data
-        - Handling unknown words (<UNK> tokens)
-        - Special tokens: <PAD>, <START>, <END>, <MASK>
-        - Practical demo: "Hello world" → [15, 847, 2]
-        """
-        # Track current elements for proper fade-out management
-        self.current_elements = []
-        
-        # Section 2.1: What is Tokenization?
-        self.show_tokenization_concept()
-        self.clear_section()
-        
-        # Section 2.2: Character vs Word vs Subword
-        self.show_tokenization_methods()
-        self.clear_section()
-        
-        # Section 2.3: Building Vocabularies
-        self.show_vocabulary_building()
-        self.clear_section()
-        
-        # Section 2.4: Special Tokens
-        self.show_special_tokens()
-        self.clear_section()
-        
-        # Section 2.5: Complete Example
-        self.show_complete_tokenization_example()
+from common import FastTable, SectionedScene
+from scenes.neural_network.tokenizer import load_or_train
+
+CORPUS_PATH = Path(os.environ.get("TOKENIZER_CORPUS", Path(__file__).parent / "data" / "tokenizer_corpus.txt"))
+VOCAB_CACHE_DIR = Path(__file__).parent / "generated" / "cache" / "vocab"
+WORD_VOCAB_SIZE = 5000
+SUBWORD_VOCAB_SIZE = 80  # small enough that "hello" still splits into pieces
+
+
+def token_list(tokens):
+    """Render tokens the way the scene shows them: ["a", "b", ...]"""
+    return json.dumps(tokens, ensure_ascii=False)
+
+
+def corpus_lines(path, limit):
+    """First non-empty lines of the corpus, without reading the rest of the file"""
+    lines = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.strip():
+                lines.append(line.strip())
+            if len(lines) == limit:
+                break
+    return lines
+
+class TextEncoderStep2Tokenization(SectionedScene):
+    """
+    Step 2: Raw Text to Tokens (Preprocessing)
+    - Character-level vs word-level vs subword tokenization
+    - Building vocabularies from training data
+    - Handling unknown words (<UNK> tokens)
+    - Special tokens: <PAD>, <START>, <END>, <MASK>
+    - Practical demo: "Hello world" → IDs from a vocabulary trained on data/tokenizer_corpus.txt
+    """
     
-    def add_element(self, element):
-        """Track element for proper cleanup"""
-        self.current_elements.append(element)
-        return element
+    sections = [
+        "show_tokenization_concept",            # Section 2.1: What is Tokenization?
+        "show_tokenization_methods",            # Section 2.2: Character vs Word vs Subword
+        "show_vocabulary_building",             # Section 2.3: Building Vocabularies
+        "show_special_tokens",                  # Section 2.4: Special Tokens
+        "show_complete_tokenization_example",   # Section 2.5: Complete Example
+    ]
     
-    def clear_section(self):
-        """Fade out all current elements with proper spacing"""
-        if self.current_elements:
-            self.play(FadeOut(*self.current_elements))
-            self.current_elements = []
-        self.wait(1)
+    def setup(self):
+        # Real vocabularies trained on the corpus (cached by corpus hash)
+        self.word_tokenizer = load_or_train(CORPUS_PATH, "word", WORD_VOCAB_SIZE,
+                                            cache_dir=VOCAB_CACHE_DIR)
+        self.char_tokenizer = load_or_train(CORPUS_PATH, "char", WORD_VOCAB_SIZE, lowercase=False,
+                                            cache_dir=VOCAB_CACHE_DIR)
+        self.subword_tokenizer = load_or_train(CORPUS_PATH, "bpe", SUBWORD_VOCAB_SIZE,
+                                               cache_dir=VOCAB_CACHE_DIR)
     
     def show_tokenization_concept(self):
         """Explain what tokenization is and why we need it"""
@@ -139,7 +150,7 @@ class TextEncoderStep2Tokenization(Scene):
         char_title.move_to(LEFT * 4 + UP * 1.5)
         self.add_element(char_title)
         
-        char_tokens = Text('["H", "e", "l", "l", "o", " ", "w", "o", "r", "l", "d", "!"]', 
+        char_tokens = Text(token_list(self.char_tokenizer.tokenize("Hello world!")), 
                           font_size=14, color=RED)
         char_tokens.move_to(LEFT * 4 + UP * 1)
         self.add_element(char_tokens)
@@ -159,7 +170,7 @@ class TextEncoderStep2Tokenization(Scene):
         word_title.move_to(UP * 1.5)
         self.add_element(word_title)
         
-        word_tokens = Text('["Hello", "world", "!"]', 
+        word_tokens = Text(token_list(self.word_tokenizer.tokenize("Hello world!")), 
                           font_size=14, color=BLUE)
         word_tokens.move_to(UP * 1)
         self.add_element(word_tokens)
@@ -179,7 +190,7 @@ class TextEncoderStep2Tokenization(Scene):
         subword_title.move_to(RIGHT * 4 + UP * 1.5)
         self.add_element(subword_title)
         
-        subword_tokens = Text('["Hell", "o", "world", "!"]', 
+        subword_tokens = Text(token_list(self.subword_tokenizer.tokenize("Hello world!")), 
                             font_size=14, color=GREEN)
         subword_tokens.move_to(RIGHT * 4 + UP * 1)
         self.add_element(subword_tokens)
@@ -241,10 +252,7 @@ class TextEncoderStep2Tokenization(Scene):
         training_title.move_to(UP * 2.8)
         self.add_element(training_title)
         
-        training_examples = [
-            '"The cat sat on the mat"',
-            '"The dog ran in the park"'
-        ]
+        training_examples = [f'"{line}"' for line in corpus_lines(CORPUS_PATH, 2)]
         
         for i, example in enumerate(training_examples):
             example_text = Text(example, font_size=14)
@@ -256,7 +264,8 @@ class TextEncoderStep2Tokenization(Scene):
         tokenize_title.move_to(UP * 1.6)  # Moved up
         self.add_element(tokenize_title)
         
-        all_tokens = Text('["The", "cat", "sat", "on", "the", "mat", ...]', 
+        example_tokens = self.word_tokenizer.tokenize(" ".join(corpus_lines(CORPUS_PATH, 2)))
+        all_tokens = Text(token_list(example_tokens[:6])[:-1] + ", ...]", 
                          font_size=14)
         all_tokens.move_to(UP * 1.2)  # Moved up
         self.add_element(all_tokens)
@@ -268,14 +277,10 @@ class TextEncoderStep2Tokenization(Scene):
         
         # Frequency table - VERIFIED: 6 rows × 0.15 units = 0.9 units tall
         # At y=-0.2, extends from y=+0.25 to y=-0.65, clear of count_title at y=+0.6
-        freq_table = Table(
-            [["Token", "Count"], 
-             ['"the"', "4"], 
-             ['"cat"', "2"], 
-             ['"sat"', "2"],
-             ['"dog"', "2"]],  # Reduced rows
-            row_labels=None,
-            col_labels=None,
+        top_tokens = self.word_tokenizer.most_frequent(4)
+        freq_table = FastTable(
+            [["Token", "Count"]] +
+            [[f'"{token}"', f"{count:,}"] for token, count in top_tokens],  # Reduced rows
             include_outer_lines=True
         ).scale(0.7)  # Slightly larger for readability
         freq_table.move_to(DOWN * 0.2)  # MOVED UP, verified clear space
@@ -286,7 +291,8 @@ class TextEncoderStep2Tokenization(Scene):
         assign_title.move_to(DOWN * 1.2)  # MOVED UP, 0.55 units below table bottom
         self.add_element(assign_title)
         
-        vocab_dict = Text('{"the": 1, "cat": 2, "sat": 3, "dog": 4, ...}', 
+        vocab = self.word_tokenizer.vocab
+        vocab_dict = Text(json.dumps({token: vocab[token] for token, _ in top_tokens})[:-1] + ", ...}", 
                          font_size=14)
         vocab_dict.move_to(DOWN * 1.7)  # MOVED UP accordingly
         self.add_element(vocab_dict)
@@ -356,7 +362,8 @@ class TextEncoderStep2Tokenization(Scene):
         vocab_title.move_to(DOWN * 2.5)
         self.add_element(vocab_title)
         
-        updated_vocab = Text('{"<UNK>": 0, "<PAD>": 1, "<START>": 2, "<END>": 3, "the": 4, ...}', 
+        first_entries = dict(list(self.word_tokenizer.vocab.items())[:6])
+        updated_vocab = Text(json.dumps(first_entries)[:-1] + ", ...}", 
                            font_size=14, color=ORANGE)
         updated_vocab.move_to(DOWN * 3)
         self.add_element(updated_vocab)
@@ -398,7 +405,9 @@ class TextEncoderStep2Tokenization(Scene):
         step1_title.move_to(LEFT * 4 + UP * 1.2)
         self.add_element(step1_title)
         
-        tokens = Text('["Hello", "world"]', font_size=16, color=BLUE)
+        example_tokens = self.word_tokenizer.tokenize("Hello world")
+        example_ids = self.word_tokenizer.encode("Hello world")
+        tokens = Text(token_list(example_tokens), font_size=16, color=BLUE)
         tokens.move_to(LEFT * 4 + UP * 0.8)
         self.add_element(tokens)
         
@@ -407,7 +416,7 @@ class TextEncoderStep2Tokenization(Scene):
         step2_title.move_to(LEFT * 4 + UP * 0.2)
         self.add_element(step2_title)
         
-        vocab_lookup = Text('{"Hello": 15, "world": 847}', font_size=16, color=GREEN)
+        vocab_lookup = Text(json.dumps(dict(zip(example_tokens, example_ids))), font_size=16, color=GREEN)
         vocab_lookup.move_to(LEFT * 4 + DOWN * 0.2)
         self.add_element(vocab_lookup)
         
@@ -416,7 +425,7 @@ class TextEncoderStep2Tokenization(Scene):
         step3_title.move_to(LEFT * 4 + DOWN * 0.8)
         self.add_element(step3_title)
         
-        token_ids = Text('[15, 847]', font_size=16, color=ORANGE)
+        token_ids = Text(str(example_ids), font_size=16, color=ORANGE)
         token_ids.move_to(LEFT * 4 + DOWN * 1.2)
         self.add_element(token_ids)
         
@@ -437,12 +446,13 @@ class TextEncoderStep2Tokenization(Scene):
         special_example.move_to(RIGHT * 2 + UP * 1)
         self.add_element(special_example)
         
-        special_tokens_result = Text('["<START>", "Hello", "world", "<END>"]', 
+        special_tokens_result = Text(token_list(["<START>"] + example_tokens + ["<END>"]), 
                                    font_size=14, color=PURPLE)
         special_tokens_result.move_to(RIGHT * 2 + UP * 0.5)
         self.add_element(special_tokens_result)
         
-        special_ids = Text('[2, 15, 847, 3]', font_size=16, color=PURPLE)
+        special_ids = Text(str(self.word_tokenizer.encode("Hello world", add_special=True)), 
+                           font_size=16, color=PURPLE)
         special_ids.move_to(RIGHT * 2 + UP * 0)
         self.add_element(special_ids)
         